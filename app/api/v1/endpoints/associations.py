@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
+import traceback
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List
+from app.db.cursor_pool import CursorPoolTimeoutError
+from app.db.executor import AsyncDBClient, iterate_in_db_executor, start_iteration
 from app.logging_config import get_logger, time_endpoint
+from app.models.schemas import MAX_ASSOCIATION_PAIRS, AssociationPairsRequest, ResponseFormat
+from app.rate_limiting import DEFAULT_RATE_LIMIT, limiter
 from app.services.associations_service import AssociationsService
+from app.services.columnar_format import MEDIA_TYPES, encode_record_batches
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -18,11 +25,36 @@ async def get_associations(
     study_ids: List[int] = Query(None, description="List of study_ids to filter results"),
     variant_ids: List[int] = Query(None, description="List of variant_ids to filter results"),
 ) -> dict:
-    association_service = AssociationsService()
+    association_service = AsyncDBClient(AssociationsService())
     if study_ids is None or study_ids == [] or variant_ids is None or variant_ids == []:
         raise HTTPException(status_code=400, detail="Need at least one study_id and one variant_id to get associations")
 
-    associations = association_service.get_associations_by_variant_ids_and_study_ids(
+    associations = await association_service.get_associations_by_variant_ids_and_study_ids(
         variant_ids=variant_ids, study_ids=study_ids
     )
     return {"associations": associations}
+
+
+@router.post(
+    "/batch",
+    summary="Get associations for variant/study pairs",
+    description=(
+        "Returns GWAS association statistics for exactly the given [variant_id, study_id] pairs, up to "
+        f"{MAX_ASSOCIATION_PAIRS} per request, streamed as NDJSON (one association per line). Pairs are resolved "
+        "from the associations database, then from the full association matrix. Pairs with no association "
+        "are omitted."
+    ),
+)
+@time_endpoint
+@limiter.limit(DEFAULT_RATE_LIMIT)
+async def get_associations_batch(request: Request, body: AssociationPairsRequest) -> StreamingResponse:
+    try:
+        association_service = AssociationsService()
+        batches = association_service.stream_associations_by_snp_study_pairs(body.pairs)
+        chunks = await start_iteration(iterate_in_db_executor(encode_record_batches(batches, ResponseFormat.ndjson)))
+        return StreamingResponse(chunks, media_type=MEDIA_TYPES[ResponseFormat.ndjson])
+    except CursorPoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        logger.error(f"Error in get_associations_batch: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
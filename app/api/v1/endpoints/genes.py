@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Path, Query, Request
 import traceback
 from typing import List
 
+from app.db.executor import AsyncDBClient, run_in_db_executor
 from app.services.coloc_pairs_service import ColocPairsService
 from app.db.studies_db import StudiesDBClient
 from app.models.schemas import (
@@ -15,6 +16,7 @@ from app.models.schemas import (
     convert_duckdb_to_pydantic_model,
 )
 from app.rate_limiting import SHARED_ENTITY_RESOURCE_RATE_LIMIT, limiter
+from app.services.interval_index import get_genomic_index
 from app.services.studies_service import StudiesService
 from app.logging_config import get_logger, time_endpoint
 from app.services.associations_service import AssociationsService
@@ -40,10 +42,10 @@ async def get_genes(
     h4_threshold: float = Query(0.8, description="H4 threshold for coloc pairs"),
 ) -> GetGenesResponse:
     try:
-        studies_service = StudiesService()
+        studies_service = AsyncDBClient(StudiesService())
         if not ids:
-            genes = studies_service.get_genes()
-            return genes
+            genes = await studies_service.get_genes(as_response=True)
+            return genes.to_response(request)
 
         maximum_num_genes = 10
         if len(ids) > maximum_num_genes:
@@ -52,11 +54,11 @@ async def get_genes(
                 detail=f"Can not request more than {maximum_num_genes} in one request",
             )
 
-        studies_db = StudiesDBClient()
-        coloc_pairs_service = ColocPairsService()
-        associations_service = AssociationsService()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        coloc_pairs_service = AsyncDBClient(ColocPairsService())
+        associations_service = AsyncDBClient(AssociationsService())
 
-        gene_data = studies_db.get_genes_by_ids(ids)
+        gene_data = await studies_db.get_genes_by_ids(ids)
         if not gene_data:
             return GetGenesResponse(genes=[])
 
@@ -67,9 +69,12 @@ async def get_genes(
         gene_map = {g.id: g for g in genes}
         gene_ids_numeric = list(gene_map.keys())
 
-        regions = [(g.chr, g.start, g.stop) for g in genes]
-        region_extractions_data = studies_db.get_study_extractions_in_gene_regions(regions)
-        gene_extractions_data = studies_db.get_study_extractions_for_genes(gene_ids_numeric, include_trans)
+        genomic_index = await run_in_db_executor(get_genomic_index)
+        region_extraction_ids = {g.id: genomic_index.study_extraction_ids_within(g.chr, g.start, g.stop) for g in genes}
+        region_extractions_data = await studies_db.get_study_extractions_by_id(
+            sorted({id for ids in region_extraction_ids.values() for id in ids})
+        )
+        gene_extractions_data = await studies_db.get_study_extractions_for_genes(gene_ids_numeric, include_trans)
 
         region_extractions = (
             convert_duckdb_to_pydantic_model(ExtendedStudyExtraction, region_extractions_data)
@@ -82,9 +87,10 @@ async def get_genes(
             else []
         )
 
+        region_extractions_by_id = {e.id: e for e in region_extractions}
         study_extractions_by_gene = {}
         for g in genes:
-            region_for_gene = [e for e in region_extractions if e.chr == g.chr and g.start <= e.bp <= g.stop]
+            region_for_gene = [region_extractions_by_id[id] for id in region_extraction_ids[g.id]]
             gene_for_gene = [
                 e
                 for e in gene_extractions
@@ -104,10 +110,10 @@ async def get_genes(
             all_study_extraction_ids.extend(e.id for e in ext_list)
         all_study_extraction_ids = list(set(all_study_extraction_ids))
 
-        region_colocs_data = studies_db.get_all_colocs_for_study_extraction_ids(all_study_extraction_ids)
-        gene_colocs_data = studies_db.get_all_colocs_for_genes(gene_ids_numeric, include_trans)
-        study_rare_data = studies_db.get_rare_results_for_study_extraction_ids(all_study_extraction_ids)
-        gene_rare_data = studies_db.get_rare_results_for_genes(gene_ids_numeric, include_trans)
+        region_colocs_data = await studies_db.get_all_colocs_for_study_extraction_ids(all_study_extraction_ids)
+        gene_colocs_data = await studies_db.get_all_colocs_for_genes(gene_ids_numeric, include_trans)
+        study_rare_data = await studies_db.get_rare_results_for_study_extraction_ids(all_study_extraction_ids)
+        gene_rare_data = await studies_db.get_rare_results_for_genes(gene_ids_numeric, include_trans)
 
         region_colocs = convert_duckdb_to_pydantic_model(ColocGroup, region_colocs_data) if region_colocs_data else []
         gene_colocs = convert_duckdb_to_pydantic_model(ColocGroup, gene_colocs_data) if gene_colocs_data else []
@@ -128,11 +134,11 @@ async def get_genes(
             all_study_extractions.extend(ext_list)
         all_study_extractions = StudiesService.deduplicate_by_key(all_study_extractions, lambda e: e.id)
 
-        tissues = studies_service.get_tissues()
+        tissues = await studies_service.get_tissues()
 
         associations = None
         if include_associations:
-            associations_raw = associations_service.get_associations(
+            associations_raw = await associations_service.get_associations(
                 all_coloc_groups, all_rare_results, all_study_extractions
             )
             associations = StudiesService.deduplicate_by_key(
@@ -149,10 +155,10 @@ async def get_genes(
             )
             variant_ids = list(set(variant_ids))
             if variant_ids:
-                coloc_pairs = coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
+                coloc_pairs = await coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
 
         if include_coloc_pairs and coloc_pairs is not None:
-            all_study_extractions = studies_service.merge_study_extractions_for_coloc_pairs(
+            all_study_extractions = await studies_service.merge_study_extractions_for_coloc_pairs(
                 all_study_extractions, coloc_pairs
             )
 
@@ -165,7 +171,7 @@ async def get_genes(
             )
             variant_ids = list(set(variant_ids))
             if variant_ids:
-                variants_data = studies_db.get_variants(variant_ids=variant_ids)
+                variants_data = await studies_db.get_variants(variant_ids=variant_ids)
                 variants = convert_duckdb_to_pydantic_model(Variant, variants_data)
                 if not isinstance(variants, list):
                     variants = [variants]
@@ -204,40 +210,32 @@ async def get_gene(
     h4_threshold: float = Query(0.8, description="H4 threshold for coloc pairs"),
 ) -> GeneResponse:
     try:
-        studies_service = StudiesService()
-        tissues = studies_service.get_tissues()
-        studies_db = StudiesDBClient()
-        coloc_pairs_service = ColocPairsService()
-        associations_service = AssociationsService()
+        studies_service = AsyncDBClient(StudiesService())
+        tissues = await studies_service.get_tissues()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        coloc_pairs_service = AsyncDBClient(ColocPairsService())
+        associations_service = AsyncDBClient(AssociationsService())
 
         gene_id = None
         try:
             gene_id = int(gene_identifier)
-            gene = studies_db.get_gene(id=gene_id)
+            gene = await studies_db.get_gene(id=gene_id)
         except ValueError:
-            gene = studies_db.get_gene(symbol=gene_identifier)
+            gene = await studies_db.get_gene(symbol=gene_identifier)
 
         if gene is None:
             raise HTTPException(status_code=404, detail=f"Gene {gene_identifier} not found")
         gene = convert_duckdb_to_pydantic_model(Gene, gene)
 
-        genes = studies_db.get_genes()
-        genes = convert_duckdb_to_pydantic_model(Gene, genes)
-
-        genes_in_region = [
-            g
-            for g in genes
-            if g.chr == gene.chr
-            and g.start <= gene.start + 1000000
-            and g.stop >= gene.stop - 1000000
-            and (g.gene != gene_identifier or g.id != gene_id)
-        ]
-        gene.genes_in_region = genes_in_region
-
-        study_extractions_in_region = (
-            studies_db.get_study_extractions_in_gene_region(gene.chr, gene.start, gene.stop) or []
+        genomic_index = await run_in_db_executor(get_genomic_index)
+        genes_in_region = genomic_index.genes_overlapping(gene.chr, gene.stop - 1000000, gene.start + 1000000)
+        genes_in_region = convert_duckdb_to_pydantic_model(Gene, genes_in_region) if genes_in_region else []
+        gene.genes_in_region = [g for g in genes_in_region if g.gene != gene_identifier or g.id != gene_id]
+
+        study_extractions_in_region = await studies_db.get_study_extractions_by_id(
+            genomic_index.study_extraction_ids_within(gene.chr, gene.start, gene.stop)
         )
-        study_extractions_of_gene = studies_db.get_study_extractions_for_gene(gene.id, include_trans) or []
+        study_extractions_of_gene = await studies_db.get_study_extractions_for_gene(gene.id, include_trans) or []
         study_extractions = study_extractions_in_region + study_extractions_of_gene
 
         if study_extractions:
@@ -250,14 +248,14 @@ async def get_gene(
         else:
             study_extraction_ids = []
 
-        region_colocs = studies_db.get_all_colocs_for_study_extraction_ids(study_extraction_ids)
-        gene_colocs = studies_db.get_all_colocs_for_gene(gene.id, include_trans)
+        region_colocs = await studies_db.get_all_colocs_for_study_extraction_ids(study_extraction_ids)
+        gene_colocs = await studies_db.get_all_colocs_for_gene(gene.id, include_trans)
         coloc_groups = (region_colocs or []) + (gene_colocs or [])
         coloc_groups = list(set(coloc_groups)) if coloc_groups else []
 
-        study_rare_results = studies_db.get_rare_results_for_study_extraction_ids(study_extraction_ids)
+        study_rare_results = await studies_db.get_rare_results_for_study_extraction_ids(study_extraction_ids)
 
-        gene_rare_results = studies_db.get_rare_results_for_gene(gene.id, include_trans)
+        gene_rare_results = await studies_db.get_rare_results_for_gene(gene.id, include_trans)
         rare_results = list(set(study_rare_results + gene_rare_results))
 
         if rare_results is not None:
@@ -267,7 +265,7 @@ async def get_gene(
 
         associations = None
         if include_associations:
-            associations = associations_service.get_associations(coloc_groups, rare_results, study_extractions)
+            associations = await associations_service.get_associations(coloc_groups, rare_results, study_extractions)
 
         coloc_pairs = None
         if include_coloc_pairs:
@@ -278,10 +276,10 @@ async def get_gene(
             )
             variant_ids = list(set(variant_ids))
             if variant_ids:
-                coloc_pairs = coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
+                coloc_pairs = await coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
 
         if include_coloc_pairs and coloc_pairs is not None and study_extractions is not None:
-            study_extractions = studies_service.merge_study_extractions_for_coloc_pairs(
+            study_extractions = await studies_service.merge_study_extractions_for_coloc_pairs(
                 list(study_extractions), coloc_pairs
             )
 
@@ -292,7 +290,7 @@ async def get_gene(
                 + [rare_result.variant_id for rare_result in (rare_results or [])]
                 + [study_extraction.variant_id for study_extraction in (study_extractions or [])]
             )
-            variants = studies_db.get_variants(variant_ids=variant_ids)
+            variants = await studies_db.get_variants(variant_ids=variant_ids)
             variants = convert_duckdb_to_pydantic_model(Variant, variants)
             if not isinstance(variants, list):
                 variants = [variants]
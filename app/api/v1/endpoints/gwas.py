@@ -6,6 +6,7 @@ import hashlib
 import shutil
 
 from app.config import get_settings
+from app.db.executor import AsyncDBClient
 from app.db.studies_db import StudiesDBClient
 from app.db.gwas_db import GwasDBClient
 from app.db.redis import RedisClient
@@ -196,10 +197,10 @@ async def get_gwas(
     include_associations: bool = Query(False, description="Whether to include associations for SNPs"),
 ) -> UploadTraitResponse:
     try:
-        studies_db = StudiesDBClient()
-        gwas_upload_db = GwasDBClient()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        gwas_upload_db = AsyncDBClient(GwasDBClient())
 
-        gwas = gwas_upload_db.get_gwas_by_guid(guid)
+        gwas = await gwas_upload_db.get_gwas_by_guid(guid)
         if gwas is None:
             raise HTTPException(status_code=404, detail="GWAS not found")
 
@@ -215,9 +216,9 @@ async def get_gwas(
 
             return UploadTraitResponse(trait=gwas, queue_status=queue_status, queue_position=queue_position)
 
-        coloc_groups = gwas_upload_db.get_coloc_groups_by_gwas_upload_id(gwas.id)
+        coloc_groups = await gwas_upload_db.get_coloc_groups_by_gwas_upload_id(gwas.id)
         coloc_groups = convert_duckdb_to_pydantic_model(ExtendedUploadColocGroup, coloc_groups)
-        coloc_pairs = gwas_upload_db.get_coloc_pairs_by_gwas_upload_id(gwas.id)
+        coloc_pairs = await gwas_upload_db.get_coloc_pairs_by_gwas_upload_id(gwas.id)
         coloc_pairs = convert_duckdb_to_pydantic_model(UploadColocPair, coloc_pairs)
 
         # Collect study_extraction_ids from coloc_groups and coloc_pairs (covers current + compare_with uploads)
@@ -227,12 +228,12 @@ async def get_gwas(
             + [p.study_extraction_id_b for p in coloc_pairs if p.study_extraction_id_b is not None]
         )
         upload_study_extraction_ids = list(set(upload_study_extraction_ids))
-        upload_study_extractions = gwas_upload_db.get_study_extractions_by_ids(upload_study_extraction_ids)
+        upload_study_extractions = await gwas_upload_db.get_study_extractions_by_ids(upload_study_extraction_ids)
         upload_study_extractions = convert_duckdb_to_pydantic_model(UploadStudyExtraction, upload_study_extractions)
 
         associations = None
         if include_associations:
-            assoc_rows, assoc_columns = gwas_upload_db.get_associations_by_gwas_upload_id(gwas.id)
+            assoc_rows, assoc_columns = await gwas_upload_db.get_associations_by_gwas_upload_id(gwas.id)
             associations = convert_duckdb_tuples_to_dicts(assoc_rows, assoc_columns)
 
         # Collect existing_study_extraction_ids from coloc_groups and coloc_pairs (studies DB)
@@ -242,14 +243,14 @@ async def get_gwas(
             + [p.existing_study_extraction_id_b for p in coloc_pairs if p.existing_study_extraction_id_b is not None]
         )
         existing_study_extraction_ids = list(set(existing_study_extraction_ids))
-        existing_study_extractions = studies_db.get_study_extractions_by_id(existing_study_extraction_ids)
+        existing_study_extractions = await studies_db.get_study_extractions_by_id(existing_study_extraction_ids)
         existing_study_extractions = convert_duckdb_to_pydantic_model(
             ExtendedStudyExtraction, existing_study_extractions
         )
-        studies_service = StudiesService()
+        studies_service = AsyncDBClient(StudiesService())
         if existing_study_extractions is not None and not isinstance(existing_study_extractions, list):
             existing_study_extractions = [existing_study_extractions]
-        existing_study_extractions = studies_service.merge_study_extractions_for_upload_coloc_pairs(
+        existing_study_extractions = await studies_service.merge_study_extractions_for_upload_coloc_pairs(
             list(existing_study_extractions or []),
             coloc_pairs,
         )
@@ -1,6 +1,7 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Request
 
+from app.db.executor import AsyncDBClient
 from app.db.studies_db import StudiesDBClient
 from app.models.schemas import (
     ContactRequest,
@@ -42,8 +43,8 @@ async def get_version(request: Request):
 @limiter.limit(DEFAULT_RATE_LIMIT)
 async def get_study_sources(request: Request) -> GetStudySourcesResponse:
     try:
-        studies_db = StudiesDBClient()
-        sources = studies_db.get_study_sources()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        sources = await studies_db.get_study_sources()
         sources = convert_duckdb_to_pydantic_model(StudySource, sources)
         return GetStudySourcesResponse(sources=sources)
     except HTTPException as e:
@@ -63,8 +64,8 @@ async def get_study_sources(request: Request) -> GetStudySourcesResponse:
 @limiter.limit(DEFAULT_RATE_LIMIT)
 async def get_gpmap_metadata(request: Request):
     try:
-        studies_service = StudiesService()
-        metadata = studies_service.get_gpmap_metadata()
+        studies_service = AsyncDBClient(StudiesService())
+        metadata = await studies_service.get_gpmap_metadata()
         return metadata
     except HTTPException as e:
         raise e
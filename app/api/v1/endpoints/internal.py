@@ -1,10 +1,18 @@
 import traceback
 import shutil
+import threading
 from fastapi import APIRouter, HTTPException, Request, Path
 import json
 import os
 
 from app.config import get_settings
+from app.db.associations_db import get_associations_db_connection
+from app.db.associations_full_db import get_associations_full_db_connection
+from app.db.coloc_pairs_db import get_coloc_pairs_db_connection
+from app.db.cursor_pool import get_cursor_pool, get_cursor_pool_metrics
+from app.db.executor import DBExecutor, ShardExecutor, run_in_db_executor
+from app.db import ld_db, studies_db
+from app.db.utils import get_applied_duckdb_settings
 from app.db.gwas_db import GwasDBClient
 from app.services.oci_service import OCIService
 from app.models.schemas import convert_duckdb_to_pydantic_model, GwasUpload
@@ -12,6 +20,10 @@ from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import limiter, DEFAULT_RATE_LIMIT
 from app.services.studies_service import StudiesService
 from app.services.associations_service import AssociationsService
+from app.services.cache_namespace import get_cache_namespace
+from app.services.cache_warmup import CACHE_WARMUP_LOCK, CacheWarmupInProgressError, get_last_warmup_report, warm_cache
+from app.services.local_cache import LocalCache
+from app.services.redis_decorator import get_single_flight_metrics
 from app.db.redis import RedisClient
 
 logger = get_logger(__name__)
@@ -62,6 +74,142 @@ async def clear_cache_studies(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _run_cache_warmup():
+    try:
+        warm_cache()
+    except CacheWarmupInProgressError as e:
+        logger.warning(str(e))
+    except Exception as e:
+        logger.error(f"Error in cache warm-up: {e}\n{traceback.format_exc()}")
+
+
+@router.post(
+    "/cache-warmup",
+    response_model=dict,
+    include_in_schema=False,
+    summary="Warm the caches",
+    description="Starts rebuilding the studies cache and the most used associations-full caches in a new cache namespace, which is activated when complete.",
+)
+@time_endpoint
+async def start_cache_warmup(request: Request):
+    try:
+        redis_client = RedisClient()
+        if redis_client.lock_is_held(CACHE_WARMUP_LOCK):
+            raise HTTPException(status_code=409, detail="A cache warm-up is already running")
+        threading.Thread(target=_run_cache_warmup, name="cache-warmup", daemon=True).start()
+        return {"message": "Cache warm-up started"}
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error in start_cache_warmup: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/cache-warmup",
+    response_model=dict,
+    include_in_schema=False,
+    summary="Cache warm-up status",
+    description="Returns the active cache namespace, whether a warm-up is running and the report of the last one.",
+)
+@time_endpoint
+async def get_cache_warmup_status(request: Request):
+    try:
+        redis_client = RedisClient()
+        return {
+            "active_namespace": get_cache_namespace(redis_client),
+            "running": redis_client.lock_is_held(CACHE_WARMUP_LOCK),
+            "last_report": get_last_warmup_report(),
+        }
+    except Exception as e:
+        logger.error(f"Error in get_cache_warmup_status: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/db-executor",
+    response_model=dict,
+    include_in_schema=False,
+    summary="DuckDB executor metrics",
+    description=(
+        "Returns worker count, queue depth and queue wait times for the DuckDB thread pool, "
+        "and fan-out counts for the shard query pool."
+    ),
+)
+@time_endpoint
+async def get_db_executor_metrics(request: Request):
+    return {**DBExecutor().get_metrics(), "shard_executor": ShardExecutor().get_metrics()}
+
+
+@router.get(
+    "/db-cursor-pools",
+    response_model=dict,
+    include_in_schema=False,
+    summary="DuckDB cursor pool metrics",
+    description="Returns size, lease counts, wait times and reclaimed leaks for each DuckDB cursor pool.",
+)
+@time_endpoint
+async def get_db_cursor_pool_metrics(request: Request):
+    return get_cursor_pool_metrics()
+
+
+@router.get(
+    "/cache-single-flight",
+    response_model=dict,
+    include_in_schema=False,
+    summary="Cache single-flight metrics",
+    description="Returns how many cache misses were computed and how many were coalesced onto an in-flight computation.",
+)
+@time_endpoint
+async def get_cache_single_flight_metrics(request: Request):
+    return get_single_flight_metrics()
+
+
+@router.get(
+    "/local-cache",
+    response_model=dict,
+    include_in_schema=False,
+    summary="Local cache metrics",
+    description="Returns size, hit rate and invalidation counts for this worker's in-process cache.",
+)
+@time_endpoint
+async def get_local_cache_metrics(request: Request):
+    return LocalCache().get_metrics()
+
+
+def _get_duckdb_settings() -> dict:
+    connection_factories = {
+        "studies": studies_db.get_gpm_db_connection,
+        "ld": ld_db.get_gpm_db_connection,
+        "associations": get_associations_db_connection,
+        "associations_full": get_associations_full_db_connection,
+        "coloc_pairs": get_coloc_pairs_db_connection,
+    }
+    return {
+        database: {
+            "configured": settings.get_duckdb_settings(database),
+            "applied": get_applied_duckdb_settings(get_cursor_pool(database, factory).thread_cursor()),
+        }
+        for database, factory in connection_factories.items()
+    }
+
+
+@router.get(
+    "/db-settings",
+    response_model=dict,
+    include_in_schema=False,
+    summary="DuckDB resource settings",
+    description="Returns the configured and applied memory, thread and cache settings for each DuckDB database.",
+)
+@time_endpoint
+async def get_db_settings(request: Request):
+    try:
+        return await run_in_db_executor(_get_duckdb_settings)
+    except Exception as e:
+        logger.error(f"Error in get_db_settings: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
     "/rate-limiter",
     response_model=dict,
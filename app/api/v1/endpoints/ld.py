@@ -1,22 +1,34 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 
-from app.db.ld_db import LdDBClient
+from app.config import get_settings
+from app.db.executor import AsyncDBClient
 from app.db.studies_db import StudiesDBClient
-from app.models.schemas import Ld, Lds, Variant, convert_duckdb_to_pydantic_model
+from app.models.schemas import Ld, LdMatrixDtype, LdMatrixFormat, Lds, Variant, convert_duckdb_to_pydantic_model
 from typing import List
 from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import limiter, DEFAULT_RATE_LIMIT
+from app.services.ld_service import (
+    LD_MATRIX_FILE_EXTENSIONS,
+    LD_MATRIX_MEDIA_TYPES,
+    LdService,
+    serialize_ld_matrix,
+)
 
 logger = get_logger(__name__)
 router = APIRouter()
+settings = get_settings()
 
 
 @router.get(
     "/matrix",
     response_model=Lds,
     summary="Get LD matrix for variants",
-    description="Returns pairwise LD (r²) values between the requested variants.",
+    description=(
+        "Returns pairwise LD (r²) values between the requested variants. format=npz or arrow returns the "
+        "dense matrix of r instead, with the ordered variant ids."
+    ),
 )
 @time_endpoint
 @limiter.limit(DEFAULT_RATE_LIMIT)
@@ -24,20 +36,43 @@ async def get_matrix(
     request: Request,
     variants: List[str] = Query(None, description="List of variants to filter results"),
     variant_ids: List[int] = Query(None, description="List of variant_ids to filter results"),
+    response_format: LdMatrixFormat = Query(
+        LdMatrixFormat.json,
+        alias="format",
+        description=(
+            "json (one object per pair), npz (NumPy archive of variant_ids and the square matrix r) or arrow "
+            "(Arrow IPC stream of variant_id and its matrix row r). In the matrix formats the diagonal is 1 "
+            "and pairs missing from the LD store are NaN."
+        ),
+    ),
+    dtype: LdMatrixDtype = Query(LdMatrixDtype.float32, description="Float type of the npz and arrow matrix"),
 ):
     try:
-        ld_db = LdDBClient()
-        studies_db = StudiesDBClient()
+        ld_service = AsyncDBClient(LdService())
+        studies_db = AsyncDBClient(StudiesDBClient())
         if variants:
-            variant_annotations = studies_db.get_variants(variant_prefixes=variants)
+            variant_annotations = await studies_db.get_variants(variant_prefixes=variants)
             variant_annotations = convert_duckdb_to_pydantic_model(Variant, variant_annotations)
             variant_ids = [variant_annotation.id for variant_annotation in variant_annotations]
 
         if not variant_ids:
             raise HTTPException(status_code=400, detail="No SNPs found provided in the request")
-        ld_matrix = ld_db.get_ld_matrix(variant_ids)
-        print(variant_ids)
-        print(ld_matrix)
+
+        if response_format != LdMatrixFormat.json:
+            if len(set(variant_ids)) > settings.LD_MATRIX_MAX_VARIANTS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Can not request a matrix of more than {settings.LD_MATRIX_MAX_VARIANTS} variants",
+                )
+            ordered_variant_ids, matrix = await ld_service.get_dense_ld_matrix(variant_ids, dtype)
+            extension = LD_MATRIX_FILE_EXTENSIONS[response_format]
+            return Response(
+                content=serialize_ld_matrix(ordered_variant_ids, matrix, response_format),
+                media_type=LD_MATRIX_MEDIA_TYPES[response_format],
+                headers={"Content-Disposition": f'attachment; filename="ld_matrix.{extension}"'},
+            )
+
+        ld_matrix = await ld_service.get_ld_matrix(variant_ids)
         if ld_matrix is None or len(ld_matrix) == 0:
             raise HTTPException(status_code=404, detail=f"LD matrix for variants {variants} not found")
 
@@ -70,17 +105,17 @@ async def get_proxies(
         if rsquared_threshold < 0.8 or rsquared_threshold > 1:
             raise HTTPException(status_code=400, detail="R squared threshold must be between 0.8 and 1")
 
-        ld_db = LdDBClient()
-        studies_db = StudiesDBClient()
+        ld_service = AsyncDBClient(LdService())
+        studies_db = AsyncDBClient(StudiesDBClient())
         if variants:
-            variant_annotations = studies_db.get_variants(variant_prefixes=variants)
+            variant_annotations = await studies_db.get_variants(variant_prefixes=variants)
             variant_annotations = convert_duckdb_to_pydantic_model(Variant, variant_annotations)
             variant_ids = [variant_annotation.id for variant_annotation in variant_annotations]
 
         if not variant_ids:
             raise HTTPException(status_code=400, detail="No SNPs found provided in the request")
 
-        ld_proxies = ld_db.get_ld_proxies(variant_ids, rsquared_threshold)
+        ld_proxies = await ld_service.get_ld_proxies(variant_ids, rsquared_threshold)
         if ld_proxies is None or len(ld_proxies) == 0:
             raise HTTPException(status_code=404, detail=f"LD proxies for variant_ids {variant_ids} not found")
 
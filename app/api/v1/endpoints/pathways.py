@@ -2,6 +2,7 @@ import traceback
 
 from fastapi import APIRouter, HTTPException, Request
 
+from app.db.executor import AsyncDBClient
 from app.logging_config import get_logger, time_endpoint
 from app.models.schemas import PathwayEnrichmentRequest, PathwayEnrichmentResponse
 from app.rate_limiting import limiter, DEFAULT_RATE_LIMIT
@@ -30,8 +31,8 @@ async def pathway_enrichment(
                 detail=f"Invalid source '{body.source}'. Must be one of: {', '.join(sorted(VALID_SOURCES))}",
             )
 
-        pathway_service = PathwayService()
-        results, matched_gene_count, total_terms_tested = pathway_service.get_pathway_enrichment(
+        pathway_service = AsyncDBClient(PathwayService())
+        results, matched_gene_count, total_terms_tested = await pathway_service.get_pathway_enrichment(
             genes=body.genes,
             source=body.source,
             p_value_threshold=body.p_value_threshold,
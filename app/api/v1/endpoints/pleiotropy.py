@@ -1,5 +1,6 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Request
+from app.db.executor import AsyncDBClient
 from app.models.schemas import GenePleiotropy, SnpPleiotropy, convert_duckdb_to_pydantic_model
 from app.db.studies_db import StudiesDBClient
 from app.models.schemas import (
@@ -25,8 +26,8 @@ router = APIRouter()
 @limiter.limit(DEFAULT_RATE_LIMIT)
 async def get_genes_pleiotropy(request: Request) -> GenePleiotropyResponse:
     try:
-        studies_db = StudiesDBClient()
-        genes_pleiotropy = studies_db.get_gene_pleiotropy_scores()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        genes_pleiotropy = await studies_db.get_gene_pleiotropy_scores()
         genes_pleiotropy = convert_duckdb_to_pydantic_model(GenePleiotropy, genes_pleiotropy)
         return GenePleiotropyResponse(genes=genes_pleiotropy)
     except HTTPException as e:
@@ -46,8 +47,8 @@ async def get_genes_pleiotropy(request: Request) -> GenePleiotropyResponse:
 @limiter.limit(DEFAULT_RATE_LIMIT)
 async def get_snps_pleiotropy(request: Request) -> SnpPleiotropyResponse:
     try:
-        studies_db = StudiesDBClient()
-        snps_pleiotropy = studies_db.get_variant_pleiotropy_scores()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        snps_pleiotropy = await studies_db.get_variant_pleiotropy_scores()
         snps_pleiotropy = convert_duckdb_to_pydantic_model(SnpPleiotropy, snps_pleiotropy)
         return SnpPleiotropyResponse(snps=snps_pleiotropy)
     except HTTPException as e:
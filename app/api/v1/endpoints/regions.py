@@ -1,6 +1,7 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Path, Request
 
+from app.db.executor import AsyncDBClient, run_in_db_executor
 from app.db.studies_db import StudiesDBClient
 from app.models.schemas import (
     Gene,
@@ -13,6 +14,7 @@ from app.models.schemas import (
 )
 from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import limiter, DEFAULT_RATE_LIMIT
+from app.services.interval_index import get_genomic_index
 from app.services.studies_service import StudiesService
 
 logger = get_logger(__name__)
@@ -34,28 +36,26 @@ async def get_region(
     ld_block_id: int = Path(..., description="LD Block ID"),
 ) -> RegionResponse:
     try:
-        studies_service = StudiesService()
-        tissues = studies_service.get_tissues()
+        studies_service = AsyncDBClient(StudiesService())
+        tissues = await studies_service.get_tissues()
 
-        db = StudiesDBClient()
-        ld_block = db.get_ld_block(ld_block_id)
+        db = AsyncDBClient(StudiesDBClient())
+        genomic_index = await run_in_db_executor(get_genomic_index)
+        ld_block = genomic_index.ld_block(ld_block_id)
         if ld_block is None:
             raise HTTPException(status_code=404, detail=f"LD Block {ld_block_id} not found")
         ld_block = convert_duckdb_to_pydantic_model(LdBlock, ld_block)
 
-        genes = db.get_genes()
-        genes = convert_duckdb_to_pydantic_model(Gene, genes)
-        genes_in_region = [
-            g for g in genes if g.chr == ld_block.chr and g.start >= ld_block.start and g.stop <= ld_block.stop
-        ]
+        genes_in_region = genomic_index.genes_within(ld_block.chr, ld_block.start, ld_block.stop)
+        genes_in_region = convert_duckdb_to_pydantic_model(Gene, genes_in_region) if genes_in_region else []
 
         coloc_variant_ids = rare_result_variant_ids = []
-        region_colocs = db.get_all_colocs_for_ld_block(ld_block_id)
+        region_colocs = await db.get_all_colocs_for_ld_block(ld_block_id)
         if region_colocs:
             region_colocs = convert_duckdb_to_pydantic_model(ColocGroup, region_colocs)
             coloc_variant_ids = [coloc.variant_id for coloc in region_colocs]
 
-        region_rare_results = db.get_rare_results_for_ld_block(ld_block_id)
+        region_rare_results = await db.get_rare_results_for_ld_block(ld_block_id)
         # TODO: Remove this once we have fixed the rare results in the pipeline
         region_rare_results = [r for r in region_rare_results if r[2] is not None]
         if region_rare_results:
@@ -66,7 +66,7 @@ async def get_region(
 
         variants = []
         if variant_ids:
-            variants = db.get_variants(variant_ids=variant_ids)
+            variants = await db.get_variants(variant_ids=variant_ids)
             variants = convert_duckdb_to_pydantic_model(Variant, variants)
 
         return RegionResponse(
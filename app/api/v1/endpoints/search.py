@@ -1,20 +1,11 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Response, Request, Query
-from app.db.ld_db import LdDBClient
-from app.db.studies_db import StudiesDBClient
-from app.models.schemas import (
-    ColocGroup,
-    ExtendedVariant,
-    Ld,
-    RareResult,
-    SearchTerms,
-    VariantSearchResponse,
-    convert_duckdb_to_pydantic_model,
-)
-from typing import List
+from app.db.executor import AsyncDBClient, run_in_db_executor
+from app.models.schemas import SearchTerms, VariantSearchResponse
 from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import limiter, DEFAULT_RATE_LIMIT
 from app.services.studies_service import StudiesService
+from app.services.variant_search_service import VariantSearchService
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -30,13 +21,9 @@ router = APIRouter()
 @limiter.limit(DEFAULT_RATE_LIMIT)
 async def get_search_options(request: Request, response: Response):
     try:
-        # Add cache control headers
-        response.headers["Cache-Control"] = "no-cache, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-
-        studies_service = StudiesService()
-        search_terms = studies_service.get_search_terms()
-        return search_terms
+        studies_service = AsyncDBClient(StudiesService())
+        search_terms = await studies_service.get_search_terms(as_response=True)
+        return search_terms.to_response(request)
 
     except HTTPException as e:
         raise e
@@ -45,6 +32,32 @@ async def get_search_options(request: Request, response: Response):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/suggest",
+    response_model=SearchTerms,
+    summary="Suggest search terms",
+    description=(
+        "Returns the genes, traits and rsids that start with or contain q, ranked by coloc groups and study "
+        "extractions. Genes match on symbol or Ensembl ID."
+    ),
+)
+@time_endpoint
+@limiter.limit(DEFAULT_RATE_LIMIT)
+async def get_search_suggestions(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+) -> SearchTerms:
+    try:
+        search_index = await run_in_db_executor(StudiesService().get_search_index)
+        return SearchTerms(search_terms=search_index.suggest(q, limit))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error in get_search_suggestions: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
     "/variant/{search_term}",
     response_model=VariantSearchResponse,
@@ -62,67 +75,10 @@ async def variant_search(
         if rsquared_threshold < 0.8 or rsquared_threshold > 1:
             raise HTTPException(status_code=400, detail="R squared threshold must be between 0.8 and 1")
 
-        studies_db = StudiesDBClient()
-        ld_db = LdDBClient()
-
-        original_variants = []
-        if search_term.startswith("rs"):
-            original_variants = studies_db.get_variants(rsids=[search_term])
-        elif any(c.isdigit() for c in search_term) and ":" in search_term:
-            original_variants = studies_db.get_variants(variant_prefixes=[search_term])
-
-        if not original_variants:
-            return VariantSearchResponse(original_variants=[], proxy_variants=[])
-
-        original_variants = convert_duckdb_to_pydantic_model(ExtendedVariant, original_variants)
-        variant_ids = [variant.id for variant in original_variants]
-        proxies = ld_db.get_ld_proxies(variant_ids=variant_ids, rsquared_threshold=rsquared_threshold)
-        proxies = convert_duckdb_to_pydantic_model(Ld, proxies)
-        proxy_variant_ids = list(
-            set([proxy.lead_variant_id for proxy in proxies] + [proxy.proxy_variant_id for proxy in proxies])
-        )
-        proxy_variant_ids = [variant_id for variant_id in proxy_variant_ids if variant_id not in variant_ids]
-
-        variant_proxies = studies_db.get_variants(variant_ids=proxy_variant_ids)
-        proxy_variants = convert_duckdb_to_pydantic_model(ExtendedVariant, variant_proxies)
-
-        all_variant_ids = list(set(variant_ids + proxy_variant_ids))
-        colocs = studies_db.get_colocs_for_variants(variant_ids=all_variant_ids)
-        colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs)
-
-        rare_results = studies_db.get_rare_results_for_variants(variant_ids=variant_ids)
-        rare_results = convert_duckdb_to_pydantic_model(RareResult, rare_results)
-
-        for variant in original_variants:
-            populate_variant_search_results(variant, colocs, rare_results, proxies)
-        for variant in proxy_variants:
-            populate_variant_search_results(variant, colocs, rare_results, proxies)
-
-        proxy_variants = [variant for variant in proxy_variants if variant.num_colocs > 0]
-        proxy_variants.sort(key=lambda x: x.num_colocs, reverse=True)
-
-        return VariantSearchResponse(original_variants=original_variants, proxy_variants=proxy_variants)
+        variant_search_service = AsyncDBClient(VariantSearchService())
+        return await variant_search_service.search(search_term, rsquared_threshold=rsquared_threshold)
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Error in search variant: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
-
-
-def populate_variant_search_results(
-    variant: ExtendedVariant,
-    colocs: List[ColocGroup],
-    rare_results: List[RareResult],
-    proxies: List[Ld],
-):
-    variant.num_colocs = len(set([coloc.coloc_group_id for coloc in colocs if coloc.variant_id == variant.id]))
-    variant.coloc_groups = [coloc for coloc in colocs if coloc.variant_id == variant.id]
-
-    variant.num_rare_results = len(
-        set([rare_result.rare_result_group_id for rare_result in rare_results if rare_result.variant_id == variant.id])
-    )
-    variant.rare_results = [rare_result for rare_result in rare_results if rare_result.variant_id == variant.id]
-
-    variant.ld_proxies = [
-        proxy for proxy in proxies if proxy.lead_variant_id == variant.id or proxy.proxy_variant_id == variant.id
-    ]
@@ -1,11 +1,14 @@
 import traceback
 from fastapi import APIRouter, HTTPException, Path, Query, Request
 from app.services.coloc_pairs_service import ColocPairsService
+from app.db.cursor_pool import CursorPoolTimeoutError
+from app.db.executor import AsyncDBClient, iterate_in_db_executor, start_iteration
 from app.db.studies_db import StudiesDBClient
 from app.models.schemas import (
     ColocGroup,
     GetTraitsResponse,
     RareResult,
+    ResponseFormat,
     Study,
     ExtendedStudyExtraction,
     TraitResponse,
@@ -17,6 +20,12 @@ from typing import List
 from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import DEFAULT_RATE_LIMIT, SHARED_ENTITY_RESOURCE_RATE_LIMIT, limiter
 from app.services.associations_service import AssociationsService
+from app.services.columnar_format import (
+    STREAMING_FORMATS,
+    arrow_table_response,
+    encode_record_batches,
+    streaming_response,
+)
 from app.config import get_settings
 from app.services.studies_service import StudiesService
 
@@ -26,6 +35,12 @@ router = APIRouter()
 logger = get_logger(__name__)
 settings = get_settings()
 
+FORMAT_DESCRIPTION = (
+    "Response format: json (column names and rows), arrow (Arrow IPC stream), parquet, ndjson (one object per "
+    "row) or csv. The other formats return one table with the same columns as the json rows; ndjson and csv "
+    "are streamed."
+)
+
 
 @router.get(
     "",
@@ -41,10 +56,10 @@ async def get_traits(
     include_associations: bool = Query(False, description="Whether to include associations for SNPs"),
 ) -> GetTraitsResponse:
     try:
-        studies_service = StudiesService()
+        studies_service = AsyncDBClient(StudiesService())
         if not ids:
-            traits = studies_service.get_traits()
-            return traits
+            traits = await studies_service.get_traits(as_response=True)
+            return traits.to_response(request)
 
         maximum_num_traits = 10
         if len(ids) > maximum_num_traits:
@@ -52,11 +67,11 @@ async def get_traits(
                 status_code=400, detail=f"Can not request more than {maximum_num_traits} in one request"
             )
 
-        studies_db = StudiesDBClient()
-        associations_service = AssociationsService()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        associations_service = AsyncDBClient(AssociationsService())
 
         # 1. Get basic trait info for all requested traits
-        trait_data = studies_db.get_traits_by_ids(ids)
+        trait_data = await studies_db.get_traits_by_ids(ids)
         if not trait_data:
             return GetTraitsResponse(traits=[])
 
@@ -68,7 +83,7 @@ async def get_traits(
         trait_ids_numeric = list(trait_map.keys())
 
         # 2. Get all studies for these traits
-        all_studies = studies_service.get_studies_by_trait_ids(trait_ids_numeric)
+        all_studies = await studies_service.get_studies_by_trait_ids(trait_ids_numeric)
 
         # Group studies by trait_id
         studies_by_trait = {}
@@ -90,9 +105,9 @@ async def get_traits(
 
         if all_study_ids:
             # Batch fetch
-            all_rare_data = studies_db.get_rare_results_for_study_ids(all_study_ids)
-            all_extractions_data = studies_db.get_study_extractions_for_studies(all_study_ids)
-            all_colocs_data = studies_db.get_all_colocs_for_study_ids(all_study_ids)
+            all_rare_data = await studies_db.get_rare_results_for_study_ids(all_study_ids)
+            all_extractions_data = await studies_db.get_study_extractions_for_studies(all_study_ids)
+            all_colocs_data = await studies_db.get_all_colocs_for_study_ids(all_study_ids)
 
             # Convert and group
             if all_rare_data:
@@ -132,7 +147,7 @@ async def get_traits(
 
         associations = None
         if include_associations:
-            associations_raw = associations_service.get_associations(
+            associations_raw = await associations_service.get_associations(
                 all_coloc_groups, all_rare_results, all_study_extractions
             )
             associations = StudiesService.deduplicate_by_key(
@@ -158,9 +173,7 @@ async def get_traits(
     "/{trait_id}",
     response_model=TraitResponse,
     summary="Get a single trait",
-    description=(
-        "Returns metadata, studies, coloc groups, rare results, and study extractions for one trait. "
-    ),
+    description=("Returns metadata, studies, coloc groups, rare results, and study extractions for one trait. "),
 )
 @time_endpoint
 @limiter.shared_limit(SHARED_ENTITY_RESOURCE_RATE_LIMIT, scope="entity_resource_reads")
@@ -170,44 +183,44 @@ async def get_trait(
     include_associations: bool = Query(False, description="Whether to include associations for SNPs"),
 ) -> TraitResponse:
     try:
-        studies_db = StudiesDBClient()
-        associations_service = AssociationsService()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        associations_service = AsyncDBClient(AssociationsService())
 
         if not trait_id.isdigit():
             trait_id = trait_id.replace("_", "-")
 
-        trait = studies_db.get_trait(trait_id)
+        trait = await studies_db.get_trait(trait_id)
         if trait is None:
             raise HTTPException(status_code=404, detail=f"Trait {trait_id} not found")
 
         trait = convert_duckdb_to_pydantic_model(Trait, trait)
-        studies_service = StudiesService()
-        studies = studies_service.get_studies_by_trait_ids([trait.id])
+        studies_service = AsyncDBClient(StudiesService())
+        studies = await studies_service.get_studies_by_trait_ids([trait.id])
         trait = populate_trait_studies(trait, studies)
         rare_results = []
         study_extractions = []
         colocs = []
 
         if trait.rare_study is not None:
-            rare_results_data = studies_db.get_rare_results_for_study_id(trait.rare_study.id)
+            rare_results_data = await studies_db.get_rare_results_for_study_id(trait.rare_study.id)
             rare_results = convert_duckdb_to_pydantic_model(RareResult, rare_results_data) if rare_results_data else []
 
         study_ids = [study.id for study in [trait.common_study, trait.rare_study] if study is not None]
         if study_ids:
-            study_extractions_data = studies_db.get_study_extractions_for_studies(study_ids)
+            study_extractions_data = await studies_db.get_study_extractions_for_studies(study_ids)
             study_extractions = (
                 convert_duckdb_to_pydantic_model(ExtendedStudyExtraction, study_extractions_data)
                 if study_extractions_data
                 else []
             )
 
-            colocs_data = studies_db.get_all_colocs_for_study_ids(study_ids)
+            colocs_data = await studies_db.get_all_colocs_for_study_ids(study_ids)
             if colocs_data:
                 colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs_data)
 
         associations = None
         if include_associations:
-            associations = associations_service.get_associations(colocs, rare_results, study_extractions)
+            associations = await associations_service.get_associations(colocs, rare_results, study_extractions)
 
         return TraitResponse(
             trait=trait,
@@ -226,9 +239,7 @@ async def get_trait(
 @router.get(
     "/{trait_id}/coloc-pairs",
     summary="Get coloc pairs for a trait",
-    description=(
-        "Returns coloc pair data for SNPs linked to the trait via coloc groups. "
-    ),
+    description=("Returns coloc pair data for SNPs linked to the trait via coloc groups. "),
 )
 @time_endpoint
 @limiter.limit(DEFAULT_RATE_LIMIT)
@@ -237,29 +248,40 @@ async def get_trait_coloc_pairs(
     trait_id: str = Path(..., description="Trait ID or name"),
     h3_threshold: float = Query(0.0, description="H3 threshold for coloc pairs"),
     h4_threshold: float = Query(0.8, description="H4 threshold for coloc pairs"),
+    response_format: ResponseFormat = Query(ResponseFormat.json, alias="format", description=FORMAT_DESCRIPTION),
 ) -> dict:
     try:
-        studies_db = StudiesDBClient()
-        coloc_pairs_service = ColocPairsService()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        coloc_pairs_service = AsyncDBClient(ColocPairsService())
 
-        trait = studies_db.get_trait(trait_id)
+        trait = await studies_db.get_trait(trait_id)
         if trait is None:
             raise HTTPException(status_code=404, detail=f"Trait {trait_id} not found")
 
         trait = convert_duckdb_to_pydantic_model(Trait, trait)
-        studies_service = StudiesService()
-        studies = studies_service.get_studies_by_trait_ids([trait.id])
+        studies_service = AsyncDBClient(StudiesService())
+        studies = await studies_service.get_studies_by_trait_ids([trait.id])
         trait = populate_trait_studies(trait, studies)
 
         study_ids = [study.id for study in [trait.common_study, trait.rare_study] if study is not None]
-        colocs_data = studies_db.get_all_colocs_for_study_ids(study_ids) if study_ids else []
+        colocs_data = await studies_db.get_all_colocs_for_study_ids(study_ids) if study_ids else []
         if colocs_data:
             colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs_data)
         else:
             colocs = []
 
         variant_ids = sorted([coloc.variant_id for coloc in colocs])
-        coloc_pairs = coloc_pairs_service.get_coloc_pairs_full(
+        if response_format != ResponseFormat.json:
+            table = await coloc_pairs_service.get_coloc_pairs_full_arrow(
+                variant_ids, h3_threshold=h3_threshold, h4_threshold=h4_threshold
+            )
+            filename = f"trait_{trait.id}_coloc_pairs"
+            if response_format in STREAMING_FORMATS:
+                batches = table.to_batches(max_chunksize=settings.STREAM_BATCH_SIZE)
+                return streaming_response(encode_record_batches(batches, response_format), response_format, filename)
+            return arrow_table_response(table, response_format, filename)
+
+        coloc_pairs = await coloc_pairs_service.get_coloc_pairs_full(
             variant_ids, h3_threshold=h3_threshold, h4_threshold=h4_threshold
         )
         if coloc_pairs:
@@ -289,10 +311,24 @@ async def get_trait_coloc_pairs(
 async def get_trait_associations_full(
     request: Request,
     trait_id: str = Path(..., description="Trait ID or name"),
+    response_format: ResponseFormat = Query(ResponseFormat.json, alias="format", description=FORMAT_DESCRIPTION),
 ) -> dict:
     try:
-        association_service = AssociationsService()
-        result = association_service.get_associations_full(trait_id)
+        association_service = AsyncDBClient(AssociationsService())
+        if response_format in STREAMING_FORMATS:
+            batches = await association_service.stream_associations_full(trait_id)
+            if batches is None:
+                raise HTTPException(status_code=404, detail=f"Trait {trait_id} not found")
+            chunks = await start_iteration(iterate_in_db_executor(encode_record_batches(batches, response_format)))
+            return streaming_response(chunks, response_format, f"trait_{trait_id}_associations_full")
+
+        if response_format != ResponseFormat.json:
+            table = await association_service.get_associations_full_arrow(trait_id)
+            if table is None:
+                raise HTTPException(status_code=404, detail=f"Trait {trait_id} not found")
+            return arrow_table_response(table, response_format, f"trait_{trait_id}_associations_full")
+
+        result = await association_service.get_associations_full(trait_id)
         if result is None:
             raise HTTPException(status_code=404, detail=f"Trait {trait_id} not found")
 
@@ -303,6 +339,8 @@ async def get_trait_associations_full(
         }
     except HTTPException as e:
         raise e
+    except CursorPoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Error in get_trait_associations_full: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=traceback.format_exc())
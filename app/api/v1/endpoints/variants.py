@@ -2,17 +2,23 @@ import traceback
 from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import StreamingResponse
 
+from app.config import get_settings
+from app.db.cursor_pool import CursorPoolTimeoutError
+from app.db.executor import AsyncDBClient, iterate_in_db_executor, run_in_db_executor, start_iteration
 from app.services.coloc_pairs_service import ColocPairsService
+from app.services.ld_service import LdService
 from app.db.studies_db import StudiesDBClient
-from app.db.ld_db import LdDBClient
 from app.models.schemas import (
     ColocGroup,
     ExtendedColocGroup,
     ExtendedRareResult,
     ExtendedStudyExtraction,
+    MAX_VARIANT_IDENTIFIERS,
     GetVariantsResponse,
     RareResult,
+    ResponseFormat,
     Variant,
+    VariantIdentifiersRequest,
     VariantResponse,
     convert_duckdb_to_pydantic_model,
 )
@@ -20,10 +26,13 @@ from typing import List, Optional, Tuple
 from app.logging_config import get_logger, time_endpoint
 from app.rate_limiting import DEFAULT_RATE_LIMIT, SHARED_ENTITY_RESOURCE_RATE_LIMIT, limiter
 from app.services.associations_service import AssociationsService
+from app.services.columnar_format import MEDIA_TYPES, encode_record_batches
 from app.services.studies_service import StudiesService
 from app.services.summary_stat_service import SummaryStatService
+from app.services.variant_positions import GenomicRange, get_variant_position_index
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter()
 
 
@@ -31,7 +40,10 @@ router = APIRouter()
     "",
     response_model=GetVariantsResponse,
     summary="Search variants or fetch by genomic range",
-    description="Returns variant annotations for the requested variants or genomic range.",
+    description=(
+        "Returns variant annotations for the requested variants or genomic range. "
+        "Genomic ranges are paged by position: pass next_cursor back as cursor to fetch the next page."
+    ),
 )
 @time_endpoint
 @limiter.shared_limit(SHARED_ENTITY_RESOURCE_RATE_LIMIT, scope="entity_resource_reads")
@@ -41,6 +53,13 @@ async def get_variants(
         None, description="List of variants (variant_ids, rsids, or variant strings - auto-detected)"
     ),
     grange: str = Query(None, description="Genomic range (e.g. chr:start-end)"),
+    limit: int = Query(
+        settings.GRANGE_PAGE_SIZE,
+        ge=1,
+        le=settings.GRANGE_MAX_PAGE_SIZE,
+        description="Maximum number of variants in the genomic range to return",
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page of a genomic range"),
     expand: bool = Query(
         False, description="Return full VariantResponse for each variant (max 10, not available with grange)"
     ),
@@ -64,14 +83,27 @@ async def get_variants(
                 detail="expand is not available when using grange filter.",
             )
 
-        studies_db = StudiesDBClient()
+        studies_db = AsyncDBClient(StudiesDBClient())
         variant_ids, rsids, variant_prefixes, variant_strings = _classify_variants(variants or [])
-        variant_rows = studies_db.get_variants(
+
+        grange_variant_ids, next_cursor = [], None
+        if grange:
+            try:
+                genomic_range = GenomicRange.parse(grange)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="grange must be chr:start-end, e.g. 7:37945678-37964907")
+            variant_position_index = await run_in_db_executor(get_variant_position_index)
+            try:
+                grange_variant_ids, next_cursor = variant_position_index.page(genomic_range, limit, cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor {cursor}")
+            variant_ids = variant_ids + grange_variant_ids
+
+        variant_rows = await studies_db.get_variants(
             variant_ids=variant_ids if variant_ids else None,
             rsids=rsids if rsids else None,
             variant_prefixes=variant_prefixes if variant_prefixes else None,
             variant_strings=variant_strings if variant_strings else None,
-            grange=grange,
         )
         variant_rows = convert_duckdb_to_pydantic_model(Variant, variant_rows)
         variant_rows = StudiesService.deduplicate_by_key(
@@ -80,7 +112,11 @@ async def get_variants(
         )
 
         if not variant_rows:
-            return GetVariantsResponse(variants=[])
+            return GetVariantsResponse(variants=[], next_cursor=next_cursor)
+
+        if grange_variant_ids:
+            grange_order = {variant_id: position for position, variant_id in enumerate(grange_variant_ids)}
+            variant_rows.sort(key=lambda v: grange_order.get(v.id, -1))
 
         if not isinstance(variant_rows, list):
             variant_rows = [variant_rows]
@@ -92,14 +128,14 @@ async def get_variants(
                     status_code=400,
                     detail=f"Can not request more than {maximum_num_variants_expanded} variants when expand=True.",
                 )
-            coloc_pairs_service = ColocPairsService()
-            associations_service = AssociationsService()
-            studies_service = StudiesService()
+            coloc_pairs_service = AsyncDBClient(ColocPairsService())
+            associations_service = AsyncDBClient(AssociationsService())
+            studies_service = AsyncDBClient(StudiesService())
 
             variant_ids_to_expand = [v.id for v in variant_rows]
-            colocs = studies_db.get_colocs_for_variants(variant_ids_to_expand)
-            rare_results = studies_db.get_rare_results_for_variants(variant_ids_to_expand)
-            study_extractions_direct = studies_db.get_study_extractions_for_variants(variant_ids_to_expand)
+            colocs = await studies_db.get_colocs_for_variants(variant_ids_to_expand)
+            rare_results = await studies_db.get_rare_results_for_variants(variant_ids_to_expand)
+            study_extractions_direct = await studies_db.get_study_extractions_for_variants(variant_ids_to_expand)
 
             colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs) if colocs else []
             rare_results = convert_duckdb_to_pydantic_model(RareResult, rare_results) if rare_results else []
@@ -114,7 +150,7 @@ async def get_variants(
             extra_ids = [eid for eid in study_extraction_ids_from_colocs if eid not in existing_ids]
             study_extractions = list(study_extractions_direct)
             if extra_ids:
-                extra_data = studies_db.get_study_extractions_by_id(extra_ids)
+                extra_data = await studies_db.get_study_extractions_by_id(extra_ids)
                 extra_extractions = convert_duckdb_to_pydantic_model(ExtendedStudyExtraction, extra_data)
                 study_extractions = study_extractions + (
                     extra_extractions if isinstance(extra_extractions, list) else [extra_extractions]
@@ -140,16 +176,18 @@ async def get_variants(
                 )
                 v_variant_ids = list(set(v_variant_ids))
                 if v_variant_ids:
-                    coloc_pairs = coloc_pairs_service.get_coloc_pairs_full(v_variant_ids, h4_threshold=h4_threshold)
+                    coloc_pairs = await coloc_pairs_service.get_coloc_pairs_full(
+                        v_variant_ids, h4_threshold=h4_threshold
+                    )
 
             if include_coloc_pairs and coloc_pairs is not None:
-                study_extractions_dedup = studies_service.merge_study_extractions_for_coloc_pairs(
+                study_extractions_dedup = await studies_service.merge_study_extractions_for_coloc_pairs(
                     study_extractions_dedup, coloc_pairs
                 )
 
             associations = []
             if include_associations:
-                associations_raw = associations_service.get_associations(
+                associations_raw = await associations_service.get_associations(
                     colocs_dedup, rare_results_dedup, study_extractions_dedup
                 )
                 associations = StudiesService.deduplicate_by_key(
@@ -184,7 +222,7 @@ async def get_variants(
                 associations=associations if include_associations else None,
             )
         else:
-            return GetVariantsResponse(variants=variant_rows)
+            return GetVariantsResponse(variants=variant_rows, next_cursor=next_cursor)
 
     except HTTPException as e:
         raise e
@@ -193,6 +231,31 @@ async def get_variants(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/resolve",
+    summary="Resolve variant identifiers in bulk",
+    description=(
+        f"Resolves up to {MAX_VARIANT_IDENTIFIERS} variant identifiers (variant_ids, rsids, variant strings or "
+        "chr:bp prefixes - auto-detected) in one request, streamed as NDJSON in input order: one line per matching "
+        "variant, with the identifier it was resolved from. Identifiers that match no variant are returned once "
+        "with a null id."
+    ),
+)
+@time_endpoint
+@limiter.limit(DEFAULT_RATE_LIMIT)
+async def resolve_variants(request: Request, body: VariantIdentifiersRequest) -> StreamingResponse:
+    try:
+        studies_db = StudiesDBClient()
+        batches = studies_db.stream_resolved_variants(body.variants)
+        chunks = await start_iteration(iterate_in_db_executor(encode_record_batches(batches, ResponseFormat.ndjson)))
+        return StreamingResponse(chunks, media_type=MEDIA_TYPES[ResponseFormat.ndjson])
+    except CursorPoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        logger.error(f"Error in resolve_variants: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
     "/{variant_id}/summary-stats",
     summary="Download summary statistics for a variant",
@@ -208,13 +271,13 @@ async def get_variant_with_summary_stats(
     variant_id: int = Path(..., description="Variant ID (variant_id)"),
 ):
     try:
-        studies_db = StudiesDBClient()
-        variant = studies_db.get_variant(variant_id)
+        studies_db = AsyncDBClient(StudiesDBClient())
+        variant = await studies_db.get_variant(variant_id)
         if variant is None:
             raise HTTPException(status_code=404, detail="Variant not found")
-        colocs = studies_db.get_colocs_for_variants([variant_id])
-        rare_results = studies_db.get_rare_results_for_variants([variant_id])
-        study_extractions = studies_db.get_study_extractions_for_variant(variant_id)
+        colocs = await studies_db.get_colocs_for_variants([variant_id])
+        rare_results = await studies_db.get_rare_results_for_variants([variant_id])
+        study_extractions = await studies_db.get_study_extractions_for_variant(variant_id)
 
         colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs)
         rare_results = convert_duckdb_to_pydantic_model(RareResult, rare_results)
@@ -226,7 +289,7 @@ async def get_variant_with_summary_stats(
             + [rare_result.study_extraction_id for rare_result in rare_results]
             + [study_extraction.id for study_extraction in study_extractions]
         )
-        all_study_extractions = studies_db.get_study_extractions_by_id(all_study_extraction_ids)
+        all_study_extractions = await studies_db.get_study_extractions_by_id(all_study_extraction_ids)
         all_study_extractions = convert_duckdb_to_pydantic_model(ExtendedStudyExtraction, all_study_extractions)
 
         summary_stat_service = SummaryStatService()
@@ -263,25 +326,25 @@ async def get_variant(
     rsquared_threshold: float = Query(0.9, description="R² threshold for LD proxy fallback when no coloc/rare"),
 ) -> VariantResponse:
     try:
-        variant_id, variant_row = _resolve_variant_id(variant_id)
+        variant_id, variant_row = await _resolve_variant_id(variant_id)
         if variant_id is None or variant_row is None:
             raise HTTPException(status_code=404, detail="Variant not found")
         if rsquared_threshold < 0.8 or rsquared_threshold > 1:
             raise HTTPException(status_code=400, detail="R² threshold must be between 0.8 and 1")
 
-        studies_db = StudiesDBClient()
-        studies_service = StudiesService()
-        coloc_pairs_service = ColocPairsService()
-        associations_service = AssociationsService()
+        studies_db = AsyncDBClient(StudiesDBClient())
+        studies_service = AsyncDBClient(StudiesService())
+        coloc_pairs_service = AsyncDBClient(ColocPairsService())
+        associations_service = AsyncDBClient(AssociationsService())
 
         variant = variant_row
-        colocs = studies_db.get_colocs_for_variants([variant_id])
+        colocs = await studies_db.get_colocs_for_variants([variant_id])
         if colocs:
             colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs)
 
-        rare_results = studies_db.get_rare_results_for_variants([variant_id])
-        study_extractions_variant = studies_db.get_study_extractions_for_variant(variant_id)
-        study_extractions_from_colocs = studies_db.get_study_extractions_by_id(
+        rare_results = await studies_db.get_rare_results_for_variants([variant_id])
+        study_extractions_variant = await studies_db.get_study_extractions_for_variant(variant_id)
+        study_extractions_from_colocs = await studies_db.get_study_extractions_by_id(
             [coloc.study_extraction_id for coloc in colocs]
         )
         study_extractions = study_extractions_variant + study_extractions_from_colocs
@@ -289,8 +352,8 @@ async def get_variant(
         if not colocs and not rare_results:
             variant = convert_duckdb_to_pydantic_model(Variant, variant)
             ld_proxy_variants = []
-            ld_db = LdDBClient()
-            proxies = ld_db.get_ld_proxies(variant_ids=[variant_id], rsquared_threshold=rsquared_threshold)
+            ld_service = AsyncDBClient(LdService())
+            proxies = await ld_service.get_ld_proxies(variant_ids=[variant_id], rsquared_threshold=rsquared_threshold)
             if proxies:
                 proxy_variant_ids = []
 
@@ -302,11 +365,11 @@ async def get_variant(
                 proxy_variant_ids = list(set(proxy_variant_ids))
 
                 if proxy_variant_ids:
-                    proxy_colocs = studies_db.get_colocs_for_variants(variant_ids=proxy_variant_ids)
-                    proxy_rare = studies_db.get_rare_results_for_variants(variant_ids=proxy_variant_ids)
+                    proxy_colocs = await studies_db.get_colocs_for_variants(variant_ids=proxy_variant_ids)
+                    proxy_rare = await studies_db.get_rare_results_for_variants(variant_ids=proxy_variant_ids)
                     proxy_colocs = convert_duckdb_to_pydantic_model(ColocGroup, proxy_colocs)
                     proxy_rare = convert_duckdb_to_pydantic_model(RareResult, proxy_rare)
-                    proxy_variant_rows = studies_db.get_variants(variant_ids=proxy_variant_ids)
+                    proxy_variant_rows = await studies_db.get_variants(variant_ids=proxy_variant_ids)
                     proxy_variants = convert_duckdb_to_pydantic_model(Variant, proxy_variant_rows)
 
                     if not isinstance(proxy_variants, list):
@@ -340,12 +403,14 @@ async def get_variant(
             )
             variant_ids = list(set(variant_ids))
             if variant_ids:
-                coloc_pairs = coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
+                coloc_pairs = await coloc_pairs_service.get_coloc_pairs_full(variant_ids, h4_threshold=h4_threshold)
 
         if include_coloc_pairs and coloc_pairs is not None:
-            study_extractions = studies_service.merge_study_extractions_for_coloc_pairs(study_extractions, coloc_pairs)
+            study_extractions = await studies_service.merge_study_extractions_for_coloc_pairs(
+                study_extractions, coloc_pairs
+            )
 
-        associations = associations_service.get_associations(colocs, rare_results, study_extractions)
+        associations = await associations_service.get_associations(colocs, rare_results, study_extractions)
 
         extended_colocs = []
         for coloc in colocs:
@@ -401,7 +466,7 @@ def _classify_variants(variants: List[str]) -> Tuple[List[int], List[str], List[
     return variant_ids, rsids, variant_prefixes, variant_strings
 
 
-def _resolve_variant_id(variant_id: str) -> Tuple[Optional[int], Optional[dict]]:
+async def _resolve_variant_id(variant_id: str) -> Tuple[Optional[int], Optional[dict]]:
     """
     Resolve a variant identifier (variant_id, rsid, chr:pos, or chr:pos_ref_alt) to (variant_id, variant_row).
     Returns (None, None) if not found.
@@ -412,9 +477,9 @@ def _resolve_variant_id(variant_id: str) -> Tuple[Optional[int], Optional[dict]]
     if not s:
         return None, None
 
-    studies_db = StudiesDBClient()
+    studies_db = AsyncDBClient(StudiesDBClient())
     variant_ids, rsids, variant_prefixes, variant_strings = _classify_variants([s])
-    variant_rows = studies_db.get_variants(
+    variant_rows = await studies_db.get_variants(
         variant_ids=variant_ids if variant_ids else None,
         rsids=rsids if rsids else None,
         variant_prefixes=variant_prefixes if variant_prefixes else None,
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Any, Optional
 
 
 class Settings(BaseSettings):
@@ -28,9 +29,63 @@ class Settings(BaseSettings):
     GA4_API_SECRET: str = ""
     OCI_BUCKET_NAME: str = ""
     OCI_NAMESPACE: str = ""
+    DB_EXECUTOR_MAX_WORKERS: int = 8
+    SHARD_QUERY_PARALLELISM: int = 4
+    # Cursors per DuckDB pool, defaulting to one per DB executor and shard worker thread plus
+    # DUCKDB_STREAM_CURSORS for streaming responses
+    DUCKDB_CURSOR_POOL_SIZE: Optional[int] = None
+    DUCKDB_STREAM_CURSORS: int = 4
+    DUCKDB_STREAM_CURSOR_ACQUIRE_TIMEOUT: float = 0.0
+    DUCKDB_CURSOR_ACQUIRE_TIMEOUT: float = 30.0
+    DUCKDB_CURSOR_LEAK_SECONDS: float = 300.0
+    CACHE_LOCK_TTL_SECONDS: float = 120.0
+    CACHE_LOCK_WAIT_SECONDS: float = 120.0
+    CACHE_LOCK_POLL_INTERVAL_SECONDS: float = 0.1
+    CACHE_COMPRESSION_LEVEL: int = 3
+    LOCAL_CACHE_MAX_ENTRIES: int = 64
+    LOCAL_CACHE_TTL_SECONDS: float = 300.0
+    CACHE_NAMESPACE_REFRESH_SECONDS: float = 5.0
+    CACHE_NAMESPACE_RETIRED_TTL_SECONDS: int = 900
+    CACHE_REAPER_INTERVAL_SECONDS: float = 3600.0
+    CACHE_WARMUP_WORKERS: int = 2
+    CACHE_WARMUP_MOST_ACCESSED_TRAITS: int = 200
+    CACHE_WARMUP_MIN_COLOC_GROUPS: int = 100
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 300
+    STREAM_BATCH_SIZE: int = 50000
+    # Directory for the per-release entity count Parquet files (app/materialize_entity_counts.py),
+    # defaulting to an entity_counts directory next to STUDIES_DB_PATH
+    ENTITY_COUNTS_DIR: Optional[str] = None
+    # Directory for the per-release sorted variant position files (app/materialize_variant_positions.py),
+    # defaulting to a variant_positions directory next to STUDIES_DB_PATH
+    VARIANT_POSITIONS_DIR: Optional[str] = None
+    # Directory for the per-release LD CSR index (app/materialize_ld_index.py),
+    # defaulting to an ld_index directory next to LD_DB_PATH
+    LD_INDEX_DIR: Optional[str] = None
+    LD_MATRIX_MAX_VARIANTS: int = 2000
+    GRANGE_PAGE_SIZE: int = 1000
+    GRANGE_MAX_PAGE_SIZE: int = 10000
+    DUCKDB_MEMORY_LIMIT: str = "4GB"
+    DUCKDB_THREADS: Optional[int] = None
+    DUCKDB_TEMP_DIRECTORY: Optional[str] = None
+    DUCKDB_ENABLE_OBJECT_CACHE: bool = True
+    DUCKDB_ENABLE_EXTERNAL_FILE_CACHE: bool = True
+    # Per-database overrides of the DUCKDB_* defaults above, keyed by database name, e.g.
+    # DUCKDB_DATABASE_SETTINGS='{"associations_full": {"memory_limit": "12GB", "threads": 8}, "ld": {"memory_limit": "1GB"}}'
+    DUCKDB_DATABASE_SETTINGS: dict[str, dict[str, Any]] = {}
 
     model_config = {"env_file": ".env"}
 
+    def get_duckdb_settings(self, database: str) -> dict[str, Any]:
+        duckdb_settings = {
+            "memory_limit": self.DUCKDB_MEMORY_LIMIT,
+            "threads": self.DUCKDB_THREADS,
+            "temp_directory": self.DUCKDB_TEMP_DIRECTORY,
+            "enable_object_cache": self.DUCKDB_ENABLE_OBJECT_CACHE,
+            "enable_external_file_cache": self.DUCKDB_ENABLE_EXTERNAL_FILE_CACHE,
+        }
+        duckdb_settings.update(self.DUCKDB_DATABASE_SETTINGS.get(database, {}))
+        return {name: value for name, value in duckdb_settings.items() if value is not None}
+
 
 @lru_cache()
 def get_settings():
@@ -1,23 +1,24 @@
 from app.config import get_settings
 from functools import lru_cache
-from typing import List, Tuple
-import duckdb
+from typing import Iterator, List, Tuple
 
-from app.db.utils import log_performance
+import pyarrow as pa
+
+from app.db.cursor_pool import get_cursor_pool
+from app.db.utils import connect_read_only, log_performance, registered_arrow_table
 
 settings = get_settings()
 
 
 @lru_cache()
 def get_associations_db_connection():
-    connection = duckdb.connect(settings.ASSOCIATIONS_DB_PATH, read_only=True)
-    connection.execute("PRAGMA memory_limit='4GB'")
-    return connection
+    return connect_read_only("associations", settings.ASSOCIATIONS_DB_PATH)
 
 
 class AssociationsDBClient:
-    def __init__(self):
-        self.associations_conn = get_associations_db_connection()
+    @property
+    def associations_conn(self):
+        return get_cursor_pool("associations", get_associations_db_connection).thread_cursor()
 
     @log_performance
     def get_associations_by_table_name(
@@ -27,30 +28,83 @@ class AssociationsDBClient:
     ) -> Tuple[List[tuple], List[str]]:
         if not snp_study_pairs:
             return [], []
+        return self._get_associations_for_pairs(table_name, snp_study_pairs)
 
-        all_variant_ids = [pair[0] for pair in snp_study_pairs]
-        all_study_ids = [pair[1] for pair in snp_study_pairs]
+    @log_performance
+    def get_associations_by_snp_study_pairs(self, snp_study_pairs: List[Tuple[int, int]]):
+        """
+        Associations for exactly these (variant_id, study_id) pairs. The pairs are joined on both columns,
+        rather than filtering variant_id and study_id independently, which returns every variant x study
+        combination in the two lists.
+        """
+        if not snp_study_pairs:
+            return [], []
+        return self._get_associations_for_pairs("associations", snp_study_pairs)
 
-        query = f"""
-            SELECT * FROM {table_name} WHERE variant_id IN (SELECT * FROM UNNEST(?)) AND study_id IN (SELECT * FROM UNNEST(?))
+    def stream_associations_by_snp_study_pairs(
+        self, snp_study_pairs: List[Tuple[int, int]], batch_size: int = None
+    ) -> Iterator[pa.RecordBatch]:
         """
-        cursor = self.associations_conn.execute(query, [all_variant_ids, all_study_ids])
-        rows = cursor.fetchall()
-        columns = [d[0] for d in cursor.description]
-        return rows, columns
+        get_associations_by_snp_study_pairs as Arrow record batches of at most batch_size rows. Uses a leased
+        cursor, as batches may be pulled from any thread.
+        """
+        if not snp_study_pairs:
+            return
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        pairs_table = snp_study_pairs_table(snp_study_pairs)
+        with (
+            get_cursor_pool("associations", get_associations_db_connection).lease() as cursor,
+            registered_arrow_table(cursor, pairs_table, "snp_study_pairs") as pairs,
+        ):
+            cursor.execute(pairs_join_query("associations", pairs))
+            yield from cursor.fetch_record_batch(batch_size)
 
     @log_performance
-    def get_associations_by_snp_study_pairs(self, snp_study_pairs: List[Tuple[int, int]]):
-        if not snp_study_pairs:
+    def get_associations_by_variant_ids_and_study_ids(self, variant_ids: List[int], study_ids: List[int]):
+        """Associations for every combination of variant_ids and study_ids"""
+        if not variant_ids or not study_ids:
             return [], []
 
-        all_variant_ids = [pair[0] for pair in snp_study_pairs]
-        all_study_ids = [pair[1] for pair in snp_study_pairs]
+        connection = self.associations_conn
+        variants_table = pa.table({"variant_id": pa.array(variant_ids, pa.int64())})
+        studies_table = pa.table({"study_id": pa.array(study_ids, pa.int64())})
+        with (
+            registered_arrow_table(connection, variants_table, "variant_ids") as variants,
+            registered_arrow_table(connection, studies_table, "study_ids") as studies,
+        ):
+            query = f"""
+                SELECT * FROM associations
+                WHERE variant_id IN (SELECT variant_id FROM {variants}) AND study_id IN (SELECT study_id FROM {studies})
+            """
+            cursor = connection.execute(query)
+            rows = cursor.fetchall()
+            columns = [d[0] for d in cursor.description]
+        return rows, columns
 
-        query = """
-            SELECT * FROM associations WHERE variant_id IN (SELECT * FROM UNNEST(?)) AND study_id IN (SELECT * FROM UNNEST(?))
-        """
-        cursor = self.associations_conn.execute(query, [all_variant_ids, all_study_ids])
-        rows = cursor.fetchall()
-        columns = [d[0] for d in cursor.description]
+    def _get_associations_for_pairs(
+        self, table_name: str, snp_study_pairs: List[Tuple[int, int]]
+    ) -> Tuple[List[tuple], List[str]]:
+        connection = self.associations_conn
+        with registered_arrow_table(connection, snp_study_pairs_table(snp_study_pairs), "snp_study_pairs") as pairs:
+            cursor = connection.execute(pairs_join_query(table_name, pairs))
+            rows = cursor.fetchall()
+            columns = [d[0] for d in cursor.description]
         return rows, columns
+
+
+def pairs_join_query(table_name: str, pairs_table_name: str) -> str:
+    return f"""
+        SELECT associations.* FROM {table_name} AS associations
+        JOIN {pairs_table_name} AS pairs USING (variant_id, study_id)
+    """
+
+
+def snp_study_pairs_table(snp_study_pairs: List[Tuple[int, int]]) -> pa.Table:
+    """The distinct pairs (so each association is returned once) as a variant_id, study_id Arrow table"""
+    unique_pairs = dict.fromkeys(snp_study_pairs)
+    return pa.table(
+        {
+            "variant_id": pa.array([pair[0] for pair in unique_pairs], pa.int64()),
+            "study_id": pa.array([pair[1] for pair in unique_pairs], pa.int64()),
+        }
+    )
@@ -1,23 +1,24 @@
 from app.config import get_settings
 from functools import lru_cache
-from typing import Iterable, List, Tuple
-import duckdb
+from typing import Iterable, Iterator, List, Tuple
 
-from app.db.utils import log_performance
+import pyarrow as pa
+
+from app.db.associations_db import pairs_join_query, snp_study_pairs_table
+from app.db.cursor_pool import get_cursor_pool
+from app.db.utils import connect_read_only, log_performance, registered_arrow_table
 
 settings = get_settings()
 
 
 @lru_cache()
 def get_associations_full_db_connection():
-    connection = duckdb.connect(settings.ASSOCIATIONS_FULL_DB_PATH, read_only=True)
-    connection.execute("PRAGMA memory_limit='4GB'")
-    return connection
+    return connect_read_only("associations_full", settings.ASSOCIATIONS_FULL_DB_PATH)
 
 
 @lru_cache(maxsize=200)
 def _get_cached_study_ids_for_table(table_name: str) -> frozenset[int]:
-    connection = get_associations_full_db_connection()
+    connection = get_cursor_pool("associations_full", get_associations_full_db_connection).thread_cursor()
     query = f"SELECT DISTINCT study_id FROM {table_name}"
     rows = connection.execute(query).fetchall()
     return frozenset(row[0] for row in rows)
@@ -28,8 +29,9 @@ def clear_table_study_ids_cache() -> None:
 
 
 class AssociationsFullDBClient:
-    def __init__(self):
-        self.associations_conn = get_associations_full_db_connection()
+    @property
+    def associations_conn(self):
+        return get_cursor_pool("associations_full", get_associations_full_db_connection).thread_cursor()
 
     @log_performance
     def get_associations_metadata(self):
@@ -53,10 +55,59 @@ class AssociationsFullDBClient:
         if not variant_ids or not study_ids:
             return [], []
 
-        query = f"""
-            SELECT * FROM {table_name} WHERE variant_id IN (SELECT * FROM UNNEST(?)) AND study_id IN (SELECT * FROM UNNEST(?))
-        """
-        cursor = self.associations_conn.execute(query, [variant_ids, study_ids])
+        cursor = self.associations_conn.execute(_associations_query(table_name), [variant_ids, study_ids])
         rows = cursor.fetchall()
         columns = [d[0] for d in cursor.description]
         return rows, columns
+
+    @log_performance
+    def get_associations_arrow_by_table_name(
+        self,
+        table_name: str,
+        variant_ids: List[int],
+        study_ids: List[int],
+    ) -> pa.Table:
+        """get_associations_by_table_name as an Arrow table, without materialising Python rows"""
+        return self.associations_conn.execute(
+            _associations_query(table_name), [variant_ids, study_ids]
+        ).fetch_arrow_table()
+
+    def stream_associations_by_table_name(
+        self,
+        table_name: str,
+        variant_ids: List[int],
+        study_ids: List[int],
+        batch_size: int = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Yield the associations of one table as Arrow record batches of at most batch_size rows, so the
+        caller never holds more than one batch. Uses a leased cursor, as batches may be pulled from any thread.
+        """
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        with get_cursor_pool("associations_full", get_associations_full_db_connection).lease() as cursor:
+            cursor.execute(_associations_query(table_name), [variant_ids, study_ids])
+            yield from cursor.fetch_record_batch(batch_size)
+
+    def stream_associations_by_snp_study_pairs(
+        self,
+        table_name: str,
+        snp_study_pairs: List[Tuple[int, int]],
+        batch_size: int = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """The associations in one table for exactly these (variant_id, study_id) pairs, as Arrow record batches"""
+        if not snp_study_pairs:
+            return
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        pairs_table = snp_study_pairs_table(snp_study_pairs)
+        with (
+            get_cursor_pool("associations_full", get_associations_full_db_connection).lease() as cursor,
+            registered_arrow_table(cursor, pairs_table, "snp_study_pairs") as pairs,
+        ):
+            cursor.execute(pairs_join_query(table_name, pairs))
+            yield from cursor.fetch_record_batch(batch_size)
+
+
+def _associations_query(table_name: str) -> str:
+    return f"""
+        SELECT * FROM {table_name} WHERE variant_id IN (SELECT * FROM UNNEST(?)) AND study_id IN (SELECT * FROM UNNEST(?))
+    """
@@ -0,0 +1,104 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+import msgpack
+import zstandard
+
+from app.config import get_settings
+
+settings = get_settings()
+
+FORMAT_JSON_ZSTD = 1
+FORMAT_MSGPACK_ZSTD = 2
+
+
+class CacheCodec(ABC):
+    """
+    Encodes cache values for Redis. Every payload starts with a one byte format version, so formats
+    can be added or changed without flushing the cache; payloads without a known version byte are
+    treated as the plain JSON strings stored before codecs existed.
+    """
+
+    format_version: int
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any: ...
+
+    def decode_json(self, payload: bytes) -> bytes:
+        """Return the value as JSON text, for serving it as a response body."""
+        return json.dumps(self.decode(payload)).encode()
+
+
+class JsonZstdCodec(CacheCodec):
+    """zstd-compressed JSON text. Used for serialized models, whose JSON is also the response body."""
+
+    format_version = FORMAT_JSON_ZSTD
+
+    def encode(self, value: str | bytes) -> bytes:
+        text = value.encode() if isinstance(value, str) else value
+        return bytes([self.format_version]) + _compressor().compress(text)
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(self.decode_json(payload))
+
+    def decode_json(self, payload: bytes) -> bytes:
+        return _decompressor().decompress(payload[1:])
+
+
+class MsgpackZstdCodec(CacheCodec):
+    """zstd-compressed msgpack. Used for plain row data, which is smaller and faster to decode than JSON."""
+
+    format_version = FORMAT_MSGPACK_ZSTD
+
+    def encode(self, value: Any) -> bytes:
+        packed = msgpack.packb(value, use_bin_type=True)
+        return bytes([self.format_version]) + _compressor().compress(packed)
+
+    def decode(self, payload: bytes) -> Any:
+        packed = _decompressor().decompress(payload[1:])
+        return msgpack.unpackb(packed, raw=False, strict_map_key=False)
+
+
+CODECS: dict[int, CacheCodec] = {codec.format_version: codec for codec in (JsonZstdCodec(), MsgpackZstdCodec())}
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # zstd (de)compressors are not thread safe, and are cheap to create
+    return zstandard.ZstdCompressor(level=settings.CACHE_COMPRESSION_LEVEL)
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    return zstandard.ZstdDecompressor()
+
+
+def encode_cache_value(value: Any) -> bytes:
+    """Encode a cache value: JSON text (str) as compressed JSON, anything else as compressed msgpack."""
+    if isinstance(value, str):
+        return CODECS[FORMAT_JSON_ZSTD].encode(value)
+    return CODECS[FORMAT_MSGPACK_ZSTD].encode(value)
+
+
+def _get_codec(payload: bytes) -> Optional[CacheCodec]:
+    return CODECS.get(payload[0]) if payload else None
+
+
+def decode_cache_value(payload: Optional[bytes]) -> Any:
+    if not payload:
+        return None
+    codec = _get_codec(payload)
+    if codec is None:
+        return json.loads(payload)
+    return codec.decode(payload)
+
+
+def decode_cache_value_as_json(payload: Optional[bytes]) -> Optional[bytes]:
+    if not payload:
+        return None
+    codec = _get_codec(payload)
+    if codec is None:
+        return payload
+    return codec.decode_json(payload)
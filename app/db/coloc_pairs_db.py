@@ -1,25 +1,42 @@
 from app.config import get_settings
 from functools import lru_cache
 from typing import List
-import duckdb
 import json
+import pyarrow as pa
 from app.logging_config import get_logger
-from app.db.utils import log_performance
+from app.db.cursor_pool import get_cursor_pool
+from app.db.utils import connect_read_only, log_performance
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+COLOC_PAIRS_BY_VARIANT_IDS_QUERY = """
+    SELECT * FROM coloc_pairs
+    WHERE variant_id IN (SELECT * FROM UNNEST(?))
+        AND h3 >= ?
+        AND h4 >= ?
+        AND false_positive = FALSE
+"""
+
+COLOC_PAIRS_BY_STUDY_EXTRACTION_IDS_QUERY = """
+    SELECT * FROM coloc_pairs
+    WHERE variant_id IS NULL
+        AND h4 >= ?
+        AND (study_extraction_a_id IN (SELECT * FROM UNNEST(?))
+            OR study_extraction_b_id IN (SELECT * FROM UNNEST(?)))
+        AND false_positive = FALSE
+"""
+
 
 @lru_cache()
 def get_coloc_pairs_db_connection():
-    connection = duckdb.connect(settings.COLOC_PAIRS_DB_PATH, read_only=True)
-    connection.execute("PRAGMA memory_limit='4GB'")
-    return connection
+    return connect_read_only("coloc_pairs", settings.COLOC_PAIRS_DB_PATH)
 
 
 class ColocPairsDBClient:
-    def __init__(self):
-        self.coloc_pairs_conn = get_coloc_pairs_db_connection()
+    @property
+    def coloc_pairs_conn(self):
+        return get_cursor_pool("coloc_pairs", get_coloc_pairs_db_connection).thread_cursor()
 
     @log_performance
     def get_coloc_pairs_metadata(self):
@@ -80,18 +97,24 @@ class ColocPairsDBClient:
         if not variant_ids:
             return [], []
 
-        query = """
-            SELECT * FROM coloc_pairs
-            WHERE variant_id IN (SELECT * FROM UNNEST(?))
-                AND h3 >= ?
-                AND h4 >= ?
-                AND false_positive = FALSE
-        """
-        cursor = self.coloc_pairs_conn.execute(query, [variant_ids, h3_threshold, h4_threshold])
+        cursor = self.coloc_pairs_conn.execute(
+            COLOC_PAIRS_BY_VARIANT_IDS_QUERY, [variant_ids, h3_threshold, h4_threshold]
+        )
         rows = cursor.fetchall()
         columns = [d[0] for d in cursor.description] if cursor.description else []
         return rows, columns
 
+    @log_performance
+    def get_coloc_pairs_arrow_by_variant_ids(
+        self,
+        variant_ids: List[int],
+        h3_threshold: float = 0.0,
+        h4_threshold: float = 0.8,
+    ) -> pa.Table:
+        """get_coloc_pairs_by_variant_ids as an Arrow table, without materialising Python rows"""
+        params = [variant_ids, h3_threshold, h4_threshold]
+        return self.coloc_pairs_conn.execute(COLOC_PAIRS_BY_VARIANT_IDS_QUERY, params).fetch_arrow_table()
+
     @log_performance
     def get_coloc_pairs_by_study_extraction_ids(
         self,
@@ -106,20 +129,22 @@ class ColocPairsDBClient:
         if not study_extraction_ids:
             return [], []
 
-        query = """
-            SELECT * FROM coloc_pairs
-            WHERE variant_id IS NULL
-                AND h4 >= ?
-                AND (study_extraction_a_id IN (SELECT * FROM UNNEST(?))
-                    OR study_extraction_b_id IN (SELECT * FROM UNNEST(?)))
-                AND false_positive = FALSE
-        """
         params = [h4_threshold, study_extraction_ids, study_extraction_ids]
-        cursor = self.coloc_pairs_conn.execute(query, params)
+        cursor = self.coloc_pairs_conn.execute(COLOC_PAIRS_BY_STUDY_EXTRACTION_IDS_QUERY, params)
         rows = cursor.fetchall()
         columns = [d[0] for d in cursor.description] if cursor.description else []
         return rows, columns
 
+    @log_performance
+    def get_coloc_pairs_arrow_by_study_extraction_ids(
+        self,
+        study_extraction_ids: List[int],
+        h4_threshold: float = 0.8,
+    ) -> pa.Table:
+        """get_coloc_pairs_by_study_extraction_ids as an Arrow table, without materialising Python rows"""
+        params = [h4_threshold, study_extraction_ids, study_extraction_ids]
+        return self.coloc_pairs_conn.execute(COLOC_PAIRS_BY_STUDY_EXTRACTION_IDS_QUERY, params).fetch_arrow_table()
+
     @log_performance
     def get_coloc_pairs_by_variant_ids_stream(
         self, variant_ids: List[int], h3_threshold: float = 0.0, h4_threshold: float = 0.8, batch_size: int = 10000000
@@ -134,11 +159,11 @@ class ColocPairsDBClient:
         Yields:
             JSON strings of coloc pair records
         """
-        specific_conn = duckdb.connect(settings.COLOC_PAIRS_DB_PATH, read_only=True)
-        specific_conn.execute("PRAGMA memory_limit='4GB'")
         if not variant_ids:
             return
 
+        lease = get_cursor_pool("coloc_pairs", get_coloc_pairs_db_connection).lease()
+
         query = """
             SELECT * FROM coloc_pairs
             WHERE variant_id IN (SELECT * FROM UNNEST(?))
@@ -147,10 +172,10 @@ class ColocPairsDBClient:
                 AND false_positive = FALSE
             ORDER BY variant_id
         """
-        cursor = specific_conn.execute(query, [variant_ids, h3_threshold, h4_threshold])
-        columns = [d[0] for d in cursor.description] if cursor.description else []
-
         try:
+            cursor = lease.cursor.execute(query, [variant_ids, h3_threshold, h4_threshold])
+            columns = [d[0] for d in cursor.description] if cursor.description else []
+
             yield '{"coloc_pairs": ['
 
             first_batch = True
@@ -170,5 +195,4 @@ class ColocPairsDBClient:
 
             yield "]}"
         finally:
-            cursor.close()
-            specific_conn.close()
+            lease.release()
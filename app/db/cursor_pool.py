@@ -0,0 +1,231 @@
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+import duckdb
+
+from app.config import get_settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class CursorPoolTimeoutError(Exception):
+    def __init__(self, pool_name: str, timeout: float):
+        self.pool_name = pool_name
+        super().__init__(f"Timed out after {timeout}s waiting for a cursor from the {pool_name} pool")
+
+
+def cursor_pool_size() -> int:
+    """
+    DUCKDB_CURSOR_POOL_SIZE, or enough cursors for every DB executor and shard worker thread to hold one
+    plus DUCKDB_STREAM_CURSORS for streaming leases
+    """
+    return settings.DUCKDB_CURSOR_POOL_SIZE or (
+        settings.DB_EXECUTOR_MAX_WORKERS + settings.SHARD_QUERY_PARALLELISM + settings.DUCKDB_STREAM_CURSORS
+    )
+
+
+class CursorLease:
+    """
+    A cursor leased from a CursorPool. Release it explicitly (or use it as a context manager);
+    a lease that is garbage collected without being released is reclaimed and reported as a leak.
+    """
+
+    def __init__(self, pool: "CursorPool", lease_id: int, cursor: duckdb.DuckDBPyConnection):
+        self.pool = pool
+        self.lease_id = lease_id
+        self.cursor = cursor
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def release(self):
+        if self._finalizer is not None and self._finalizer.detach() is not None:
+            self.pool._release(self.lease_id, leaked=False)
+
+    def __enter__(self) -> duckdb.DuckDBPyConnection:
+        return self.cursor
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class _LeaseRecord:
+    def __init__(self, cursor: duckdb.DuckDBPyConnection, thread_bound: bool, owner: str):
+        self.cursor = cursor
+        self.thread_bound = thread_bound
+        self.owner = owner
+        self.thread_name = threading.current_thread().name
+        self.acquired_at = time.monotonic()
+        self.leak_reported = False
+
+
+class CursorPool:
+    """
+    Bounded pool of DuckDB cursors created from one read-only connection.
+
+    Cursors share the underlying database but are independent connections, so each lease can run
+    queries in parallel with the others. Cursors are handed out either per request (lease()) or
+    per worker thread (thread_cursor()), in which case they are returned when the thread exits.
+    At most lease_limit cursors are leased per request at once, so long-running streams cannot take
+    the cursors the worker threads need.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connection_factory: Callable[[], duckdb.DuckDBPyConnection],
+        size: int = None,
+        acquire_timeout: float = None,
+        leak_seconds: float = None,
+        lease_limit: int = None,
+        lease_timeout: float = None,
+    ):
+        self.name = name
+        self.size = size or cursor_pool_size()
+        self.acquire_timeout = acquire_timeout or settings.DUCKDB_CURSOR_ACQUIRE_TIMEOUT
+        self.leak_seconds = leak_seconds or settings.DUCKDB_CURSOR_LEAK_SECONDS
+        self.lease_limit = lease_limit or settings.DUCKDB_STREAM_CURSORS
+        self.lease_timeout = settings.DUCKDB_STREAM_CURSOR_ACQUIRE_TIMEOUT if lease_timeout is None else lease_timeout
+        self._connection_factory = connection_factory
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._idle: list[duckdb.DuckDBPyConnection] = []
+        self._leases: dict[int, _LeaseRecord] = {}
+        self._next_lease_id = 0
+        self._request_leases = 0
+        self._created = 0
+        self._acquired = 0
+        self._waits = 0
+        self._total_wait_ms = 0.0
+        self._timeouts = 0
+        self._leaks_reclaimed = 0
+
+    def lease(self, timeout: float = None) -> CursorLease:
+        """
+        Lease a cursor for the duration of a request or block of work, e.g. a streaming response. Waits at
+        most timeout (default lease_timeout, which is 0 so a busy pool fails fast rather than parking the
+        calling executor thread) for a cursor, then raises CursorPoolTimeoutError.
+        """
+        return self._acquire(thread_bound=False, timeout=self.lease_timeout if timeout is None else timeout)
+
+    def thread_cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return the cursor leased to the calling thread, leasing one on first use."""
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = self._acquire(thread_bound=True)
+            self._local.lease = lease
+        return lease.cursor
+
+    def _acquire(self, thread_bound: bool, timeout: float = None) -> CursorLease:
+        timeout = self.acquire_timeout if timeout is None else timeout
+        owner = self._describe_caller()
+        started = time.perf_counter()
+        waited = False
+        with self._condition:
+            while (not self._idle and self._created >= self.size) or (
+                not thread_bound and self._request_leases >= self.lease_limit
+            ):
+                self._report_leaks()
+                remaining = timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise CursorPoolTimeoutError(self.name, timeout)
+                waited = True
+                self._condition.wait(remaining)
+
+            if self._idle:
+                cursor = self._idle.pop()
+            else:
+                cursor = self._connection_factory().cursor()
+                self._created += 1
+
+            lease_id = self._next_lease_id
+            self._next_lease_id += 1
+            self._leases[lease_id] = _LeaseRecord(cursor, thread_bound, owner)
+            if not thread_bound:
+                self._request_leases += 1
+            self._acquired += 1
+            if waited:
+                self._waits += 1
+                self._total_wait_ms += (time.perf_counter() - started) * 1000
+
+        lease = CursorLease(self, lease_id, cursor)
+        lease._finalizer = weakref.finalize(lease, self._release, lease_id, not thread_bound)
+        return lease
+
+    def _release(self, lease_id: int, leaked: bool):
+        with self._condition:
+            record = self._leases.pop(lease_id, None)
+            if record is None:
+                return
+            if not record.thread_bound:
+                self._request_leases -= 1
+            if leaked:
+                self._leaks_reclaimed += 1
+                logger.warning(
+                    f"Reclaimed leaked cursor from {self.name} pool, leased by {record.owner} "
+                    f"on thread {record.thread_name} {time.monotonic() - record.acquired_at:.1f}s ago"
+                )
+            self._idle.append(record.cursor)
+            self._condition.notify_all()
+
+    def _report_leaks(self):
+        now = time.monotonic()
+        for record in list(self._leases.values()):
+            if record.thread_bound or record.leak_reported:
+                continue
+            if now - record.acquired_at > self.leak_seconds:
+                record.leak_reported = True
+                logger.warning(
+                    f"Possible cursor leak in {self.name} pool: leased by {record.owner} "
+                    f"on thread {record.thread_name} for {now - record.acquired_at:.1f}s"
+                )
+
+    @staticmethod
+    def _describe_caller() -> str:
+        frame = sys._getframe(3)
+        return f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})"
+
+    def get_metrics(self) -> dict:
+        with self._condition:
+            self._report_leaks()
+            now = time.monotonic()
+            records = list(self._leases.values())
+            return {
+                "size": self.size,
+                "lease_limit": self.lease_limit,
+                "created": self._created,
+                "idle": len(self._idle),
+                "leased": len(records),
+                "thread_leases": sum(1 for record in records if record.thread_bound),
+                "acquired": self._acquired,
+                "waits": self._waits,
+                "avg_wait_ms": round(self._total_wait_ms / self._waits, 3) if self._waits else 0.0,
+                "timeouts": self._timeouts,
+                "leaks_reclaimed": self._leaks_reclaimed,
+                "long_held_leases": sum(
+                    1 for record in records if not record.thread_bound and now - record.acquired_at > self.leak_seconds
+                ),
+            }
+
+
+_pools: dict[str, CursorPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_cursor_pool(name: str, connection_factory: Callable[[], duckdb.DuckDBPyConnection]) -> CursorPool:
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = CursorPool(name, connection_factory)
+            _pools[name] = pool
+        return pool
+
+
+def get_cursor_pool_metrics() -> dict[str, dict]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.get_metrics() for pool in pools}
@@ -0,0 +1,88 @@
+import datetime
+import hashlib
+import os
+import threading
+from datetime import UTC
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from app.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class DataRelease:
+    """
+    Identifies the data currently being served: a hash of the API version and the size and
+    modification time of each DuckDB file, so it changes whenever a database is rebuilt or replaced.
+    """
+
+    def __init__(self, version: str, last_modified: datetime.datetime):
+        self.version = version
+        self.last_modified = last_modified
+
+
+def get_data_release_db_paths() -> list[str]:
+    return [
+        settings.STUDIES_DB_PATH,
+        settings.ASSOCIATIONS_DB_PATH,
+        settings.ASSOCIATIONS_FULL_DB_PATH,
+        settings.COLOC_PAIRS_DB_PATH,
+        settings.LD_DB_PATH,
+    ]
+
+
+def get_data_release() -> DataRelease:
+    release_hash = hashlib.sha1(settings.VERSION.encode())
+    last_modified = 0.0
+    for path in get_data_release_db_paths():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            release_hash.update(f"{path}:missing".encode())
+            continue
+        release_hash.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        last_modified = max(last_modified, stat.st_mtime)
+
+    return DataRelease(
+        version=release_hash.hexdigest()[:16],
+        last_modified=datetime.datetime.fromtimestamp(int(last_modified), tz=UTC),
+    )
+
+
+_release_cache: dict[str, Tuple[str, Any]] = {}
+_release_cache_locks: dict[str, threading.Lock] = {}
+_release_cache_lock = threading.Lock()
+
+
+def get_release_cached(name: str, load: Callable[[str], Optional[T]]) -> Optional[T]:
+    """
+    Return the value cached as name for the current data release, calling load(release) to build it the first
+    time it is used for each release, so it is rebuilt whenever a database is rebuilt or replaced. Each name is
+    built by one thread at a time while lookups of built values take no lock. A None from load is not cached,
+    so it is retried on the next call. Blocking: from async code, call it on the DB executor.
+    """
+    release = get_data_release().version
+    cached = _release_cache.get(name)
+    if cached is not None and cached[0] == release:
+        return cached[1]
+
+    with _release_cache_lock:
+        lock = _release_cache_locks.setdefault(name, threading.Lock())
+    with lock:
+        cached = _release_cache.get(name)
+        if cached is not None and cached[0] == release:
+            return cached[1]
+        value = load(release)
+        if value is not None:
+            _release_cache[name] = (release, value)
+        return value
+
+
+def clear_release_cache(name: str):
+    """Drop the value cached as name, so the next get_release_cached call builds it again."""
+    with _release_cache_lock:
+        lock = _release_cache_locks.setdefault(name, threading.Lock())
+    with lock:
+        _release_cache.pop(name, None)
@@ -0,0 +1,198 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+
+from app.config import get_settings
+from app.db.cursor_pool import cursor_pool_size
+from app.logging_config import get_logger
+from app.models.schemas import Singleton
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class DBExecutor(metaclass=Singleton):
+    """
+    Bounded thread pool that runs blocking DuckDB work off the event loop.
+
+    Each worker thread leases its own cursor from the DuckDB cursor pools (see app.db.cursor_pool),
+    so queries submitted here can run in parallel without sharing a DuckDB connection between threads.
+    """
+
+    def __init__(self):
+        self.max_workers = settings.DB_EXECUTOR_MAX_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="duckdb")
+        if self.max_workers > cursor_pool_size():
+            logger.warning(
+                f"DB_EXECUTOR_MAX_WORKERS ({self.max_workers}) exceeds the cursor pool size "
+                f"({cursor_pool_size()}), workers will wait for cursors"
+            )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool and await its result."""
+        submitted_at = time.perf_counter()
+        context = contextvars.copy_context()
+        with self._lock:
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        def task():
+            wait_ms = (time.perf_counter() - submitted_at) * 1000
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            failed = False
+            try:
+                return context.run(func, *args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    if failed:
+                        self._failed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, task)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "completed": completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._total_wait_ms / completed, 3) if completed else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+            }
+
+
+class ShardExecutor(metaclass=Singleton):
+    """
+    Thread pool that fans a request's per-shard DuckDB queries out in parallel, e.g. one query per
+    associations_full table. Separate from DBExecutor, whose workers submit work here and wait for it,
+    so fan-out can never deadlock on the executor it was called from. Each worker thread queries through
+    its own cursor, and the pool size caps how many shard queries run at once across all requests.
+    """
+
+    def __init__(self):
+        self.max_workers = settings.SHARD_QUERY_PARALLELISM
+        self._executor = ThreadPoolExecutor(max_workers=max(self.max_workers, 1), thread_name_prefix="duckdb-shard")
+        pool_size = cursor_pool_size()
+        if settings.DB_EXECUTOR_MAX_WORKERS + self.max_workers + settings.DUCKDB_STREAM_CURSORS > pool_size:
+            logger.warning(
+                f"DB_EXECUTOR_MAX_WORKERS + SHARD_QUERY_PARALLELISM + DUCKDB_STREAM_CURSORS "
+                f"({settings.DB_EXECUTOR_MAX_WORKERS} + {self.max_workers} + {settings.DUCKDB_STREAM_CURSORS}) "
+                f"exceeds the cursor pool size ({pool_size}), queries will wait for cursors"
+            )
+        self._lock = threading.Lock()
+        self._fan_outs = 0
+        self._shard_queries = 0
+
+    def map(self, func: Callable, items: Iterable) -> list:
+        """Return [func(item) for item in items], running the calls in parallel; results keep the order of items."""
+        items = list(items)
+        with self._lock:
+            self._fan_outs += 1
+            self._shard_queries += len(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        futures = [self._executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "fan_outs": self._fan_outs,
+                "shard_queries": self._shard_queries,
+            }
+
+
+async def run_in_db_executor(func: Callable, *args, **kwargs) -> Any:
+    return await DBExecutor().run(func, *args, **kwargs)
+
+
+async def iterate_in_db_executor(iterator: Iterator) -> AsyncIterator:
+    """
+    Iterate a blocking iterator (e.g. one streaming DuckDB result batches) on the DB executor, one item
+    per task, so a StreamingResponse never runs DuckDB work on the event loop or the default threadpool.
+    The iterator is closed when iteration stops early, e.g. when the client disconnects.
+    """
+    done = object()
+    try:
+        while True:
+            item = await run_in_db_executor(next, iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_in_db_executor(close)
+
+
+async def start_iteration(iterator: AsyncIterator) -> AsyncIterator:
+    """
+    Pull the first item of iterator now and return an iterator over all of its items, so errors starting
+    a stream (e.g. CursorPoolTimeoutError when no cursor is free) are raised before a StreamingResponse
+    has sent its status line, and can still become an error response.
+    """
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        return iterator
+
+    async def resumed():
+        yield first
+        async for item in iterator:
+            yield item
+
+    return resumed()
+
+
+class AsyncDBClient:
+    """
+    Awaitable facade over a DB client or service: every method call is run on the DB executor.
+
+    Example:
+        studies_db = AsyncDBClient(StudiesDBClient())
+        trait = await studies_db.get_trait(trait_id)
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return await run_in_db_executor(attr, *args, **kwargs)
+
+        method.__name__ = name
+        return method
@@ -1,23 +1,32 @@
 from app.config import get_settings
 from functools import lru_cache
-from typing import List
-import duckdb
+from typing import Iterator, List
 
-from app.db.utils import log_performance
+import pyarrow as pa
+
+from app.db.cursor_pool import get_cursor_pool
+from app.db.utils import connect_read_only, log_performance
 
 settings = get_settings()
 
+# Every LD pair from both ends: the rows of ld as (variant_id, neighbour_id) with forward = true, and reversed
+# with forward = false (except pairs of a variant with itself), so a variant's pairs are those with its variant_id
+LD_EDGES_QUERY = """
+    SELECT lead_variant_id AS variant_id, proxy_variant_id AS neighbour_id, ld_block_id, r, true AS forward FROM ld
+    UNION ALL
+    SELECT proxy_variant_id, lead_variant_id, ld_block_id, r, false FROM ld WHERE proxy_variant_id != lead_variant_id
+"""
+
 
 @lru_cache()
 def get_gpm_db_connection():
-    connection = duckdb.connect(settings.LD_DB_PATH, read_only=True)
-    connection.execute("PRAGMA memory_limit='4GB'")
-    return connection
+    return connect_read_only("ld", settings.LD_DB_PATH)
 
 
 class LdDBClient:
-    def __init__(self):
-        self.ld_conn = get_gpm_db_connection()
+    @property
+    def ld_conn(self):
+        return get_cursor_pool("ld", get_gpm_db_connection).thread_cursor()
 
     @log_performance
     def get_ld_proxies(self, variant_ids: List[int], rsquared_threshold: float = 0.8):
@@ -39,3 +48,17 @@ class LdDBClient:
                 WHERE proxy_variant_id IN (SELECT * FROM UNNEST(?))
         """
         return self.ld_conn.execute(query, [variant_ids, variant_ids]).fetchall()
+
+    @log_performance
+    def get_ld_edge_counts(self):
+        query = (
+            f"SELECT variant_id, COUNT(*) AS num_edges FROM ({LD_EDGES_QUERY}) GROUP BY variant_id ORDER BY variant_id"
+        )
+        return self.ld_conn.execute(query).fetchnumpy()
+
+    def stream_ld_edges(self, batch_size: int = None) -> Iterator[pa.RecordBatch]:
+        """Every LD pair from both ends (see LD_EDGES_QUERY), ordered by variant_id then r² descending."""
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        cursor = self.ld_conn
+        cursor.execute(f"SELECT * FROM ({LD_EDGES_QUERY}) ORDER BY variant_id, r * r DESC, neighbour_id, forward DESC")
+        yield from cursor.fetch_record_batch(batch_size)
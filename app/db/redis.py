@@ -3,12 +3,32 @@ from redis import Redis
 from app.config import get_settings
 import json
 import datetime
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
 from datetime import UTC
+from app.db.cache_codec import decode_cache_value, decode_cache_value_as_json, encode_cache_value
 from app.models.schemas import Singleton
 
 settings = get_settings()
 
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+SET_IF_LOCK_HELD_SCRIPT = """
+if redis.call("GET", KEYS[2]) ~= ARGV[2] then
+    return 0
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[3])
+else
+    redis.call("SET", KEYS[1], ARGV[1])
+end
+return 1
+"""
+
 
 class RedisClient(metaclass=Singleton):
     def __init__(self):
@@ -23,20 +43,112 @@ class RedisClient(metaclass=Singleton):
             self.delete_gwas_queue,
         ]
         self.scheduled_jobs_key = "scheduled_jobs"
+        self.cache_invalidation_channel = "cache_invalidation"
+        self.cache_namespace_key = "cache_namespace"
+        self.trait_access_key = "trait_access"
         self.redis = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, decode_responses=True)
+        # Cache values are compressed binary payloads (see app.db.cache_codec), so they use their own connection
+        self.cache_redis = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, decode_responses=False)
 
     def get_cached_data(self, key: str):
-        data = self.redis.get(key)
-        return json.loads(data) if data else None
+        return decode_cache_value(self.cache_redis.get(key))
+
+    def get_cached_body(self, key: str) -> Optional[bytes]:
+        """Return the cached value as JSON text, for serving it as a response body."""
+        return decode_cache_value_as_json(self.cache_redis.get(key))
 
-    def set_cached_data(self, key: str, value: dict | str, expire: int = 0):
-        if isinstance(value, dict):
-            value = json.dumps(value)
+    def set_cached_data(self, key: str, value: Any, expire: int = 0):
+        """
+        Cache a value. A str is taken to be JSON text (e.g. a serialized model) and is stored as
+        compressed JSON; any other value is stored as compressed msgpack.
+        """
+        payload = encode_cache_value(value)
 
         if expire == 0:
-            self.redis.set(key, value)
+            self.cache_redis.set(key, payload)
         else:
-            self.redis.set(key, value, ex=expire)
+            self.cache_redis.set(key, payload, ex=expire)
+
+    def set_cached_data_if_lock_held(self, key: str, value: Any, lock_name: str, token: int, expire: int = 0) -> bool:
+        """
+        Cache a value as set_cached_data does, but only if the lock `lock_name` is still held with this token.
+        The check and the write are one script, so a caller whose lock has expired can never overwrite the
+        value cached by the next lock holder. Returns whether the value was written.
+        """
+        payload = encode_cache_value(value)
+        return bool(self.cache_redis.eval(SET_IF_LOCK_HELD_SCRIPT, 2, key, lock_name, payload, token, expire))
+
+    def get_cache_namespace(self, release: str) -> Optional[str]:
+        """The namespace activated for release, else the one activated last for any release, else None."""
+        namespace, last_activated = self.redis.mget(
+            f"{self.cache_namespace_key}:{release}", f"{self.cache_namespace_key}:active"
+        )
+        return namespace or last_activated
+
+    def set_cache_namespace(self, release: str, namespace: str):
+        self.redis.mset(
+            {f"{self.cache_namespace_key}:{release}": namespace, f"{self.cache_namespace_key}:active": namespace}
+        )
+
+    def new_cache_namespace(self, release: str) -> str:
+        """Return a cache namespace for release that has never been used, for a cache warm-up to fill."""
+        return f"{release}.{self.redis.incr(f'{self.cache_namespace_key}:counter')}"
+
+    def scan_keys(self, pattern: str, count: int = 1000) -> Iterator[str]:
+        """Iterate keys matching pattern with SCAN, which unlike KEYS never blocks Redis for the whole keyspace."""
+        return self.redis.scan_iter(match=pattern, count=count)
+
+    def delete_keys_matching(self, pattern: str, batch_size: int = 1000) -> int:
+        """Delete keys matching pattern, found with SCAN and removed in batches with UNLINK. Returns the number deleted."""
+        deleted = 0
+        batch = []
+        for key in self.scan_keys(pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.redis.unlink(*batch)
+        return deleted
+
+    def expire_keys(self, keys: list[str], seconds: int) -> int:
+        """Set a TTL on each key that has none yet. Returns how many TTLs were set."""
+        pipeline = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.expire(key, seconds, nx=True)
+        return sum(1 for expired in pipeline.execute() if expired)
+
+    def record_trait_access(self, trait_id: int):
+        self.redis.zincrby(self.trait_access_key, 1, trait_id)
+
+    def get_most_accessed_trait_ids(self, limit: int) -> list[int]:
+        return [int(trait_id) for trait_id in self.redis.zrevrange(self.trait_access_key, 0, limit - 1)]
+
+    def acquire_lock(self, name: str, ttl_ms: int) -> Optional[int]:
+        """
+        Try to take the lock `name` for ttl_ms milliseconds without blocking.
+        Returns a fencing token (monotonically increasing per lock name) if acquired, None otherwise.
+        """
+        token = self.redis.incr(f"{name}:fence")
+        if self.redis.set(name, token, nx=True, px=ttl_ms):
+            return token
+        return None
+
+    def lock_is_held(self, name: str, token: Optional[int] = None) -> bool:
+        """
+        Check whether the lock `name` is held, or when a token is given, whether it is still held with that token.
+        """
+        value = self.redis.get(name)
+        if token is None:
+            return value is not None
+        return value == str(token)
+
+    def release_lock(self, name: str, token: int) -> bool:
+        """
+        Release the lock `name` only if it is still held with this token, so a caller whose lock
+        expired cannot release a lock since taken by someone else.
+        """
+        return bool(self.redis.eval(RELEASE_LOCK_SCRIPT, 1, name, token))
 
     def add_to_queue(self, queue_name: str, message: Any) -> bool:
         """
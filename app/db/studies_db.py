@@ -1,31 +1,187 @@
 from app.config import get_settings
 from functools import lru_cache
-from typing import List
-import duckdb
+from typing import Iterator, List
+
+import pyarrow as pa
 
 from app.models.schemas import CisTrans, StudyDataType
-from app.db.utils import log_performance
+from app.db.cursor_pool import get_cursor_pool
+from app.db.utils import connect_read_only, log_performance, registered_arrow_table
 from app.logging_config import get_logger
 
 settings = get_settings()
 logger = get_logger(__name__)
 
 
+COMMON_DATA_TYPES = [StudyDataType.phenotype.name, StudyDataType.cell_trait.name, StudyDataType.plasma_protein.name]
+
+NUM_STUDY_EXTRACTIONS_PER_TRAIT_QUERY = f"""
+    SELECT traits.id, COUNT(DISTINCT study_extractions.id) as num_study_extractions
+    FROM study_extractions
+    JOIN studies ON study_extractions.study_id = studies.id
+    JOIN traits ON studies.trait_id = traits.id
+    WHERE studies.data_type IN ({",".join(f"'{data_type}'" for data_type in COMMON_DATA_TYPES)})
+    GROUP BY traits.id
+"""
+
+NUM_COLOC_GROUPS_PER_TRAIT_QUERY = """
+    SELECT traits.id, COUNT(DISTINCT coloc_group_id) as num_coloc_groups
+    FROM coloc_groups
+    JOIN studies ON coloc_groups.study_id = studies.id
+    JOIN traits ON studies.trait_id = traits.id
+    GROUP BY traits.id
+"""
+
+NUM_COLOC_STUDIES_PER_TRAIT_QUERY = """
+    SELECT traits.id, COUNT(DISTINCT other_studies.id) as num_coloc_studies
+    FROM traits
+    JOIN studies ON traits.id = studies.trait_id
+    JOIN coloc_groups ON studies.id = coloc_groups.study_id
+    JOIN coloc_groups other_colocs ON coloc_groups.coloc_group_id = other_colocs.coloc_group_id
+    JOIN studies other_studies ON other_colocs.study_id = other_studies.id
+    GROUP BY traits.id
+"""
+
+NUM_RARE_RESULTS_PER_TRAIT_QUERY = """
+    SELECT traits.id, COUNT(DISTINCT rare_result_group_id) as num_rare_results
+    FROM rare_results
+    JOIN studies ON rare_results.study_id = studies.id
+    JOIN traits ON studies.trait_id = traits.id
+    GROUP BY traits.id
+"""
+
+NUM_STUDY_EXTRACTIONS_PER_GENE_QUERY = """
+    SELECT gene_annotations.gene, COUNT(DISTINCT study_extractions.id) as num_study_extractions
+    FROM study_extractions
+    JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
+    GROUP BY gene_annotations.gene
+"""
+
+NUM_COLOC_GROUPS_PER_GENE_QUERY = """
+    SELECT gene_annotations.gene, COUNT(DISTINCT coloc_group_id) as num_coloc_groups
+    FROM coloc_groups
+    JOIN study_extractions ON coloc_groups.study_extraction_id = study_extractions.id
+    JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
+    GROUP BY gene_annotations.gene
+"""
+
+NUM_COLOC_STUDIES_PER_GENE_QUERY = """
+    SELECT gene_annotations.gene, COUNT(DISTINCT coloc_groups.study_id) as num_coloc_studies
+    FROM coloc_groups
+    JOIN study_extractions ON coloc_groups.study_extraction_id = study_extractions.id
+    JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
+    GROUP BY gene_annotations.gene
+"""
+
+NUM_RARE_RESULTS_PER_GENE_QUERY = f"""
+    SELECT gene_annotations.gene, COUNT(DISTINCT rare_results.rare_result_group_id) as num_rare_results
+    FROM rare_results
+    JOIN study_extractions ON rare_results.study_extraction_id = study_extractions.id
+    JOIN gene_annotations ON (rare_results.gene_id = gene_annotations.id OR rare_results.situated_gene_id = gene_annotations.id)
+    WHERE study_extractions.cis_trans = '{CisTrans.cis.value}' OR study_extractions.cis_trans IS NULL
+    GROUP BY gene_annotations.gene
+"""
+
+
+def entity_counts_query(key_column: str, count_queries: List[str]) -> str:
+    """
+    Combine per-entity count queries, each returning (key_column, one num_* column), into one row per entity
+    with num_study_extractions, num_coloc_groups, num_coloc_studies and num_rare_results (0 where missing).
+    """
+    counts = " UNION ALL BY NAME ".join(f"SELECT * FROM ({query})" for query in count_queries)
+    count_columns = ["num_study_extractions", "num_coloc_groups", "num_coloc_studies", "num_rare_results"]
+    return f"""
+        SELECT {key_column}, {", ".join(f"COALESCE(MAX({column}), 0)::BIGINT AS {column}" for column in count_columns)}
+        FROM ({counts})
+        WHERE {key_column} IS NOT NULL
+        GROUP BY {key_column}
+        ORDER BY {key_column}
+    """
+
+
+TRAIT_COUNTS_QUERY = entity_counts_query(
+    "id",
+    [
+        NUM_STUDY_EXTRACTIONS_PER_TRAIT_QUERY,
+        NUM_COLOC_GROUPS_PER_TRAIT_QUERY,
+        NUM_COLOC_STUDIES_PER_TRAIT_QUERY,
+        NUM_RARE_RESULTS_PER_TRAIT_QUERY,
+    ],
+)
+
+GENE_COUNTS_QUERY = entity_counts_query(
+    "gene",
+    [
+        NUM_STUDY_EXTRACTIONS_PER_GENE_QUERY,
+        NUM_COLOC_GROUPS_PER_GENE_QUERY,
+        NUM_COLOC_STUDIES_PER_GENE_QUERY,
+        NUM_RARE_RESULTS_PER_GENE_QUERY,
+    ],
+)
+
+# Each identifier is classified as _classify_variants does (rsid, variant id, snp string or chr:bp prefix) and
+# joined to variant_annotations on the matching column, so every kind is resolved by a hash join in one query.
+# Identifiers that resolve to no variant are kept, with null variant columns, in their input position.
+RESOLVE_VARIANTS_QUERY = """
+    WITH identifiers AS (
+        SELECT position, identifier, TRIM(identifier) AS term,
+            CASE
+                WHEN LOWER(TRIM(identifier)) LIKE 'rs%' THEN 'rsid'
+                WHEN regexp_full_match(TRIM(identifier), '[0-9]+') THEN 'id'
+                WHEN contains(identifier, ':') AND contains(identifier, '_') THEN 'snp'
+                WHEN contains(identifier, ':') THEN 'prefix'
+            END AS kind
+        FROM {identifiers}
+    ),
+    matches AS (
+        SELECT identifiers.position, variant_annotations.id AS variant_id
+        FROM identifiers JOIN variant_annotations ON variant_annotations.rsid = identifiers.term
+        WHERE identifiers.kind = 'rsid'
+        UNION ALL
+        SELECT identifiers.position, variant_annotations.id
+        FROM identifiers JOIN variant_annotations ON variant_annotations.id = TRY_CAST(identifiers.term AS BIGINT)
+        WHERE identifiers.kind = 'id'
+        UNION ALL
+        SELECT identifiers.position, variant_annotations.id
+        FROM identifiers JOIN variant_annotations ON variant_annotations.snp = identifiers.term
+        WHERE identifiers.kind = 'snp'
+        UNION ALL
+        SELECT identifiers.position, variant_annotations.id
+        FROM identifiers JOIN variant_annotations ON SPLIT_PART(variant_annotations.snp, '_', 1) = identifiers.term
+        WHERE identifiers.kind = 'prefix'
+    )
+    SELECT identifiers.identifier, variant_annotations.*,
+        variant_pleiotropy.distinct_trait_categories, variant_pleiotropy.distinct_protein_coding_genes
+    FROM identifiers
+    LEFT JOIN matches ON matches.position = identifiers.position
+    LEFT JOIN variant_annotations ON variant_annotations.id = matches.variant_id
+    LEFT JOIN variant_pleiotropy ON variant_pleiotropy.variant_id = matches.variant_id
+    ORDER BY identifiers.position, variant_annotations.id
+"""
+
+
+def variant_identifiers_table(identifiers: List[str]) -> pa.Table:
+    """The identifiers, with their position in the request, as a position, identifier Arrow table"""
+    return pa.table(
+        {
+            "position": pa.array(range(len(identifiers)), pa.int64()),
+            "identifier": pa.array(identifiers, pa.string()),
+        }
+    )
+
+
 @lru_cache()
 def get_gpm_db_connection():
-    connection = duckdb.connect(settings.STUDIES_DB_PATH, read_only=True)
-    connection.execute("PRAGMA memory_limit='4GB'")
-    return connection
+    return connect_read_only("studies", settings.STUDIES_DB_PATH)
 
 
 class StudiesDBClient:
     def __init__(self):
-        self.studies_conn = get_gpm_db_connection()
-        self.common_data_types = [
-            f"'{StudyDataType.phenotype.name}'",
-            f"'{StudyDataType.cell_trait.name}'",
-            f"'{StudyDataType.plasma_protein.name}'",
-        ]
+        self.common_data_types = [f"'{data_type}'" for data_type in COMMON_DATA_TYPES]
+
+    @property
+    def studies_conn(self):
+        return get_cursor_pool("studies", get_gpm_db_connection).thread_cursor()
 
     @log_performance
     def get_traits(self, trait_ids: List[int] = None):
@@ -170,32 +326,6 @@ class StudiesDBClient:
             return self.studies_conn.execute(query, params).fetchall()
         return self.studies_conn.execute(query).fetchall()
 
-    @log_performance
-    def get_num_coloc_groups_per_trait(self):
-        query = """
-            SELECT traits.id, COUNT(DISTINCT coloc_group_id) as num_coloc_groups
-                FROM coloc_groups
-                JOIN studies ON coloc_groups.study_id = studies.id
-                JOIN traits ON studies.trait_id = traits.id
-                GROUP BY traits.id
-        """
-        return self.studies_conn.execute(query).fetchall()
-
-    @log_performance
-    def get_num_coloc_studies_per_trait(self):
-        query = """
-            SELECT 
-                traits.id,
-                COUNT(DISTINCT other_studies.id) as num_coloc_studies
-            FROM traits
-            JOIN studies ON traits.id = studies.trait_id
-            JOIN coloc_groups ON studies.id = coloc_groups.study_id
-            JOIN coloc_groups other_colocs ON coloc_groups.coloc_group_id = other_colocs.coloc_group_id
-            JOIN studies other_studies ON other_colocs.study_id = other_studies.id
-            GROUP BY traits.id
-        """
-        return self.studies_conn.execute(query).fetchall()
-
     @log_performance
     def get_colocs_for_variant(self, variant_id: int):
         return self._fetch_colocs("variant_id = ?", [variant_id])
@@ -243,17 +373,6 @@ class StudiesDBClient:
             return self.studies_conn.execute(query, params).fetchall()
         return self.studies_conn.execute(query).fetchall()
 
-    @log_performance
-    def get_num_rare_results_per_study(self):
-        query = """
-            SELECT traits.id, COUNT(DISTINCT rare_result_group_id) as num_rare_results
-            FROM rare_results
-            JOIN studies ON rare_results.study_id = studies.id
-            JOIN traits ON studies.trait_id = traits.id
-            GROUP BY traits.id
-        """
-        return self.studies_conn.execute(query).fetchall()
-
     @log_performance
     def get_rare_results_for_gene(self, gene_id: int, include_trans: bool = False):
         query = "(gene_id = ? OR situated_gene_id = ?)"
@@ -409,31 +528,19 @@ class StudiesDBClient:
             params.append(CisTrans.cis.value)
         return self._fetch_study_extractions(query, params)
 
-    @log_performance
-    def get_study_extractions_in_gene_regions(self, regions: List[tuple]):
-        """regions: list of (chr, start, stop) tuples"""
-        if not regions:
-            return []
-        conditions = []
-        params = []
-        for chr_val, start, stop in regions:
-            conditions.append("(chr = ? AND bp BETWEEN ? AND ?)")
-            params.extend([chr_val, start, stop])
-        query = "(" + " OR ".join(conditions) + ") AND cis_trans = ?"
-        params.append(CisTrans.cis.value)
-        return self._fetch_study_extractions(query, params)
-
     @log_performance
     def get_variants(
         self,
         variant_ids: List[int] = None,
         variant_prefixes: List[str] = None,
         rsids: List[str] = None,
-        grange: str = None,
         variant_strings: List[str] = None,
     ):
-        """Fetch variants by one or more criteria. Supports OR across variant_ids, rsids, variant_prefixes, variant_strings."""
-        if not variant_ids and not variant_prefixes and not rsids and not grange and not variant_strings:
+        """
+        Fetch variants by one or more criteria. Supports OR across variant_ids, rsids, variant_prefixes, variant_strings.
+        Variants in a genomic range are found with app.services.variant_positions, then fetched by id.
+        """
+        if not variant_ids and not variant_prefixes and not rsids and not variant_strings:
             return []
 
         query = """SELECT variant_annotations.*, variant_pleiotropy.distinct_trait_categories, variant_pleiotropy.distinct_protein_coding_genes
@@ -449,12 +556,6 @@ class StudiesDBClient:
         if rsids:
             conditions.append("rsid IN (SELECT * FROM UNNEST(?))")
             params.append(rsids)
-        if grange:
-            chromosome, position = grange.split(":")
-            start_bp, end_bp = position.split("-")
-            start_bp, end_bp = int(start_bp), int(end_bp)
-            conditions.append("(chr = ? AND bp BETWEEN ? AND ?)")
-            params.extend([chromosome, start_bp, end_bp])
         if variant_prefixes:
             conditions.append("SPLIT_PART(snp, '_', 1) IN (SELECT * FROM UNNEST(?))")
             params.append(variant_prefixes)
@@ -474,22 +575,57 @@ class StudiesDBClient:
         if not variants:
             return []
 
-        placeholders = ",".join(["(?, ?)" for _ in variants])
-        query = f"""
-            WITH input_variants AS (
-                SELECT * FROM (VALUES {placeholders}) as t(row_num, variant)
-            )
-            SELECT variant_annotations.* 
-            FROM input_variants 
-            LEFT JOIN variant_annotations ON input_variants.variant = variant_annotations.snp 
-            ORDER BY input_variants.row_num
+        connection = self.studies_conn
+        with registered_arrow_table(connection, variant_identifiers_table(variants), "snp_strings") as snp_strings:
+            query = f"""
+                SELECT variant_annotations.*
+                FROM {snp_strings} AS input_variants
+                LEFT JOIN variant_annotations ON input_variants.identifier = variant_annotations.snp
+                ORDER BY input_variants.position
+            """
+            return connection.execute(query).fetchall()
+
+    @log_performance
+    def resolve_variants(self, identifiers: List[str]) -> List[tuple]:
         """
+        Resolve a mix of variant ids, rsids, snp strings and chr:bp prefixes to variants in one query, as
+        rows of the identifier followed by the columns of get_variants. Rows follow the input order, with one
+        row per matching variant, and a row with null variant columns for identifiers that match none.
+        """
+        if not identifiers:
+            return []
+        connection = self.studies_conn
+        with registered_arrow_table(connection, variant_identifiers_table(identifiers), "identifiers") as table:
+            return connection.execute(RESOLVE_VARIANTS_QUERY.format(identifiers=table)).fetchall()
 
-        params = []
-        for i, variant in enumerate(variants):
-            params.extend([i, variant])
+    def stream_resolved_variants(self, identifiers: List[str], batch_size: int = None) -> Iterator[pa.RecordBatch]:
+        """
+        resolve_variants as Arrow record batches of at most batch_size rows. Uses a leased cursor, as
+        batches may be pulled from any thread.
+        """
+        if not identifiers:
+            return
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        identifiers_table = variant_identifiers_table(identifiers)
+        with (
+            get_cursor_pool("studies", get_gpm_db_connection).lease() as cursor,
+            registered_arrow_table(cursor, identifiers_table, "identifiers") as table,
+        ):
+            cursor.execute(RESOLVE_VARIANTS_QUERY.format(identifiers=table))
+            yield from cursor.fetch_record_batch(batch_size)
 
-        return self.studies_conn.execute(query, params).fetchall()
+    @log_performance
+    def get_variant_positions(self):
+        return self.studies_conn.execute("SELECT id, chr, bp FROM variant_annotations").fetchnumpy()
+
+    @log_performance
+    def get_rsids(self):
+        query = """
+            SELECT id, CAST(SUBSTRING(rsid, 3) AS BIGINT) AS rsid
+            FROM variant_annotations
+            WHERE regexp_full_match(rsid, 'rs[0-9]{1,18}')
+        """
+        return self.studies_conn.execute(query).fetchnumpy()
 
     @log_performance
     def get_variant_ids_by_snps(self, snps: List[str]):
@@ -518,16 +654,18 @@ class StudiesDBClient:
         return self.studies_conn.execute("SELECT gene, ensembl_id FROM gene_annotations").fetchall()
 
     @log_performance
-    def get_num_study_extractions_per_study(self):
-        query = f"""
-            SELECT traits.id, COUNT(DISTINCT study_extractions.id) as num_extractions
-            FROM study_extractions 
-            JOIN studies ON study_extractions.study_id = studies.id
-            JOIN traits ON studies.trait_id = traits.id
-            WHERE studies.data_type IN ({",".join(self.common_data_types)})
-            GROUP BY traits.id
-        """
-        return self.studies_conn.execute(query).fetchall()
+    def get_trait_counts(self):
+        return self.studies_conn.execute(TRAIT_COUNTS_QUERY).fetch_arrow_table()
+
+    @log_performance
+    def get_gene_counts(self):
+        return self.studies_conn.execute(GENE_COUNTS_QUERY).fetch_arrow_table()
+
+    @log_performance
+    def copy_query_to_parquet(self, query: str, path: str):
+        """Write the result of query to a Parquet file at path with DuckDB's COPY, without materialising it in Python."""
+        escaped_path = path.replace("'", "''")
+        self.studies_conn.execute(f"COPY ({query}) TO '{escaped_path}' (FORMAT PARQUET)")
 
     @log_performance
     def get_study_extractions_for_studies(self, study_ids: List[int]):
@@ -585,50 +723,6 @@ class StudiesDBClient:
 
         return self.studies_conn.execute(query, params).fetchall()
 
-    @log_performance
-    def get_num_coloc_groups_per_gene(self):
-        query = """
-            SELECT gene_annotations.gene, COUNT(DISTINCT coloc_group_id) as num_coloc_groups
-            FROM coloc_groups
-            JOIN study_extractions ON coloc_groups.study_extraction_id = study_extractions.id
-            JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
-            GROUP BY gene_annotations.gene
-        """
-        return self.studies_conn.execute(query).fetchall()
-
-    @log_performance
-    def get_num_coloc_studies_per_gene(self):
-        query = """
-            SELECT gene_annotations.gene, COUNT(DISTINCT coloc_groups.study_id) as num_coloc_studies
-            FROM coloc_groups
-            JOIN study_extractions ON coloc_groups.study_extraction_id = study_extractions.id
-            JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
-            GROUP BY gene_annotations.gene
-        """
-        return self.studies_conn.execute(query).fetchall()
-
-    @log_performance
-    def get_num_study_extractions_per_gene(self):
-        query = """
-            SELECT gene_annotations.gene, COUNT(DISTINCT study_extractions.id) as num_extractions
-            FROM study_extractions
-            JOIN gene_annotations ON study_extractions.gene_id = gene_annotations.id
-            GROUP BY gene_annotations.gene
-        """
-        return self.studies_conn.execute(query).fetchall()
-
-    @log_performance
-    def get_num_rare_results_per_gene(self):
-        query = f"""
-            SELECT gene_annotations.gene, COUNT(DISTINCT rare_results.rare_result_group_id) as num_rare_results
-            FROM rare_results
-            JOIN study_extractions ON rare_results.study_extraction_id = study_extractions.id
-            JOIN gene_annotations ON (rare_results.gene_id = gene_annotations.id OR rare_results.situated_gene_id = gene_annotations.id)
-            WHERE study_extractions.cis_trans = '{CisTrans.cis.value}' OR study_extractions.cis_trans IS NULL
-            GROUP BY gene_annotations.gene
-        """
-        return self.studies_conn.execute(query).fetchall()
-
     @log_performance
     def get_study_extractions_for_gene(self, gene_id: int, include_trans: bool = False):
         if not gene_id:
@@ -641,16 +735,6 @@ class StudiesDBClient:
             params = [gene_id, gene_id]
         return self._fetch_study_extractions(query, params)
 
-    @log_performance
-    def get_study_extractions_in_gene_region(self, chromosome: str, bp_start: int, bp_end: int):
-        cis_trans = CisTrans.cis.value
-        return self._fetch_study_extractions(
-            """
-            chr = ? AND bp BETWEEN ? AND ? AND cis_trans = ?
-            """,
-            [chromosome, bp_start, bp_end, cis_trans],
-        )
-
     @log_performance
     def get_study_extractions_in_ld_block(self, ld_block_id: int):
         return self._fetch_study_extractions("ld_block_id = ?", [ld_block_id])
@@ -660,6 +744,15 @@ class StudiesDBClient:
         query = "SELECT * FROM ld_blocks WHERE id = ?"
         return self.studies_conn.execute(query, [ld_block_id]).fetchone()
 
+    @log_performance
+    def get_ld_blocks(self):
+        return self.studies_conn.execute("SELECT * FROM ld_blocks").fetchall()
+
+    @log_performance
+    def get_cis_study_extraction_positions(self):
+        query = "SELECT id, chr, bp FROM study_extractions_wide WHERE cis_trans = ?"
+        return self.studies_conn.execute(query, [CisTrans.cis.value]).fetchnumpy()
+
     @log_performance
     def get_ld_blocks_by_ld_block(self, ld_blocks: List[str]):
         if not ld_blocks:
@@ -1,7 +1,23 @@
+from contextlib import contextmanager
 from functools import wraps
 import time
+import uuid
+import duckdb
+import pyarrow as pa
 from loguru import logger
 
+from app.config import get_settings
+
+settings = get_settings()
+
+DUCKDB_SETTING_NAMES = [
+    "memory_limit",
+    "threads",
+    "temp_directory",
+    "enable_object_cache",
+    "enable_external_file_cache",
+]
+
 
 def log_performance(func):
     @wraps(func)
@@ -16,3 +32,43 @@ def log_performance(func):
             logger.bind(execution_time=f"{execution_time:.2f}ms").info(f"{func.__name__} completed")
 
     return wrapper
+
+
+def connect_read_only(database: str, path: str) -> duckdb.DuckDBPyConnection:
+    """
+    Open a read-only DuckDB connection and apply the resource settings configured for this database
+    (see Settings.get_duckdb_settings). Settings the installed DuckDB version does not know are skipped.
+    """
+    connection = duckdb.connect(path, read_only=True)
+    for name, value in settings.get_duckdb_settings(database).items():
+        literal = str(value).lower() if isinstance(value, bool) else str(value)
+        try:
+            connection.execute(f"SET {name} = '{literal}'")
+        except duckdb.Error as e:
+            logger.warning(f"Could not apply DuckDB setting {name}={value} to {database} database: {e}")
+    return connection
+
+
+def get_applied_duckdb_settings(connection: duckdb.DuckDBPyConnection) -> dict:
+    rows = connection.execute(
+        "SELECT name, value FROM duckdb_settings() WHERE name IN (SELECT * FROM UNNEST(?))",
+        [DUCKDB_SETTING_NAMES],
+    ).fetchall()
+    return {name: value for name, value in rows}
+
+
+@contextmanager
+def registered_arrow_table(connection: duckdb.DuckDBPyConnection, table: pa.Table, prefix: str = "arrow"):
+    """
+    Register table as a view on connection for the duration of the block, yielding its name.
+
+    Use this to pass large id lists to a query: binding a Python list as a query parameter converts it
+    element by element, which costs far more than the query for a few thousand ids, whereas a registered
+    Arrow table is read in place.
+    """
+    name = f"{prefix}_{uuid.uuid4().hex}"
+    connection.register(name, table)
+    try:
+        yield name
+    finally:
+        connection.unregister(name)
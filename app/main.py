@@ -1,4 +1,5 @@
 import sentry_sdk
+from contextlib import asynccontextmanager
 
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
@@ -6,6 +7,7 @@ from slowapi import _rate_limit_exceeded_handler
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.middleware.conditional_requests import ConditionalRequestMiddleware
 from app.middleware.security import SecurityMiddleware
 
 from app.middleware.analytics import AnalyticsMiddleware
@@ -16,11 +18,20 @@ from app.db.gwas_db import GwasDBClient
 from app.db.redis import RedisClient
 from app.logging_config import get_logger
 from app.rate_limiting import limiter
+from app.services.cache_namespace import start_cache_reaper
+from app.services.local_cache import LocalCache
 
 settings = get_settings()
 logger = get_logger("app.main")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    LocalCache().start_invalidation_listener()
+    start_cache_reaper()
+    yield
+
+
 def create_app() -> FastAPI:
     if not settings.DEBUG:
         sentry_sdk.init(dsn=settings.SENTRY_DSN, send_default_pii=True)
@@ -33,8 +44,11 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
     )
 
+    app.add_middleware(ConditionalRequestMiddleware)
+
     app.add_middleware(SecurityMiddleware)
 
     # Add analytics middleware (after security, before CORS)
@@ -0,0 +1,29 @@
+"""
+Write the per-trait and per-gene count tables for the current data release as Parquet files
+(see app.services.entity_counts), so the API does not recompute them when its caches are cleared.
+
+Invoked from the host via docker exec after a data update, e.g. scripts/refresh_cache.sh
+"""
+
+import sys
+
+from app.logging_config import get_logger
+from app.services.entity_counts import materialize_entity_counts
+
+logger = get_logger(__name__)
+
+
+def main() -> int:
+    try:
+        paths = materialize_entity_counts()
+    except Exception as exc:
+        logger.error(f"Failed to materialise entity counts: {exc}")
+        return 1
+
+    for entity, path in paths.items():
+        print(f"Wrote {entity} counts to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
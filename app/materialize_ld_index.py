@@ -0,0 +1,28 @@
+"""
+Write the LD pairs of the current data release as memory mapped CSR arrays (see app.services.ld_index),
+so LD proxy and matrix lookups read the requested variants' pairs instead of scanning the ld table.
+
+Invoked from the host via docker exec after a data update, e.g. scripts/refresh_cache.sh
+"""
+
+import sys
+
+from app.logging_config import get_logger
+from app.services.ld_index import materialize_ld_index
+
+logger = get_logger(__name__)
+
+
+def main() -> int:
+    try:
+        path = materialize_ld_index()
+    except Exception as exc:
+        logger.error(f"Failed to materialise the LD index: {exc}")
+        return 1
+
+    print(f"Wrote LD index to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Write the variant positions of the current data release, sorted by chromosome and position, as a .npy file
+(see app.services.variant_positions), so genomic range queries memory map it instead of scanning variant_annotations.
+
+Invoked from the host via docker exec after a data update, e.g. scripts/refresh_cache.sh
+"""
+
+import sys
+
+from app.logging_config import get_logger
+from app.services.variant_positions import materialize_variant_positions
+
+logger = get_logger(__name__)
+
+
+def main() -> int:
+    try:
+        path = materialize_variant_positions()
+    except Exception as exc:
+        logger.error(f"Failed to materialise variant positions: {exc}")
+        return 1
+
+    print(f"Wrote variant positions to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import get_settings
+from app.db.data_release import get_data_release
+
+settings = get_settings()
+
+EXCLUDED_PREFIXES = ("/v1/gwas", "/v1/internal")
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag, using the weak comparison RFC 9110 requires for
+    If-None-Match: a W/ prefix is ignored, as proxies (e.g. nginx gzip) weaken the ETags they pass on.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+class ConditionalRequestMiddleware(BaseHTTPMiddleware):
+    """
+    Adds ETag, Last-Modified and Cache-Control headers to read endpoints, and answers matching
+    If-None-Match / If-Modified-Since requests with 304 without running the endpoint.
+
+    Responses only change when the data release changes (see app.db.data_release), so the ETag is the
+    release version plus a hash of the request path and query. GWAS uploads and internal endpoints
+    are excluded, as their responses change independently of the release.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        path = request.url.path
+        if request.method not in ("GET", "HEAD") or not path.startswith("/v1/") or path.startswith(EXCLUDED_PREFIXES):
+            return await call_next(request)
+
+        release = get_data_release()
+        request_hash = hashlib.md5(f"{path}?{sorted(request.query_params.multi_items())}".encode()).hexdigest()[:12]
+        etag = f'"{release.version}-{request_hash}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(release.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+        }
+
+        if self._is_not_modified(request, etag, release.last_modified):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            for name, value in headers.items():
+                # Endpoints that serve cached bodies set their own content ETag (and may validate it themselves)
+                if name not in response.headers:
+                    response.headers[name] = value
+        return response
+
+    @staticmethod
+    def _is_not_modified(request: Request, etag: str, last_modified) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
@@ -57,22 +57,8 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         except Exception:
             return Response(content="Invalid query parameters", status_code=400)
 
-        # Sanitize request body if it exists
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.json()
-                sanitized_body = await self.sanitize_input(body)
-
-                # Modify request body with sanitized content
-                async def receive():
-                    return {
-                        "type": "http.request",
-                        "body": str(sanitized_body).encode(),
-                    }
-
-                request._receive = receive
-            except Exception:
-                pass  # If body can't be parsed as JSON, let the route handler deal with it
+        # Request bodies are not rewritten here: BaseHTTPMiddleware passes the cached original body to the
+        # route, and POST bodies are validated by their pydantic request models instead
 
         response = await call_next(request)
         return response
@@ -3,7 +3,10 @@ from enum import Enum
 import json
 import datetime
 from pydantic import BaseModel, field_validator, model_validator
-from typing import List, Optional, Union, Iterable
+from decimal import Decimal
+from functools import lru_cache
+import inspect
+from typing import List, Optional, Tuple, Union, Iterable, get_args, get_origin
 from app.db.utils import log_performance
 from app.logging_config import get_logger
 
@@ -34,6 +37,25 @@ class StudyDataType(Enum):
     phenotype = "Phenotype"
 
 
+class ResponseFormat(Enum):
+    json = "json"
+    arrow = "arrow"
+    parquet = "parquet"
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class LdMatrixFormat(Enum):
+    json = "json"
+    npz = "npz"
+    arrow = "arrow"
+
+
+class LdMatrixDtype(Enum):
+    float32 = "float32"
+    float16 = "float16"
+
+
 class VariantType(Enum):
     common = "Common"
     rare_exome = "Rare Exome"
@@ -431,6 +453,7 @@ class GetVariantsResponse(BaseModel):
     rare_results: Optional[List[ExtendedRareResult]] = None
     study_extractions: Optional[List[ExtendedStudyExtraction]] = None
     associations: Optional[List[dict]] = None
+    next_cursor: Optional[str] = None
 
 
 class VariantSummaryStatsResponse(BaseModel):
@@ -700,6 +723,36 @@ class PathwayEnrichmentResult(BaseModel):
     pathway_gene_ids: List[int]
 
 
+MAX_ASSOCIATION_PAIRS = 100_000
+
+
+class AssociationPairsRequest(BaseModel):
+    pairs: List[Tuple[int, int]]
+
+    @field_validator("pairs")
+    def validate_pairs(cls, v):
+        if not v:
+            raise ValueError("At least one [variant_id, study_id] pair is required")
+        if len(v) > MAX_ASSOCIATION_PAIRS:
+            raise ValueError(f"Cannot request more than {MAX_ASSOCIATION_PAIRS} pairs in one request")
+        return v
+
+
+MAX_VARIANT_IDENTIFIERS = 1_000_000
+
+
+class VariantIdentifiersRequest(BaseModel):
+    variants: List[str]
+
+    @field_validator("variants")
+    def validate_variants(cls, v):
+        if not v:
+            raise ValueError("At least one variant is required")
+        if len(v) > MAX_VARIANT_IDENTIFIERS:
+            raise ValueError(f"Cannot resolve more than {MAX_VARIANT_IDENTIFIERS} variants in one request")
+        return v
+
+
 class PathwayEnrichmentRequest(BaseModel):
     genes: List[Union[str, int]]
     source: Optional[str] = None
@@ -745,37 +798,179 @@ class GPMapMetadata(BaseModel):
     num_causal_variants: int
 
 
+_SCALAR_TYPES = (int, float, str, bool)
+_NONE_TYPE = type(None)
+
+
+class _FastModelConverter:
+    """
+    Builds models from DuckDB rows by setting the instance __dict__ directly instead of running
+    full validation (model_construct is itself a per-field Python loop, and slower than validation).
+
+    Only used for models whose fields are plain scalars (or Optional scalars), other than optional
+    fields that default to None, and whose only validators are "after" field validators, which are
+    applied here. Rows are checked by their tuple of value types, which DuckDB repeats across a result,
+    so the check is one dict lookup per row. Values are coerced the way validation would for the types
+    DuckDB returns (ints or Decimals for float fields). Any other row (missing or NULL required fields,
+    values of another type, values for non-scalar fields) falls back to validation, so the resulting
+    models and errors are unchanged.
+    """
+
+    def __init__(self, model: type[BaseModel], field_types: dict[str, tuple[Optional[type], bool]]):
+        self.model = model
+        self.fields = tuple(field_types)
+        self.field_types = tuple(field_types.values())
+        self.defaults = tuple(field.default for field in model.model_fields.values())
+        self.min_row_length = (
+            max((idx for idx, field in enumerate(model.model_fields.values()) if field.is_required()), default=-1) + 1
+        )
+        self.validators = [
+            (self.fields.index(field), getattr(model, decorator.cls_var_name))
+            for decorator in model.__pydantic_decorators__.field_validators.values()
+            for field in decorator.info.fields
+        ]
+        # Assignment only adds declared field names, so a fully populated instance can share the set
+        self._all_fields_set = set(self.fields)
+        self._plans: dict[tuple, Optional[tuple[int, ...]]] = {}
+
+    def _plan(self, signature: tuple) -> Optional[tuple[int, ...]]:
+        """The indexes to coerce to float for rows with these value types, or None if they need validation."""
+        if len(signature) < self.min_row_length:
+            return None
+        float_indexes = []
+        for idx, (value_type, (field_type, nullable)) in enumerate(zip(signature, self.field_types)):
+            if value_type is _NONE_TYPE:
+                if not nullable:
+                    return None
+            elif field_type is None:
+                return None
+            elif field_type is float and value_type in (int, Decimal):
+                float_indexes.append(idx)
+            elif value_type is not field_type:
+                return None
+        return tuple(float_indexes)
+
+    def _row_plan(self, row: tuple) -> Optional[tuple[int, ...]]:
+        signature = tuple(map(type, row))
+        try:
+            return self._plans[signature]
+        except KeyError:
+            float_indexes = self._plans[signature] = self._plan(signature)
+            return float_indexes
+
+    def row_to_model(self, row: tuple) -> BaseModel:
+        float_indexes = self._row_plan(row)
+        if float_indexes is None:
+            return self.model(**{field: row[idx] for idx, field in enumerate(self.fields) if idx < len(row)})
+
+        num_values = min(len(row), len(self.fields))
+        values = list(row[:num_values])
+        for idx in float_indexes:
+            values[idx] = float(values[idx])
+        for idx, validator in self.validators:
+            if idx < num_values:
+                values[idx] = validator(values[idx])
+        if num_values < len(self.fields):
+            fields_set = set(self.fields[:num_values])
+            values.extend(self.defaults[num_values:])
+        else:
+            fields_set = self._all_fields_set
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", dict(zip(self.fields, values)))
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def rows_to_columns(self, rows: List[tuple]) -> dict[str, list]:
+        """
+        The rows as {field: [values]}. Rows are checked as in row_to_model; if any row needs validation
+        (or lacks trailing fields), every row goes through row_to_model, so both accept the same rows.
+        """
+        if any(len(row) < len(self.fields) or self._row_plan(row) is None for row in rows):
+            models = [self.row_to_model(row) for row in rows]
+            return {field: [model.__dict__[field] for model in models] for field in self.fields}
+
+        columns = {field: list(column) for field, column in zip(self.fields, zip(*rows))}
+        for field, (field_type, _) in zip(self.fields, self.field_types):
+            if field_type is float and field in columns:
+                columns[field] = [v if v is None or type(v) is float else float(v) for v in columns[field]]
+        for idx, validator in self.validators:
+            if self.fields[idx] in columns:
+                columns[self.fields[idx]] = [validator(v) for v in columns[self.fields[idx]]]
+        return columns
+
+
+@lru_cache(maxsize=None)
+def _get_fast_converter(model: type[BaseModel]) -> Optional[_FastModelConverter]:
+    if model.__private_attributes__ or model.__pydantic_post_init__ or model.model_config.get("extra") == "allow":
+        return None
+    decorators = model.__pydantic_decorators__
+    if decorators.model_validators or decorators.root_validators or decorators.validators:
+        return None
+    for decorator in decorators.field_validators.values():
+        validator = getattr(model, decorator.cls_var_name)
+        if decorator.info.mode != "after" or len(inspect.signature(validator).parameters) != 1:
+            return None
+
+    field_types = {}
+    for name, field in model.model_fields.items():
+        # Constraints (ge, max_length, strict, Annotated metadata) are only checked by full validation
+        if field.default_factory is not None or field.alias is not None or field.metadata:
+            return None
+        annotation, nullable = field.annotation, False
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not _NONE_TYPE]
+            annotation, nullable = (args[0] if len(args) == 1 else None), len(args) < len(get_args(annotation))
+        if annotation in _SCALAR_TYPES:
+            field_types[name] = (annotation, nullable)
+        elif not field.is_required() and field.default is None:
+            field_types[name] = (None, True)
+        else:
+            return None
+    return _FastModelConverter(model, field_types)
+
+
 @log_performance
 def convert_duckdb_to_pydantic_model(
     model: BaseModel, results: Union[List[tuple], tuple]
 ) -> Union[List[BaseModel], BaseModel]:
     """Convert DuckDB query results to a Pydantic model instance"""
+    converter = _get_fast_converter(model)
+    fields = tuple(model.model_fields)
+
+    def to_model(row: tuple) -> BaseModel:
+        if converter is not None:
+            return converter.row_to_model(row)
+        return model(**{field: row[idx] for idx, field in enumerate(fields) if idx < len(row)})
+
     if isinstance(results, list):
-        converted = []
-        if len(results) == 0:
-            return []
-        else:
-            for row in results:
-                if row and not all(v is None for v in row):
-                    model_dict = {
-                        field: row[idx] for idx, field in enumerate(model.model_fields.keys()) if idx < len(row)
-                    }
-                    converted.append(model(**model_dict))
-                else:
-                    converted.append(None)
-        return converted
+        return [to_model(row) if row and not all(v is None for v in row) else None for row in results]
 
     # Handle single tuple case
     elif isinstance(results, tuple):
         if results and not all(v is None for v in results):
-            return model(
-                **{field: results[idx] for idx, field in enumerate(model.model_fields.keys()) if idx < len(results)}
-            )
+            return to_model(results)
         return None
     else:
         raise ValueError("Results must be a list of tuples or a single tuple.")
 
 
+@log_performance
+def convert_duckdb_to_columns(model: BaseModel, results: List[tuple]) -> dict[str, list]:
+    """
+    Convert DuckDB query results to a column-oriented payload, {field: [values]}, with the model's
+    field validators applied. Serialises directly to JSON without building a model per row.
+    """
+    converter = _get_fast_converter(model)
+    if converter is None:
+        raise ValueError(f"{model.__name__} has fields or validators that need full validation")
+    rows = [row for row in results if row and not all(v is None for v in row)]
+    if not rows:
+        return {field: [] for field in converter.fields}
+    return converter.rows_to_columns(rows)
+
+
 @log_performance
 def convert_duckdb_tuples_to_dicts(
     rows: Union[List[tuple], tuple],
@@ -795,6 +990,6 @@ def convert_duckdb_tuples_to_dicts(
 
 def enum_has_member(enum_class, key: str) -> bool:
     try:
-        return key in enum_class.__members__
+        return key in enum_class._member_map_
     except Exception:
         return False
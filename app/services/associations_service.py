@@ -1,11 +1,16 @@
 from functools import wraps
-from typing import List
+from typing import Iterator, List, Tuple
+
+import pyarrow as pa
 
 from app.db.associations_db import AssociationsDBClient
 from app.db.associations_full_db import AssociationsFullDBClient, clear_table_study_ids_cache
+from app.db.executor import ShardExecutor
 from app.db.redis import RedisClient
 from app.db.studies_db import StudiesDBClient
 from app.logging_config import get_logger
+from app.services.range_index import RangeIndex, clear_range_indexes, get_range_index
+from app.services.cache_namespace import register_cache_prefix
 from app.services.redis_decorator import redis_cache
 from app.services.studies_service import StudiesService
 from app.models.schemas import (
@@ -31,6 +36,7 @@ def associations_redis_cache(min_size: int = 100, expire: int = 0, prefix: str =
         expire: Cache expiration time in seconds (default: 0 = never expire)
         prefix: Key prefix for Redis cache keys
     """
+    register_cache_prefix(prefix)
 
     def decorator(func):
         @wraps(func)
@@ -80,37 +86,59 @@ class AssociationsService:
         return associations
 
     def get_associations_by_variant_ids_and_study_ids(self, variant_ids: List[int], study_ids: List[int]):
-        snp_study_pairs = [(variant_id, study_id) for variant_id in variant_ids for study_id in study_ids]
-        associations, columns = self.associations_db.get_associations_by_snp_study_pairs(snp_study_pairs)
+        associations, columns = self.associations_db.get_associations_by_variant_ids_and_study_ids(
+            variant_ids, study_ids
+        )
         associations = convert_duckdb_tuples_to_dicts(associations, columns)
         return associations
 
+    def stream_associations_by_snp_study_pairs(
+        self, snp_study_pairs: List[Tuple[int, int]]
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Associations for exactly these (variant_id, study_id) pairs, as Arrow record batches. Pairs are looked up
+        in the associations DB first; any it does not hold are looked up in the associations_full table whose
+        variant range contains them. Each pair is returned at most once.
+        """
+        snp_study_pairs = list(dict.fromkeys(snp_study_pairs))
+        found = set()
+        for batch in self.associations_db.stream_associations_by_snp_study_pairs(snp_study_pairs):
+            found.update(zip(batch["variant_id"].to_pylist(), batch["study_id"].to_pylist()))
+            yield batch
+
+        missing = [pair for pair in snp_study_pairs if pair not in found]
+        if not missing:
+            return
+        index = self.get_associations_full_index()
+        positions = index.lookup(pair[0] for pair in missing)
+        pairs_by_table = {}
+        for pair, position in zip(missing, positions.tolist()):
+            if position >= 0:
+                pairs_by_table.setdefault(index.names[position], []).append(pair)
+        for table_name, table_pairs in pairs_by_table.items():
+            yield from self.associations_full_db.stream_associations_by_snp_study_pairs(table_name, table_pairs)
+
     def get_associations_full_metadata(self):
         metadata = self.associations_full_db.get_associations_metadata()
         metadata = convert_duckdb_to_pydantic_model(AssociationMetadata, metadata)
         return metadata
 
-    def split_variants_by_metadata(self, variant_ids: set[int]) -> dict[str, list[int]]:
-        associations_metadata = self.get_associations_full_metadata()
-        metadata_to_variants = {metadata.associations_table_name: [] for metadata in associations_metadata}
-
-        for variant_id in variant_ids:
-            for metadata in associations_metadata:
-                if metadata.start_variant_id <= variant_id <= metadata.stop_variant_id:
-                    metadata_to_variants[metadata.associations_table_name].append(variant_id)
-                    break
-
-        return metadata_to_variants
+    def get_associations_full_index(self) -> RangeIndex:
+        """associations_metadata as a RangeIndex of variant id ranges to tables, loaded once per data release"""
+        return get_range_index(
+            "associations_metadata",
+            lambda: [
+                (metadata.start_variant_id, metadata.stop_variant_id, metadata.associations_table_name)
+                for metadata in self.get_associations_full_metadata()
+            ],
+        )
 
-    def _fetch_associations_full(
-        self, variant_ids: set[int], study_ids: set[int]
-    ) -> tuple[list[str], list[list]]:
-        if not variant_ids or not study_ids:
-            return [], []
+    def split_variants_by_metadata(self, variant_ids: set[int]) -> dict[str, list[int]]:
+        return self.get_associations_full_index().split(variant_ids)
 
+    def _associations_full_queries(self, variant_ids: set[int], study_ids: set[int]):
+        """Yield (table_name, variant_ids, study_ids) for each associations table the request touches"""
         variants_by_table = self.split_variants_by_metadata(variant_ids)
-        column_names: list[str] = []
-        all_rows: list[list] = []
         for table_name, table_variant_ids in variants_by_table.items():
             if not table_variant_ids:
                 continue
@@ -126,26 +154,108 @@ class AssociationsService:
                 f"Querying {table_name} with {len(table_variant_ids)} variants "
                 f"and {len(table_study_ids)} studies (filtered from {len(study_ids)})"
             )
-            rows, columns = self.associations_full_db.get_associations_by_table_name(
-                table_name, table_variant_ids, table_study_ids
-            )
+            yield table_name, table_variant_ids, table_study_ids
+
+    def _fetch_associations_full(
+        self, variant_ids: set[int], study_ids: set[int]
+    ) -> tuple[list[str], list[list]]:
+        if not variant_ids or not study_ids:
+            return [], []
+
+        results = ShardExecutor().map(
+            lambda query: self.associations_full_db.get_associations_by_table_name(*query),
+            self._associations_full_queries(variant_ids, study_ids),
+        )
+        column_names: list[str] = []
+        all_rows: list[list] = []
+        for rows, columns in results:
             if not column_names:
                 column_names = columns
             all_rows.extend(list(row) for row in rows)
 
         return column_names, all_rows
 
+    def _fetch_associations_full_arrow(self, variant_ids: set[int], study_ids: set[int]) -> pa.Table:
+        tables = []
+        if variant_ids and study_ids:
+            tables = ShardExecutor().map(
+                lambda query: self.associations_full_db.get_associations_arrow_by_table_name(*query),
+                self._associations_full_queries(variant_ids, study_ids),
+            )
+        if not tables:
+            return self._empty_associations_full_arrow()
+        return pa.concat_tables(tables, promote_options="default")
+
+    def _empty_associations_full_arrow(self) -> pa.Table:
+        """An empty table with the associations_full columns, read from the first table, so clients keep the schema"""
+        table_names = self.get_associations_full_index().names
+        if not table_names:
+            return pa.table({})
+        return self.associations_full_db.get_associations_arrow_by_table_name(table_names[0], [], [])
+
     def get_associations_full(self, trait_id: str | int) -> tuple[list[str], list[list]] | None:
         studies_db = StudiesDBClient()
         trait_row = studies_db.get_trait(trait_id)
         if trait_row is None:
             return None
         trait = convert_duckdb_to_pydantic_model(Trait, trait_row)
+        try:
+            # Access counts pick the traits a cache warm-up rebuilds (see app.services.cache_warmup)
+            self.redis_client.record_trait_access(trait.id)
+        except Exception as e:
+            logger.warning(f"Failed to record access to trait {trait.id}: {e}")
         result = self._get_associations_full_cached(trait_id=trait.id, cache_id=str(trait.id))
         return result["column_names"], result["rows"]
 
+    def get_associations_full_arrow(self, trait_id: str | int) -> pa.Table | None:
+        """
+        The associations-full matrix as an Arrow table, read straight from DuckDB's Arrow result sets.
+        Not cached in Redis: it is only built for the arrow/parquet formats, which clients download once.
+        """
+        studies_db = StudiesDBClient()
+        trait_row = studies_db.get_trait(trait_id)
+        if trait_row is None:
+            return None
+        trait = convert_duckdb_to_pydantic_model(Trait, trait_row)
+        variant_ids, study_ids = self._get_associations_full_keys(trait.id)
+        table = self._fetch_associations_full_arrow(variant_ids, study_ids)
+        logger.info(f"Returning {table.num_rows} full associations for trait {trait.id} as Arrow")
+        return table
+
+    def stream_associations_full(self, trait_id: str | int) -> Iterator[pa.RecordBatch] | None:
+        """
+        The associations-full matrix as Arrow record batches, pulled table by table from DuckDB, so memory
+        stays bounded by settings.STREAM_BATCH_SIZE however large the trait is. The trait's variants and
+        studies are looked up here; the returned iterator runs the association queries as it is consumed.
+        """
+        studies_db = StudiesDBClient()
+        trait_row = studies_db.get_trait(trait_id)
+        if trait_row is None:
+            return None
+        trait = convert_duckdb_to_pydantic_model(Trait, trait_row)
+        variant_ids, study_ids = self._get_associations_full_keys(trait.id)
+        return self._stream_associations_full(variant_ids, study_ids)
+
+    def _stream_associations_full(self, variant_ids: set[int], study_ids: set[int]) -> Iterator[pa.RecordBatch]:
+        if not variant_ids or not study_ids:
+            return
+        for table_name, table_variant_ids, table_study_ids in self._associations_full_queries(variant_ids, study_ids):
+            yield from self.associations_full_db.stream_associations_by_table_name(
+                table_name, table_variant_ids, table_study_ids
+            )
+
     @redis_cache(prefix="associations_full_cache")
     def _get_associations_full_cached(self, trait_id: int, cache_id: str = None):
+        variant_ids, study_ids = self._get_associations_full_keys(trait_id)
+        if not variant_ids or not study_ids:
+            return {"column_names": [], "rows": []}
+
+        column_names, rows = self._fetch_associations_full(variant_ids, study_ids)
+        logger.info(f"Returning {len(rows)} full associations for trait {trait_id}")
+        return {"column_names": column_names, "rows": rows}
+
+    def _get_associations_full_keys(self, trait_id: int) -> tuple[set[int], set[int]]:
+        """The variants (from the trait's colocs, rare results and extractions) and studies in the trait's matrix"""
         studies_db = StudiesDBClient()
         studies_service = StudiesService()
 
@@ -187,28 +297,21 @@ class AssociationsService:
             variant_ids.add(study_extraction.variant_id)
 
         study_ids_set = {coloc.study_id for coloc in colocs} | trait_study_ids
-
-        if not variant_ids or not study_ids_set:
-            return {"column_names": [], "rows": []}
-
-        logger.info(
-            f"Getting full associations for trait {trait_id} "
-            f"({len(variant_ids)} variants x {len(study_ids_set)} studies)"
-        )
-        column_names, rows = self._fetch_associations_full(variant_ids, study_ids_set)
-        logger.info(f"Returning {len(rows)} full associations for trait {trait_id}")
-        return {"column_names": column_names, "rows": rows}
+        if variant_ids and study_ids_set:
+            logger.info(
+                f"Getting full associations for trait {trait_id} "
+                f"({len(variant_ids)} variants x {len(study_ids_set)} studies)"
+            )
+        return variant_ids, study_ids_set
 
     def clear_cache(self):
         """Clear associations Redis cache entries (use with caution)"""
         clear_table_study_ids_cache()
+        clear_range_indexes()
         try:
             cleared = 0
             for prefix in (self.cache_prefix, self.full_cache_prefix):
-                keys = self.redis_client.redis.keys(f"{prefix}:*")
-                if keys:
-                    self.redis_client.redis.delete(*keys)
-                    cleared += len(keys)
+                cleared += self.redis_client.delete_keys_matching(f"{prefix}:*")
             if cleared:
                 logger.info(f"Cleared {cleared} associations cache keys")
             else:
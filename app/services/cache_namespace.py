@@ -0,0 +1,163 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.config import get_settings
+from app.db.data_release import get_data_release
+from app.db.redis import RedisClient
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CACHE_REAPER_LOCK = "lock:cache_reaper"
+
+_cache_prefixes: set[str] = set()
+_writing_namespace: ContextVar[Optional[str]] = ContextVar("writing_cache_namespace", default=None)
+_active_namespace: Optional[tuple[str, str]] = None
+_active_namespace_expires_at = 0.0
+_active_namespace_lock = threading.Lock()
+_reaper: Optional[threading.Thread] = None
+
+
+def register_cache_prefix(prefix: str):
+    """Record a redis_cache key prefix, so reap_cache_namespaces knows which keys to scan."""
+    _cache_prefixes.add(prefix)
+
+
+def default_cache_namespace(release: str) -> str:
+    return f"{release}.0"
+
+
+def get_cache_namespace(redis_client: RedisClient) -> str:
+    """
+    The namespace redis_cache keys are read from and written to: the one being filled by a cache warm-up
+    in this context (see writing_cache_namespace), otherwise the one active for the current data release
+    (see app.db.data_release). Namespaces are {release}.{generation}, and a warm-up for a release fills a
+    new generation and activates it. Until then a new release keeps serving the namespace activated last,
+    normally the previous release's, so its DuckDB files going live never meets a cold cache; it starts
+    from {release}.0 only if no namespace was ever activated.
+
+    The data release and the active namespace are re-read at most every CACHE_NAMESPACE_REFRESH_SECONDS,
+    so a new release or a flip reaches every worker within that time, while cache lookups in between cost
+    no file stats or Redis round trips. Until then workers keep serving the previous namespace, whose keys
+    reap_cache_namespaces only expires after CACHE_NAMESPACE_RETIRED_TTL_SECONDS.
+    """
+    writing = _writing_namespace.get()
+    if writing is not None:
+        return writing
+
+    global _active_namespace, _active_namespace_expires_at
+    with _active_namespace_lock:
+        if _active_namespace is not None and time.monotonic() < _active_namespace_expires_at:
+            return _active_namespace[1]
+        release = get_data_release().version
+        try:
+            namespace = redis_client.get_cache_namespace(release) or default_cache_namespace(release)
+        except Exception as e:
+            logger.warning(f"Redis cache namespace lookup failed, using the default for release {release}: {e}")
+            namespace = default_cache_namespace(release)
+        _active_namespace = (release, namespace)
+        _active_namespace_expires_at = time.monotonic() + settings.CACHE_NAMESPACE_REFRESH_SECONDS
+        return namespace
+
+
+def new_cache_namespace(redis_client: RedisClient) -> str:
+    return redis_client.new_cache_namespace(get_data_release().version)
+
+
+def activate_cache_namespace(redis_client: RedisClient, namespace: str):
+    """Make namespace the one every worker reads from. A single Redis SET, so the cutover is atomic."""
+    global _active_namespace, _active_namespace_expires_at
+    release = namespace.rpartition(".")[0]
+    redis_client.set_cache_namespace(release, namespace)
+    with _active_namespace_lock:
+        _active_namespace = (release, namespace)
+        _active_namespace_expires_at = time.monotonic() + settings.CACHE_NAMESPACE_REFRESH_SECONDS
+
+
+@contextmanager
+def writing_cache_namespace(namespace: str):
+    """Read and write redis_cache keys in namespace rather than the active one for the duration of the block."""
+    token = _writing_namespace.set(namespace)
+    try:
+        yield namespace
+    finally:
+        _writing_namespace.reset(token)
+
+
+def clear_cache_namespace():
+    """Forget the active namespace, so the next lookup reads it from Redis."""
+    global _active_namespace, _active_namespace_expires_at
+    with _active_namespace_lock:
+        _active_namespace = None
+        _active_namespace_expires_at = 0.0
+
+
+def is_retired_namespace(namespace: str, release: str, active_namespace: str) -> bool:
+    """
+    Whether namespace has been superseded: it is not the active one (which may still be the previous
+    release's) and belongs to another data release (or predates namespaces), or to an earlier generation
+    of this release than the active one. Later generations are kept, as they may be being filled by a warm-up.
+    """
+    if namespace == active_namespace:
+        return False
+    namespace_release, _, generation = namespace.rpartition(".")
+    if namespace_release != release or not generation.isdigit():
+        return True
+    active_release, _, active_generation = active_namespace.rpartition(".")
+    return active_release == release and int(generation) < int(active_generation)
+
+
+def reap_cache_namespaces(redis_client: RedisClient, batch_size: int = 1000) -> int:
+    """
+    Give every cache key (and cache lock fence counter) in a retired namespace a TTL of
+    CACHE_NAMESPACE_RETIRED_TTL_SECONDS, so Redis drops it once no worker can still be reading it.
+    Keys are found with SCAN, never KEYS. Returns the number of keys given a TTL.
+    """
+    release = get_data_release().version
+    active_namespace = redis_client.get_cache_namespace(release) or default_cache_namespace(release)
+    retired = 0
+    batch = []
+    for prefix in sorted(_cache_prefixes):
+        for pattern in (f"{prefix}:*", f"lock:{prefix}:*"):
+            namespace_position = pattern.count(":")
+            for key in redis_client.scan_keys(pattern, count=batch_size):
+                parts = key.split(":")
+                namespace = parts[namespace_position] if len(parts) > namespace_position else ""
+                if not is_retired_namespace(namespace, release, active_namespace):
+                    continue
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    retired += redis_client.expire_keys(batch, settings.CACHE_NAMESPACE_RETIRED_TTL_SECONDS)
+                    batch = []
+    if batch:
+        retired += redis_client.expire_keys(batch, settings.CACHE_NAMESPACE_RETIRED_TTL_SECONDS)
+    logger.info(f"Expiring {retired} cache keys outside namespace {active_namespace}")
+    return retired
+
+
+def start_cache_reaper():
+    """
+    Start a daemon thread that runs reap_cache_namespaces every CACHE_REAPER_INTERVAL_SECONDS.
+    Every worker runs one, but a Redis lock held for the interval lets only one of them reap each time.
+    """
+    global _reaper
+    if _reaper is not None and _reaper.is_alive():
+        return
+    _reaper = threading.Thread(target=_reap_periodically, name="cache-reaper", daemon=True)
+    _reaper.start()
+
+
+def _reap_periodically():
+    redis_client = RedisClient()
+    interval = settings.CACHE_REAPER_INTERVAL_SECONDS
+    while True:
+        try:
+            if redis_client.acquire_lock(CACHE_REAPER_LOCK, int(interval * 1000)) is not None:
+                reap_cache_namespaces(redis_client)
+        except Exception as e:
+            logger.warning(f"Cache namespace reaping failed: {e}")
+        time.sleep(interval)
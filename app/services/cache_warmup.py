@@ -0,0 +1,144 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.db.redis import RedisClient
+from app.logging_config import get_logger
+from app.services.associations_service import AssociationsService
+from app.services.cache_namespace import (
+    activate_cache_namespace,
+    get_cache_namespace,
+    new_cache_namespace,
+    reap_cache_namespaces,
+    writing_cache_namespace,
+)
+from app.services.entity_counts import get_entity_counts
+from app.services.studies_service import StudiesService
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CACHE_WARMUP_LOCK = "lock:cache_warmup"
+CACHE_WARMUP_LOCK_TTL_MS = 60 * 60 * 1000
+CACHE_WARMUP_REPORT_KEY = "cache_warmup:last_report"
+
+
+class CacheWarmupInProgressError(Exception):
+    pass
+
+
+def select_warmup_trait_ids() -> list[int]:
+    """
+    Traits whose associations-full matrix is worth building ahead of requests: the most requested
+    (see AssociationsService.get_associations_full), then those in at least CACHE_WARMUP_MIN_COLOC_GROUPS
+    coloc groups, largest first, as their matrices are the slowest to build.
+    """
+    try:
+        most_accessed = RedisClient().get_most_accessed_trait_ids(settings.CACHE_WARMUP_MOST_ACCESSED_TRAITS)
+    except Exception as e:
+        logger.warning(f"Could not read trait access counts, warming traits by coloc count only: {e}")
+        most_accessed = []
+
+    trait_counts = get_entity_counts("traits")
+    most_colocalised = sorted(
+        (
+            trait_id
+            for trait_id, counts in trait_counts.items()
+            if counts.num_coloc_groups >= settings.CACHE_WARMUP_MIN_COLOC_GROUPS
+        ),
+        key=lambda trait_id: trait_counts[trait_id].num_coloc_groups,
+        reverse=True,
+    )
+    return list(dict.fromkeys([*most_accessed, *most_colocalised]))
+
+
+def get_warmup_tasks(trait_ids: list[int]) -> dict[str, Callable[[], object]]:
+    studies_service = StudiesService()
+    associations_service = AssociationsService()
+    tasks = {
+        "get_search_terms": studies_service.get_search_terms,
+        "get_traits": studies_service.get_traits,
+        "get_genes": studies_service.get_genes,
+        "get_gene_names": studies_service.get_gene_names,
+        "get_tissues": studies_service.get_tissues,
+        "get_gpmap_metadata": studies_service.get_gpmap_metadata,
+    }
+    for trait_id in trait_ids:
+        tasks[f"associations_full:{trait_id}"] = (
+            lambda trait_id=trait_id: associations_service._get_associations_full_cached(
+                trait_id=trait_id, cache_id=str(trait_id)
+            )
+        )
+    return tasks
+
+
+def warm_cache(trait_ids: Optional[list[int]] = None, max_workers: int = None) -> dict:
+    """
+    Rebuild the studies cache and the associations-full cache of trait_ids (default select_warmup_trait_ids())
+    in a new cache namespace, on a pool of max_workers threads, then make it the active namespace.
+    Requests keep reading the previous namespace until the flip, so there is no cold window after a data update.
+    The flip is skipped if any studies cache entry failed to build; failed traits are built on demand instead.
+    Only one warm-up runs at a time across workers.
+    """
+    redis_client = RedisClient()
+    lock_token = redis_client.acquire_lock(CACHE_WARMUP_LOCK, CACHE_WARMUP_LOCK_TTL_MS)
+    if lock_token is None:
+        raise CacheWarmupInProgressError("A cache warm-up is already running")
+
+    try:
+        started = time.perf_counter()
+        previous_namespace = get_cache_namespace(redis_client)
+        namespace = new_cache_namespace(redis_client)
+        if trait_ids is None:
+            trait_ids = select_warmup_trait_ids()
+        tasks = get_warmup_tasks(trait_ids)
+        logger.info(f"Warming {len(tasks)} cache entries into namespace {namespace}")
+
+        def run(task: Callable[[], object]):
+            with writing_cache_namespace(namespace):
+                task()
+
+        failed = []
+        with ThreadPoolExecutor(
+            max_workers=max_workers or settings.CACHE_WARMUP_WORKERS, thread_name_prefix="cache-warmup"
+        ) as executor:
+            futures = {executor.submit(run, task): name for name, task in tasks.items()}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Cache warm-up of {futures[future]} failed: {e}")
+                    failed.append(futures[future])
+
+        failed_studies_entries = [name for name in failed if not name.startswith("associations_full:")]
+        activated = not failed_studies_entries
+        if activated:
+            activate_cache_namespace(redis_client, namespace)
+            logger.info(f"Activated cache namespace {namespace} (previously {previous_namespace})")
+            try:
+                reap_cache_namespaces(redis_client)
+            except Exception as e:
+                logger.warning(f"Failed to expire cache keys outside namespace {namespace}: {e}")
+        else:
+            logger.error(f"Not activating cache namespace {namespace}, failed to build {failed_studies_entries}")
+
+        report = {
+            "namespace": namespace,
+            "previous_namespace": previous_namespace,
+            "activated": activated,
+            "warmed": len(tasks) - len(failed),
+            "failed": sorted(failed),
+            "traits": len(trait_ids),
+            "seconds": round(time.perf_counter() - started, 1),
+        }
+        redis_client.redis.set(CACHE_WARMUP_REPORT_KEY, json.dumps(report))
+        return report
+    finally:
+        redis_client.release_lock(CACHE_WARMUP_LOCK, lock_token)
+
+
+def get_last_warmup_report() -> Optional[dict]:
+    report = RedisClient().redis.get(CACHE_WARMUP_REPORT_KEY)
+    return json.loads(report) if report else None
@@ -1,5 +1,9 @@
 from functools import lru_cache
 from typing import List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
 from app.logging_config import get_logger
 from app.models.schemas import (
     ColocPairMetadata,
@@ -67,6 +71,38 @@ class ColocPairsService:
 
         return coloc_in_group + coloc_not_in_group
 
+    def get_coloc_pairs_full_arrow(
+        self,
+        variant_ids: List[int],
+        h3_threshold: float = 0.0,
+        h4_threshold: float = 0.8,
+    ) -> pa.Table:
+        """
+        get_coloc_pairs_full as an Arrow table, read straight from DuckDB's Arrow result sets. DuckDB is queried
+        even without variant_ids, so an empty table still has the coloc_pairs columns.
+        """
+        coloc_in_group = self.coloc_pairs_db.get_coloc_pairs_arrow_by_variant_ids(
+            variant_ids, h3_threshold=h3_threshold, h4_threshold=h4_threshold
+        )
+        coloc_in_group = coloc_in_group.append_column(
+            "in_coloc_group", pa.repeat(pa.scalar(True), coloc_in_group.num_rows)
+        )
+
+        study_extraction_ids = set()
+        for column in ("study_extraction_a_id", "study_extraction_b_id"):
+            study_extraction_ids.update(pc.unique(coloc_in_group[column].drop_null()).to_pylist())
+        if not study_extraction_ids:
+            return coloc_in_group
+
+        logger.info(f"Getting coloc pairs (variant_id null) for {len(study_extraction_ids)} study extraction ids")
+        coloc_not_in_group = self.coloc_pairs_db.get_coloc_pairs_arrow_by_study_extraction_ids(
+            list(study_extraction_ids)
+        )
+        coloc_not_in_group = coloc_not_in_group.append_column(
+            "in_coloc_group", pa.repeat(pa.scalar(False), coloc_not_in_group.num_rows)
+        )
+        return pa.concat_tables([coloc_in_group, coloc_not_in_group], promote_options="default")
+
     def get_coloc_pairs_by_study_extraction_ids(
         self,
         study_extraction_ids: List[int],
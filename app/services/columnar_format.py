@@ -0,0 +1,118 @@
+import io
+import json
+import re
+from decimal import Decimal
+from typing import AsyncIterator, Iterable, Iterator, List, Union
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc
+import pyarrow.parquet as pq
+from fastapi.responses import Response, StreamingResponse
+
+from app.models.schemas import ResponseFormat
+
+MEDIA_TYPES = {
+    ResponseFormat.arrow: "application/vnd.apache.arrow.stream",
+    ResponseFormat.parquet: "application/vnd.apache.parquet",
+    ResponseFormat.ndjson: "application/x-ndjson",
+    ResponseFormat.csv: "text/csv",
+}
+
+FILE_EXTENSIONS = {
+    ResponseFormat.arrow: "arrows",
+    ResponseFormat.parquet: "parquet",
+    ResponseFormat.ndjson: "ndjson",
+    ResponseFormat.csv: "csv",
+}
+
+STREAMING_FORMATS = (ResponseFormat.ndjson, ResponseFormat.csv)
+
+
+def rows_to_arrow_table(column_names: List[str], rows: List[list]) -> pa.Table:
+    """
+    Build an Arrow table from column names and row lists, as returned by the JSON bulk endpoints.
+    Without rows, the table still has every column, as empty arrays.
+    """
+    if not rows:
+        return pa.table({name: pa.array([]) for name in column_names})
+    return pa.table({name: list(column) for name, column in zip(column_names, zip(*rows))})
+
+
+def serialize_arrow_table(table: pa.Table, response_format: ResponseFormat) -> bytes:
+    """Serialise a table as an Arrow IPC stream or a zstd-compressed Parquet file"""
+    if response_format == ResponseFormat.arrow:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    if response_format == ResponseFormat.parquet:
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression="zstd")
+        return buffer.getvalue()
+    raise ValueError(f"{response_format.value} is not a columnar format")
+
+
+def arrow_table_response(table: pa.Table, response_format: ResponseFormat, filename: str) -> Response:
+    """
+    Return table as an Arrow IPC stream or Parquet attachment. Both load straight into data frames
+    (pyarrow.ipc.open_stream / pandas.read_parquet, arrow::read_ipc_stream / arrow::read_parquet).
+    """
+    return Response(
+        content=serialize_arrow_table(table, response_format),
+        media_type=MEDIA_TYPES[response_format],
+        headers=attachment_headers(filename, response_format),
+    )
+
+
+def streaming_response(
+    chunks: Union[Iterator[bytes], AsyncIterator[bytes]], response_format: ResponseFormat, filename: str
+) -> StreamingResponse:
+    """Stream chunks from encode_record_batches as an NDJSON or CSV attachment"""
+    return StreamingResponse(
+        chunks, media_type=MEDIA_TYPES[response_format], headers=attachment_headers(filename, response_format)
+    )
+
+
+def attachment_headers(filename: str, response_format: ResponseFormat) -> dict:
+    filename = re.sub(r"[^A-Za-z0-9_.-]", "_", filename)
+    return {"Content-Disposition": f'attachment; filename="{filename}.{FILE_EXTENSIONS[response_format]}"'}
+
+
+def encode_record_batches(batches: Iterable[pa.RecordBatch], response_format: ResponseFormat) -> Iterator[bytes]:
+    """
+    Encode record batches as NDJSON (one object per row) or CSV (one header row), one chunk per batch,
+    for a StreamingResponse. Only the current batch is held in memory.
+    """
+    if response_format == ResponseFormat.ndjson:
+        return _record_batches_to_ndjson(batches)
+    if response_format == ResponseFormat.csv:
+        return _record_batches_to_csv(batches)
+    raise ValueError(f"{response_format.value} is not a streaming format")
+
+
+def _json_default(value):
+    # DuckDB DECIMAL columns arrive as Decimal; encode them as numbers, as the JSON responses do
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _record_batches_to_ndjson(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    for batch in batches:
+        if batch.num_rows:
+            yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch.to_pylist()).encode()
+
+
+def _record_batches_to_csv(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    buffer = io.BytesIO()
+    writer = None
+    for batch in batches:
+        if writer is None:
+            writer = pa_csv.CSVWriter(buffer, batch.schema)
+        writer.write_batch(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,95 @@
+import glob
+import os
+from typing import Any, NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.config import get_settings
+from app.db.data_release import clear_release_cache, get_data_release, get_release_cached
+from app.db.studies_db import GENE_COUNTS_QUERY, TRAIT_COUNTS_QUERY, StudiesDBClient
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class EntityCounts(NamedTuple):
+    num_study_extractions: int = 0
+    num_coloc_groups: int = 0
+    num_coloc_studies: int = 0
+    num_rare_results: int = 0
+
+
+NO_ENTITY_COUNTS = EntityCounts()
+
+ENTITY_COUNT_QUERIES = {
+    "traits": TRAIT_COUNTS_QUERY,
+    "genes": GENE_COUNTS_QUERY,
+}
+
+
+def get_entity_counts_dir() -> str:
+    return settings.ENTITY_COUNTS_DIR or os.path.join(os.path.dirname(settings.STUDIES_DB_PATH), "entity_counts")
+
+
+def get_entity_counts_path(entity: str, release: str) -> str:
+    return os.path.join(get_entity_counts_dir(), f"{entity}_counts_{release}.parquet")
+
+
+def materialize_entity_counts() -> dict[str, str]:
+    """
+    Compute the trait and gene count tables for the current data release once and write them next to the
+    studies database as Parquet, so get_entity_counts is a file read rather than the coloc_groups self-joins.
+    Files for other releases are removed. Returns {entity: path}.
+    """
+    release = get_data_release().version
+    os.makedirs(get_entity_counts_dir(), exist_ok=True)
+    db = StudiesDBClient()
+
+    paths = {}
+    for entity, query in ENTITY_COUNT_QUERIES.items():
+        path = get_entity_counts_path(entity, release)
+        partial_path = f"{path}.partial"
+        db.copy_query_to_parquet(query, partial_path)
+        os.replace(partial_path, path)
+        paths[entity] = path
+        logger.info(f"Wrote {entity} counts for release {release} to {path}")
+
+    for path in glob.glob(os.path.join(get_entity_counts_dir(), "*_counts_*.parquet")):
+        if path not in paths.values():
+            os.remove(path)
+
+    clear_entity_counts()
+    return paths
+
+
+def _counts_by_key(table: pa.Table) -> dict[Any, EntityCounts]:
+    keys = table.column(0).to_pylist()
+    counts = zip(*(table.column(field).to_pylist() for field in EntityCounts._fields))
+    return {key: EntityCounts(*values) for key, values in zip(keys, counts)}
+
+
+def _load_entity_counts(entity: str, release: str) -> dict[Any, EntityCounts]:
+    path = get_entity_counts_path(entity, release)
+    if os.path.exists(path):
+        return _counts_by_key(pq.read_table(path))
+
+    logger.warning(f"No {entity} counts file at {path}, computing counts from the studies database")
+    db = StudiesDBClient()
+    table = db.get_trait_counts() if entity == "traits" else db.get_gene_counts()
+    return _counts_by_key(table)
+
+
+def get_entity_counts(entity: str) -> dict[Any, EntityCounts]:
+    """
+    {trait id or gene name: EntityCounts} for entity ("traits" or "genes") in the current data release (see
+    get_release_cached), read from the Parquet file written by materialize_entity_counts, or computed from the
+    studies database if it has not been materialised. Callers must treat the dict as read-only.
+    """
+    return get_release_cached(f"{entity}_counts", lambda release: _load_entity_counts(entity, release))
+
+
+def clear_entity_counts():
+    for entity in ENTITY_COUNT_QUERIES:
+        clear_release_cache(f"{entity}_counts")
@@ -0,0 +1,129 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.db.data_release import clear_release_cache, get_release_cached
+from app.db.studies_db import StudiesDBClient
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GENE_CHR, GENE_START, GENE_STOP = 5, 6, 7
+LD_BLOCK_ID, LD_BLOCK_CHR, LD_BLOCK_START, LD_BLOCK_STOP = 0, 1, 2, 3
+
+
+class IntervalIndex:
+    """
+    Overlap and containment queries over [start, stop] intervals on chromosomes. Intervals are sorted by
+    (chromosome, start) once; a query binary searches the chromosome's starts, bounded below by the longest
+    interval on that chromosome, so it only inspects intervals that could overlap rather than all of them.
+    Points (e.g. variant positions) are intervals with start == stop.
+
+    Queries return the positions of the matching intervals in the sequences the index was built from, in order.
+    """
+
+    def __init__(self, chromosomes: Sequence[int], starts: Sequence[int], stops: Sequence[int]):
+        chromosomes = np.asarray(chromosomes, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        order = np.lexsort((starts, chromosomes))
+        self.positions = order
+        self.starts = starts[order]
+        self.stops = stops[order]
+
+        sorted_chromosomes = chromosomes[order]
+        unique_chromosomes, first = np.unique(sorted_chromosomes, return_index=True)
+        last = np.append(first[1:], len(order))
+        self._chromosomes = {
+            int(chromosome): (int(lo), int(hi), int((self.stops[lo:hi] - self.starts[lo:hi]).max()))
+            for chromosome, lo, hi in zip(unique_chromosomes, first, last)
+        }
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def overlapping(self, chromosome: int, start: int, stop: int) -> np.ndarray:
+        """Positions of the intervals that overlap [start, stop]."""
+        bounds = self._chromosomes.get(chromosome)
+        if bounds is None:
+            return np.empty(0, dtype=np.int64)
+        lo, hi, max_length = bounds
+        first = lo + np.searchsorted(self.starts[lo:hi], start - max_length, side="left")
+        last = lo + np.searchsorted(self.starts[lo:hi], stop, side="right")
+        matches = self.stops[first:last] >= start
+        return np.sort(self.positions[first:last][matches])
+
+    def within(self, chromosome: int, start: int, stop: int) -> np.ndarray:
+        """Positions of the intervals that lie entirely inside [start, stop]."""
+        bounds = self._chromosomes.get(chromosome)
+        if bounds is None:
+            return np.empty(0, dtype=np.int64)
+        lo, hi, _ = bounds
+        first = lo + np.searchsorted(self.starts[lo:hi], start, side="left")
+        last = lo + np.searchsorted(self.starts[lo:hi], stop, side="right")
+        matches = self.stops[first:last] <= stop
+        return np.sort(self.positions[first:last][matches])
+
+
+class GenomicIndex:
+    """
+    The genes, LD blocks and cis study extraction positions of a data release, indexed by position, so
+    region, gene window and range lookups are answered in memory. Gene and LD block rows are kept as the
+    DuckDB rows of StudiesDBClient.get_genes and get_ld_blocks; callers convert the rows they need to models.
+    """
+
+    def __init__(self, genes: list[tuple], ld_blocks: list[tuple], study_extraction_positions: dict[str, np.ndarray]):
+        self.genes = [gene for gene in genes if None not in (gene[GENE_CHR], gene[GENE_START], gene[GENE_STOP])]
+        self.gene_index = IntervalIndex(
+            [gene[GENE_CHR] for gene in self.genes],
+            [gene[GENE_START] for gene in self.genes],
+            [gene[GENE_STOP] for gene in self.genes],
+        )
+
+        self.ld_blocks = ld_blocks
+        self.ld_blocks_by_id = {ld_block[LD_BLOCK_ID]: ld_block for ld_block in ld_blocks}
+        self.ld_block_index = IntervalIndex(
+            [ld_block[LD_BLOCK_CHR] for ld_block in ld_blocks],
+            [ld_block[LD_BLOCK_START] for ld_block in ld_blocks],
+            [ld_block[LD_BLOCK_STOP] for ld_block in ld_blocks],
+        )
+
+        self.study_extraction_ids = np.asarray(study_extraction_positions["id"], dtype=np.int64)
+        bp = study_extraction_positions["bp"]
+        self.study_extraction_index = IntervalIndex(study_extraction_positions["chr"], bp, bp)
+
+    def genes_overlapping(self, chromosome: int, start: int, stop: int) -> list[tuple]:
+        return [self.genes[position] for position in self.gene_index.overlapping(chromosome, start, stop)]
+
+    def genes_within(self, chromosome: int, start: int, stop: int) -> list[tuple]:
+        return [self.genes[position] for position in self.gene_index.within(chromosome, start, stop)]
+
+    def ld_block(self, ld_block_id: int) -> Optional[tuple]:
+        return self.ld_blocks_by_id.get(ld_block_id)
+
+    def ld_blocks_overlapping(self, chromosome: int, start: int, stop: int) -> list[tuple]:
+        return [self.ld_blocks[position] for position in self.ld_block_index.overlapping(chromosome, start, stop)]
+
+    def study_extraction_ids_within(self, chromosome: int, start: int, stop: int) -> list[int]:
+        """Ids of the cis study extractions whose bp lies in [start, stop]."""
+        positions = self.study_extraction_index.within(chromosome, start, stop)
+        return self.study_extraction_ids[positions].tolist()
+
+
+def get_genomic_index() -> GenomicIndex:
+    """The GenomicIndex of the current data release, built from the studies database (see get_release_cached)."""
+    return get_release_cached("genomic_index", _build_genomic_index)
+
+
+def _build_genomic_index(release: str) -> GenomicIndex:
+    db = StudiesDBClient()
+    index = GenomicIndex(db.get_genes(), db.get_ld_blocks(), db.get_cis_study_extraction_positions())
+    logger.info(
+        f"Built genomic index with {len(index.gene_index)} genes, {len(index.ld_block_index)} LD blocks "
+        f"and {len(index.study_extraction_index)} study extractions for release {release}"
+    )
+    return index
+
+
+def clear_genomic_index():
+    clear_release_cache("genomic_index")
@@ -0,0 +1,177 @@
+import glob
+import os
+import shutil
+from typing import Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.db.data_release import clear_release_cache, get_data_release, get_release_cached
+from app.db.ld_db import LdDBClient
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+LD_EDGE_DTYPES = {
+    "neighbour_id": np.int64,
+    "ld_block_id": np.int64,
+    "r": np.float64,
+    "forward": np.bool_,
+}
+
+
+class LdIndex:
+    """
+    The LD pairs of a data release as a symmetric compressed sparse row (CSR) adjacency: the pairs of the
+    variant variant_ids[i] are the edges indptr[i]:indptr[i + 1], holding the other variant (neighbour_id),
+    ld_block_id and r, sorted by r² descending. Each row of the ld table is an edge at both of its variants;
+    forward marks the edge at its lead variant, so rows are rebuilt with their original orientation and
+    returned once. Proxy and matrix lookups read only the requested variants' edges, rather than scanning ld.
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        self.variant_ids = arrays["variant_id"]
+        self.indptr = arrays["indptr"]
+        self.neighbour_ids = arrays["neighbour_id"]
+        self.ld_block_ids = arrays["ld_block_id"]
+        self.r = arrays["r"]
+        self.forward = arrays["forward"]
+
+    def __len__(self) -> int:
+        return len(self.neighbour_ids)
+
+    def proxies(self, variant_ids: Iterable[int], rsquared_threshold: float = 0.8) -> list[tuple]:
+        """
+        The ld rows with either variant in variant_ids and r² >= rsquared_threshold, as
+        (lead_variant_id, proxy_variant_id, ld_block_id, r) tuples like LdDBClient.get_ld_proxies.
+        """
+        requested, positions, starts, stops = self._edge_ranges(variant_ids)
+        # r² is sorted descending within each variant's edges, so those at or above the threshold are a prefix
+        for i, (start, stop) in enumerate(zip(starts, stops)):
+            stops[i] = start + np.searchsorted(-(self.r[start:stop] ** 2), -rsquared_threshold, side="right")
+        variants, edges = self._gather(positions, starts, stops)
+        # A pair of two requested variants is found from both ends: keep it from its lead variant only
+        keep = self.forward[edges] | ~np.isin(self.neighbour_ids[edges], requested)
+        return self._ld_rows(variants[keep], edges[keep])
+
+    def matrix(self, variant_ids: Iterable[int]) -> list[tuple]:
+        """The ld rows with both variants in variant_ids, as tuples like LdDBClient.get_ld_matrix."""
+        return self._ld_rows(*self._matrix_edges(variant_ids))
+
+    def matrix_arrays(self, variant_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The lead variant ids, proxy variant ids and r of the rows of matrix(variant_ids), as arrays."""
+        variants, edges = self._matrix_edges(variant_ids)
+        return variants, self.neighbour_ids[edges], self.r[edges]
+
+    def _matrix_edges(self, variant_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        requested, positions, starts, stops = self._edge_ranges(variant_ids)
+        variants, edges = self._gather(positions, starts, stops)
+        # Every pair of requested variants is found from both ends: the forward edge is its lead end
+        keep = self.forward[edges] & np.isin(self.neighbour_ids[edges], requested)
+        return variants[keep], edges[keep]
+
+    def _edge_ranges(self, variant_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """The requested variant ids, and the position and edge range of those with LD pairs."""
+        requested = np.unique(np.fromiter(variant_ids, dtype=np.int64))
+        positions = np.searchsorted(self.variant_ids, requested)
+        found = positions < len(self.variant_ids)
+        found[found] = self.variant_ids[positions[found]] == requested[found]
+        positions = positions[found]
+        return requested, positions, np.array(self.indptr[positions]), np.array(self.indptr[positions + 1])
+
+    def _gather(self, positions: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The variant id and position of every edge in the ranges starts[i]:stops[i], in one vectorised step."""
+        lengths = stops - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        edges = offsets + np.arange(lengths.sum())
+        variants = np.repeat(self.variant_ids[positions], lengths)
+        return variants, edges
+
+    def _ld_rows(self, variants: np.ndarray, edges: np.ndarray) -> list[tuple]:
+        forward = self.forward[edges]
+        neighbours = self.neighbour_ids[edges]
+        leads = np.where(forward, variants, neighbours)
+        proxies = np.where(forward, neighbours, variants)
+        return list(zip(leads.tolist(), proxies.tolist(), self.ld_block_ids[edges].tolist(), self.r[edges].tolist()))
+
+
+def get_ld_index_dir() -> str:
+    return settings.LD_INDEX_DIR or os.path.join(os.path.dirname(settings.LD_DB_PATH), "ld_index")
+
+
+def get_ld_index_path(release: str) -> str:
+    return os.path.join(get_ld_index_dir(), f"ld_index_{release}")
+
+
+def materialize_ld_index() -> str:
+    """
+    Write the LdIndex of the current data release next to the LD database as a directory of .npy arrays,
+    which get_ld_index memory maps. Edges are streamed from DuckDB already in CSR order, so memory use is
+    bounded by settings.STREAM_BATCH_SIZE however large the ld table is. Indexes of other releases are removed.
+    Returns the directory written.
+    """
+    release = get_data_release().version
+    path = get_ld_index_path(release)
+    partial_path = f"{path}.partial"
+    shutil.rmtree(partial_path, ignore_errors=True)
+    os.makedirs(partial_path)
+
+    db = LdDBClient()
+    counts = db.get_ld_edge_counts()
+    indptr = np.zeros(len(counts["variant_id"]) + 1, dtype=np.int64)
+    np.cumsum(counts["num_edges"], out=indptr[1:])
+    np.save(os.path.join(partial_path, "variant_id.npy"), np.asarray(counts["variant_id"], dtype=np.int64))
+    np.save(os.path.join(partial_path, "indptr.npy"), indptr)
+
+    arrays = {
+        name: np.lib.format.open_memmap(
+            os.path.join(partial_path, f"{name}.npy"), mode="w+", dtype=dtype, shape=(int(indptr[-1]),)
+        )
+        for name, dtype in LD_EDGE_DTYPES.items()
+    }
+    offset = 0
+    for batch in db.stream_ld_edges():
+        for name, array in arrays.items():
+            array[offset : offset + batch.num_rows] = batch.column(name).to_numpy(zero_copy_only=False)
+        offset += batch.num_rows
+    for array in arrays.values():
+        array.flush()
+    if offset != indptr[-1]:
+        raise RuntimeError(f"Expected {indptr[-1]} LD edges, read {offset}")
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(partial_path, path)
+    logger.info(f"Wrote LD index with {offset} edges for release {release} to {path}")
+
+    for other_path in glob.glob(os.path.join(get_ld_index_dir(), "ld_index_*")):
+        if other_path != path:
+            shutil.rmtree(other_path, ignore_errors=True)
+
+    clear_ld_index()
+    return path
+
+
+def get_ld_index() -> Optional[LdIndex]:
+    """
+    The LdIndex of the current data release (see get_release_cached), memory mapping the arrays written by
+    materialize_ld_index, or None if it has not been materialised, in which case LD lookups query the ld table.
+    """
+    return get_release_cached("ld_index", _load_ld_index)
+
+
+def _load_ld_index(release: str) -> Optional[LdIndex]:
+    path = get_ld_index_path(release)
+    if not os.path.isdir(path):
+        return None
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in ("variant_id", "indptr", *LD_EDGE_DTYPES)
+    }
+    index = LdIndex(arrays)
+    logger.info(f"Loaded LD index with {len(index)} edges for release {release}")
+    return index
+
+
+def clear_ld_index():
+    clear_release_cache("ld_index")
@@ -0,0 +1,90 @@
+import io
+from typing import List, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from app.db.ld_db import LdDBClient
+from app.logging_config import get_logger
+from app.models.schemas import LdMatrixDtype, LdMatrixFormat, ResponseFormat
+from app.services.columnar_format import serialize_arrow_table
+from app.services.ld_index import get_ld_index
+
+logger = get_logger(__name__)
+
+LD_MATRIX_MEDIA_TYPES = {
+    LdMatrixFormat.npz: "application/octet-stream",
+    LdMatrixFormat.arrow: "application/vnd.apache.arrow.stream",
+}
+
+LD_MATRIX_FILE_EXTENSIONS = {
+    LdMatrixFormat.npz: "npz",
+    LdMatrixFormat.arrow: "arrows",
+}
+
+
+class LdService:
+    """LD proxy and matrix lookups, from the memory mapped LdIndex when materialised, otherwise the ld table."""
+
+    def __init__(self):
+        self.ld_db = LdDBClient()
+
+    def get_ld_proxies(self, variant_ids: List[int], rsquared_threshold: float = 0.8) -> list[tuple]:
+        if not variant_ids:
+            return []
+        ld_index = get_ld_index()
+        if ld_index is None:
+            return self.ld_db.get_ld_proxies(variant_ids, rsquared_threshold)
+        return ld_index.proxies(variant_ids, rsquared_threshold)
+
+    def get_ld_matrix(self, variant_ids: List[int]) -> list[tuple]:
+        if not variant_ids:
+            return []
+        ld_index = get_ld_index()
+        if ld_index is None:
+            return self.ld_db.get_ld_matrix(variant_ids)
+        return ld_index.matrix(variant_ids)
+
+    def get_dense_ld_matrix(
+        self, variant_ids: List[int], dtype: LdMatrixDtype = LdMatrixDtype.float32
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The LD of variant_ids as (ordered variant ids, square matrix of r in dtype), with the variant ids in
+        request order without duplicates. The diagonal is 1 and pairs missing from the LD store are NaN.
+        The matrix is filled in one vectorised scatter from the pair arrays, with no per-pair objects.
+        """
+        variant_ids = np.array(list(dict.fromkeys(variant_ids)), dtype=np.int64)
+        ld_index = get_ld_index()
+        if ld_index is None:
+            rows = self.ld_db.get_ld_matrix(variant_ids.tolist())
+            leads = np.array([row[0] for row in rows], dtype=np.int64)
+            proxies = np.array([row[1] for row in rows], dtype=np.int64)
+            r = np.array([row[3] for row in rows], dtype=np.float64)
+        else:
+            leads, proxies, r = ld_index.matrix_arrays(variant_ids)
+
+        order = np.argsort(variant_ids)
+        lead_positions = order[np.searchsorted(variant_ids, leads, sorter=order)]
+        proxy_positions = order[np.searchsorted(variant_ids, proxies, sorter=order)]
+
+        matrix = np.full((len(variant_ids), len(variant_ids)), np.nan, dtype=dtype.value)
+        np.fill_diagonal(matrix, 1)
+        matrix[lead_positions, proxy_positions] = r
+        matrix[proxy_positions, lead_positions] = r
+        return variant_ids, matrix
+
+
+def serialize_ld_matrix(variant_ids: np.ndarray, matrix: np.ndarray, response_format: LdMatrixFormat) -> bytes:
+    """
+    Serialise a dense LD matrix with its variant ids as a NumPy .npz archive of variant_ids and r
+    (numpy.load, RcppCNPy / reticulate), or an Arrow IPC stream with one row per variant: variant_id and
+    its row of the matrix as a fixed size list r.
+    """
+    if response_format == LdMatrixFormat.npz:
+        buffer = io.BytesIO()
+        np.savez(buffer, variant_ids=variant_ids, r=matrix)
+        return buffer.getvalue()
+    if response_format == LdMatrixFormat.arrow:
+        rows = pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), len(variant_ids))
+        return serialize_arrow_table(pa.table({"variant_id": variant_ids, "r": rows}), ResponseFormat.arrow)
+    raise ValueError(f"{response_format.value} is not a binary LD matrix format")
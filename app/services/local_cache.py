@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.db.redis import RedisClient
+from app.logging_config import get_logger
+from app.models.schemas import Singleton
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+MISSING = object()
+
+
+class LocalCache(metaclass=Singleton):
+    """
+    In-process LRU cache with a TTL, used by redis_cache(local=True) in front of Redis for hot read models.
+
+    Values are stored as the validated objects redis_cache returns, so a hit costs neither a Redis
+    round trip nor a json.loads + model_validate. Callers must treat returned values as read-only.
+    Entries are dropped when /v1/internal/clear-cache/* runs in any worker, via a Redis pub/sub channel.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None):
+        self.max_entries = max_entries or settings.LOCAL_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.LOCAL_CACHE_TTL_SECONDS
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drop entries whose key starts with prefix, or every entry when no prefix is given."""
+        with self._lock:
+            if prefix is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if key.startswith(f"{prefix}:")]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += 1
+            return len(keys)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "listening": self._listener is not None and self._listener.is_alive(),
+            }
+
+    def start_invalidation_listener(self):
+        """Start a daemon thread that applies invalidations published by other workers."""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._listener = threading.Thread(target=self._listen, name="local-cache-invalidation", daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        redis_client = RedisClient()
+        while True:
+            try:
+                pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(redis_client.cache_invalidation_channel)
+                # Invalidations published while we were not subscribed are lost, so start from empty
+                self.invalidate()
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        prefix = message["data"] or None
+                        cleared = self.invalidate(prefix)
+                        logger.info(f"Cleared {cleared} local cache entries for {prefix or 'all prefixes'}")
+            except Exception as e:
+                logger.warning(f"Local cache invalidation listener disconnected, retrying: {e}")
+                time.sleep(5)
+
+
+def invalidate_cache_prefix(prefix: str):
+    """Clear prefix from this worker's local cache and tell every other worker to do the same."""
+    LocalCache().invalidate(prefix)
+    try:
+        RedisClient().redis.publish(RedisClient().cache_invalidation_channel, prefix)
+    except Exception as e:
+        logger.error(f"Failed to publish local cache invalidation for {prefix}: {e}")
@@ -0,0 +1,70 @@
+from typing import Callable, Iterable, Tuple
+
+import numpy as np
+
+from app.db.data_release import clear_release_cache, get_release_cached
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RangeIndex:
+    """
+    Maps ids to the named [start, stop] range that contains them, e.g. variant ids to the
+    associations_full table (associations_metadata) holding them.
+
+    Ranges are sorted by start once, and ids are routed in one batched numpy searchsorted, so splitting n ids
+    across m ranges is O(n log m) rather than a scan of every range per id. Ranges are expected not to overlap;
+    if they do, an id is routed to the range with the greatest start at or below it.
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[int, int, str]]):
+        ranges = sorted(ranges, key=lambda r: r[0])
+        self.starts = np.array([start for start, _, _ in ranges], dtype=np.int64)
+        self.stops = np.array([stop for _, stop, _ in ranges], dtype=np.int64)
+        self.names = [name for _, _, name in ranges]
+        if len(ranges) > 1 and np.any(self.starts[1:] <= self.stops[:-1]):
+            logger.warning(f"RangeIndex ranges overlap: {self.names}")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, ids: Iterable[int]) -> np.ndarray:
+        """Return the position in self.names of the range containing each id, or -1 where none does."""
+        ids = np.fromiter(ids, dtype=np.int64)
+        positions = np.searchsorted(self.starts, ids, side="right") - 1
+        if len(self.names) == 0:
+            return np.full(len(ids), -1)
+        in_range = (positions >= 0) & (ids <= self.stops[positions.clip(min=0)])
+        return np.where(in_range, positions, -1)
+
+    def split(self, ids: Iterable[int]) -> dict[str, list[int]]:
+        """
+        Group ids by the range containing them, as {name: sorted ids} with every range present.
+        Ids outside all ranges are dropped.
+        """
+        ids = np.unique(np.fromiter(ids, dtype=np.int64))
+        positions = self.lookup(ids)
+        return {name: ids[positions == position].tolist() for position, name in enumerate(self.names)}
+
+
+_range_index_names: set[str] = set()
+
+
+def get_range_index(name: str, load_ranges: Callable[[], Iterable[Tuple[int, int, str]]]) -> RangeIndex:
+    """The RangeIndex called name, built from load_ranges() once per data release (see get_release_cached)."""
+    _range_index_names.add(name)
+    return get_release_cached(f"range_index:{name}", lambda release: _build_range_index(name, load_ranges, release))
+
+
+def _build_range_index(
+    name: str, load_ranges: Callable[[], Iterable[Tuple[int, int, str]]], release: str
+) -> RangeIndex:
+    index = RangeIndex(load_ranges())
+    logger.info(f"Built {name} range index with {len(index)} ranges for release {release}")
+    return index
+
+
+def clear_range_indexes():
+    for name in list(_range_index_names):
+        clear_release_cache(f"range_index:{name}")
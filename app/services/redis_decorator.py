@@ -1,30 +1,174 @@
+from concurrent.futures import Future
+from fastapi import Request, Response
 from pydantic import BaseModel
-from typing import Callable
+from typing import Callable, Optional, Tuple
 from functools import wraps
+import copy
 import json
 import hashlib
+import threading
+import time
+from app.config import get_settings
 from app.logging_config import get_logger
 from app.db.redis import RedisClient
+from app.middleware.conditional_requests import etag_matches
+from app.services.cache_namespace import get_cache_namespace, register_cache_prefix
+from app.services.local_cache import MISSING, LocalCache
 
 logger = get_logger(__name__)
+settings = get_settings()
 
+_FROM_CACHE = object()
 
-def redis_cache(expire: int = 0, prefix: str = "db_cache", model_class: BaseModel = None):
+_in_flight: dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+_single_flight_metrics = {
+    "computed": 0,
+    "coalesced_in_process": 0,
+    "coalesced_across_workers": 0,
+    "lock_wait_timeouts": 0,
+    "locks_lost": 0,
+}
+_single_flight_metrics_lock = threading.Lock()
+
+
+def _record(metric: str):
+    with _single_flight_metrics_lock:
+        _single_flight_metrics[metric] += 1
+
+
+def get_single_flight_metrics() -> dict:
+    with _single_flight_metrics_lock:
+        metrics = dict(_single_flight_metrics)
+    with _in_flight_lock:
+        metrics["in_flight"] = len(_in_flight)
+    return metrics
+
+
+class CachedResponse:
+    """
+    A cached result kept as its serialized JSON body, so it can be returned without building the model.
+    The body is exactly what redis_cache stores in Redis (model_dump_json), i.e. the same JSON the
+    endpoint's response_model would produce.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+    def to_response(self, request: Request, headers: dict = None) -> Response:
+        """Return the body as a JSON response, or 304 Not Modified if the client already has it."""
+        headers = {**(headers or {}), "ETag": self.etag}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def _compute_under_lock(
+    redis_client: RedisClient, cache_key: str, compute: Callable[[Optional[Tuple[str, int]]], tuple]
+) -> tuple:
+    """
+    Compute the value for cache_key while holding a Redis lock, so only one worker computes it.
+    Workers that find the lock taken poll for the cached value instead, returning (_FROM_CACHE, cached_data).
+    If Redis is unavailable, or the lock holder takes longer than CACHE_LOCK_WAIT_SECONDS,
+    the value is computed without the lock. compute is passed the (lock_key, token) held, or None.
+    """
+    lock_key = f"lock:{cache_key}"
+    ttl_ms = int(settings.CACHE_LOCK_TTL_SECONDS * 1000)
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_SECONDS
+
+    while True:
+        try:
+            token = redis_client.acquire_lock(lock_key, ttl_ms)
+        except Exception as e:
+            logger.warning(f"Redis lock failed for {cache_key}, computing without it: {e}")
+            return compute(None)
+
+        if token is not None:
+            try:
+                return compute((lock_key, token))
+            finally:
+                try:
+                    redis_client.release_lock(lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Redis lock release failed for {cache_key}: {e}")
+
+        while time.monotonic() < deadline:
+            time.sleep(settings.CACHE_LOCK_POLL_INTERVAL_SECONDS)
+            try:
+                cached_data = redis_client.get_cached_data(cache_key)
+                if cached_data is not None:
+                    _record("coalesced_across_workers")
+                    return _FROM_CACHE, cached_data
+                if not redis_client.lock_is_held(lock_key):
+                    break
+            except Exception as e:
+                logger.warning(f"Redis poll failed for {cache_key}: {e}")
+                break
+        else:
+            _record("lock_wait_timeouts")
+            logger.warning(f"Timed out waiting for another worker to cache {cache_key}, computing it here")
+            return compute(None)
+
+
+def redis_cache(expire: int = 0, prefix: str = "db_cache", model_class: BaseModel = None, local: bool = False):
     """
     Redis caching decorator for database methods.
 
+    On a cache miss only one caller computes the value (single-flight): concurrent callers in
+    this process wait for its result, and callers in other workers wait for the key to appear in Redis.
+
     Args:
         expire: Cache expiration time in seconds (default: 0 = never expire)
-        prefix: Key prefix for Redis cache keys
+        prefix: Key prefix for Redis cache keys, which are {prefix}:{namespace}:{function name}[:{id}]
+            (see app.services.cache_namespace)
         model_class: Pydantic model class to cache
+        local: Also keep the result in this process's LocalCache, in front of Redis. Use for hot,
+            read-only results; callers share the returned object.
+
+    Call the decorated method with as_response=True to get a CachedResponse holding the serialized
+    body instead of the model, which skips model_validate on a hit. Endpoints can return it directly
+    with CachedResponse.to_response.
     """
 
+    register_cache_prefix(prefix)
+
     def decorator(func: Callable) -> Callable:
+        def load(cache_key: str, cached_data):
+            value = model_class.model_validate(cached_data) if model_class is not None else cached_data
+            if local:
+                LocalCache().set(cache_key, value)
+            return value
+
+        def get_cached_response(redis_client: RedisClient, cache_key: str, get_value: Callable) -> CachedResponse:
+            response_key = f"{cache_key}:response"
+            if local:
+                cached_response = LocalCache().get(response_key)
+                if cached_response is not MISSING:
+                    return cached_response
+
+            body = None
+            try:
+                body = redis_client.get_cached_body(cache_key)
+            except Exception as e:
+                logger.warning(f"Redis cache get failed for {cache_key}: {e}")
+
+            if body is None:
+                value = get_value()
+                body = value.model_dump_json() if model_class is not None else json.dumps(value)
+
+            cached_response = CachedResponse(body.encode() if isinstance(body, str) else body)
+            if local:
+                LocalCache().set(response_key, cached_response)
+            return cached_response
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             redis_client = RedisClient()
-            cache_key = f"{prefix}:{func.__name__}"
+            cache_key = f"{prefix}:{get_cache_namespace(redis_client)}:{func.__name__}"
             cache_id = kwargs.pop("cache_id", None)
+            as_response = kwargs.pop("as_response", False)
 
             if cache_id:
                 cache_key = f"{cache_key}:{cache_id}"
@@ -34,30 +178,78 @@ def redis_cache(expire: int = 0, prefix: str = "db_cache", model_class: BaseMode
                 key_hash = hashlib.md5(f"{args_str}:{kwargs_str}".encode()).hexdigest()[:8]
                 cache_key = f"{cache_key}:{key_hash}"
 
+            if as_response:
+                if cache_id:
+                    kwargs["cache_id"] = cache_id
+                return get_cached_response(redis_client, cache_key, lambda: wrapper(self, *args, **kwargs))
+
+            if local:
+                value = LocalCache().get(cache_key)
+                if value is not MISSING:
+                    return value
+
             try:
                 cached_data = redis_client.get_cached_data(cache_key)
                 if cached_data is not None:
                     logger.debug(f"Cache hit for {cache_key}")
-                    if model_class is not None:
-                        return model_class.model_validate(cached_data)
-                    else:
-                        return cached_data
+                    return load(cache_key, cached_data)
             except Exception as e:
                 logger.warning(f"Redis cache get failed for {cache_key}: {e}")
 
-            try:
+            with _in_flight_lock:
+                future = _in_flight.get(cache_key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    _in_flight[cache_key] = future
+
+            if not leader:
+                _record("coalesced_in_process")
+                logger.debug(f"Waiting for in-flight computation of {cache_key}")
+                cached_data = future.result()
+                if local:
+                    value = LocalCache().get(cache_key)
+                    if value is not MISSING:
+                        return value
+                if isinstance(cached_data, str):
+                    cached_data = json.loads(cached_data)
+                elif model_class is None:
+                    cached_data = copy.deepcopy(cached_data)
+                return load(cache_key, cached_data)
+
+            def compute(lock: Optional[Tuple[str, int]]) -> tuple:
                 result = func(self, *args, **kwargs)
-                if model_class is not None:
-                    cached_data = result.model_dump_json()
+                _record("computed")
+                # Models are cached as their JSON (the response body); plain data is cached as is
+                cached_data = result.model_dump_json() if model_class is not None else result
+
+                if lock is None:
+                    redis_client.set_cached_data(cache_key, cached_data, expire)
+                    logger.debug(f"Set cached for {cache_key}")
+                elif redis_client.set_cached_data_if_lock_held(cache_key, cached_data, *lock, expire):
+                    logger.debug(f"Set cached for {cache_key}")
                 else:
-                    cached_data = json.dumps(result)
+                    _record("locks_lost")
+                    logger.warning(f"Lock for {cache_key} expired before the result was computed, not caching it")
+                return result, cached_data
 
-                redis_client.set_cached_data(cache_key, cached_data, expire)
-                logger.debug(f"Set cached for {cache_key}")
+            try:
+                result, cached_data = _compute_under_lock(redis_client, cache_key, compute)
+                if result is _FROM_CACHE:
+                    value = load(cache_key, cached_data)
+                    future.set_result(cached_data)
+                    return value
+                if local:
+                    LocalCache().set(cache_key, result)
+                future.set_result(cached_data)
                 return result
             except Exception as e:
+                future.set_exception(e)
                 logger.error(f"Function execution failed for {cache_key}: {e}")
                 raise
+            finally:
+                with _in_flight_lock:
+                    _in_flight.pop(cache_key, None)
 
         return wrapper
 
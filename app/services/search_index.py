@@ -0,0 +1,159 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from functools import reduce
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+
+from app.db.data_release import clear_release_cache, get_release_cached
+from app.logging_config import get_logger
+from app.models.schemas import SearchTerm
+
+logger = get_logger(__name__)
+
+RSID_PATTERN = re.compile(r"rs(\d+)")
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    Autocomplete over the gene and trait search terms (names, and Ensembl ids as alt_name) and rsids.
+
+    Term keys are kept lowercased and sorted, so the keys starting with a prefix are one contiguous range found by
+    binary search (the leaves under a trie node); text anywhere in a key is found by intersecting the trigram
+    posting lists of the query. Matches are ranked by num_coloc_groups then num_study_extractions, precomputed as a
+    rank per term, so picking the top k is a partition of the matching ranks rather than a sort of the matches.
+    rsids are stored as sorted numbers: the rsids starting with rs123 are the ranges [123, 124), [1230, 1240), ...
+    """
+
+    def __init__(self, search_terms: Sequence[SearchTerm], rsids: Mapping[str, np.ndarray]):
+        self.terms = list(search_terms)
+        self.order = np.array(
+            sorted(
+                range(len(self.terms)),
+                key=lambda position: (
+                    -(self.terms[position].num_coloc_groups or 0),
+                    -(self.terms[position].num_study_extractions or 0),
+                    len(self.terms[position].name),
+                    self.terms[position].name,
+                ),
+            ),
+            dtype=np.int64,
+        )
+        ranks = np.empty(len(self.terms), dtype=np.int64)
+        ranks[self.order] = np.arange(len(self.terms))
+
+        keys = sorted(
+            (key.strip().lower(), position)
+            for position, term in enumerate(self.terms)
+            for key in {term.name, term.alt_name}
+            if key
+        )
+        self.keys = [key for key, _ in keys]
+        self.key_ranks = ranks[np.array([position for _, position in keys], dtype=np.int64)]
+
+        postings = defaultdict(list)
+        for key_position, key in enumerate(self.keys):
+            for trigram in _trigrams(key):
+                postings[trigram].append(key_position)
+        self.trigrams = {trigram: np.array(positions, dtype=np.int64) for trigram, positions in postings.items()}
+
+        rsid_order = np.argsort(rsids["rsid"], kind="stable")
+        self.rsids = np.asarray(rsids["rsid"], dtype=np.int64)[rsid_order]
+        self.rsid_variant_ids = np.asarray(rsids["id"], dtype=np.int64)[rsid_order]
+        self.max_rsid_digits = len(str(self.rsids[-1])) if len(self.rsids) else 0
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self.rsids)
+
+    def suggest(self, query: str, limit: int = 10) -> list[SearchTerm]:
+        """The top limit search terms for query: rsids starting with it, then terms starting with it, then terms containing it."""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        suggestions = []
+        rsid = RSID_PATTERN.fullmatch(query)
+        if rsid:
+            suggestions.extend(self._rsids_starting_with(rsid.group(1), limit))
+
+        ranks = self._ranks_starting_with(query, limit - len(suggestions))
+        ranks += self._ranks_containing(query, limit - len(suggestions) - len(ranks), exclude=set(ranks))
+        suggestions.extend(self.terms[self.order[rank]] for rank in ranks)
+        return suggestions
+
+    def _ranks_starting_with(self, prefix: str, limit: int) -> list[int]:
+        if limit <= 0:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo)
+        ranks = self.key_ranks[lo:hi]
+        # A term has at most two keys, so its best rank is among the 2 * limit smallest
+        if len(ranks) > 2 * limit:
+            ranks = np.partition(ranks, 2 * limit)[: 2 * limit]
+        return np.unique(ranks)[:limit].tolist()
+
+    def _ranks_containing(self, text: str, limit: int, exclude: set[int]) -> list[int]:
+        if limit <= 0 or len(text) < 3:
+            return []
+        postings = [self.trigrams.get(trigram) for trigram in _trigrams(text)]
+        if any(posting is None for posting in postings):
+            return []
+        candidates = reduce(np.intersect1d, sorted(postings, key=len))
+        candidates = candidates[np.argsort(self.key_ranks[candidates], kind="stable")]
+
+        ranks = []
+        for key_position in candidates:
+            rank = int(self.key_ranks[key_position])
+            if rank in exclude or text not in self.keys[key_position]:
+                continue
+            exclude.add(rank)
+            ranks.append(rank)
+            if len(ranks) == limit:
+                break
+        return ranks
+
+    def _rsids_starting_with(self, digits: str, limit: int) -> list[SearchTerm]:
+        if digits.startswith("0"):
+            return []
+        number = int(digits)
+        suggestions = []
+        for extra_digits in range(self.max_rsid_digits - len(digits) + 1):
+            scale = 10**extra_digits
+            lo = np.searchsorted(self.rsids, number * scale, side="left")
+            hi = np.searchsorted(self.rsids, (number + 1) * scale, side="left")
+            for rsid, variant_id in zip(self.rsids[lo:hi], self.rsid_variant_ids[lo:hi]):
+                suggestions.append(SearchTerm(type="variant", name=f"rs{rsid}", type_id=int(variant_id)))
+                if len(suggestions) == limit:
+                    return suggestions
+        return suggestions
+
+
+def get_search_index(
+    load_search_terms: Callable[[], Sequence[SearchTerm]], load_rsids: Callable[[], Mapping[str, np.ndarray]]
+) -> SearchIndex:
+    """
+    The SearchIndex of the current data release, built from load_search_terms() and load_rsids()
+    (see get_release_cached).
+    """
+    return get_release_cached(
+        "search_index", lambda release: _build_search_index(load_search_terms, load_rsids, release)
+    )
+
+
+def _build_search_index(
+    load_search_terms: Callable[[], Sequence[SearchTerm]],
+    load_rsids: Callable[[], Mapping[str, np.ndarray]],
+    release: str,
+) -> SearchIndex:
+    index = SearchIndex(load_search_terms(), load_rsids())
+    logger.info(f"Built search index with {len(index)} keys for release {release}")
+    return index
+
+
+def clear_search_index():
+    clear_release_cache("search_index")
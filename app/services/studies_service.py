@@ -19,6 +19,11 @@ from app.db.redis import RedisClient
 from typing import Callable, List, Optional, TypeVar
 from app.logging_config import get_logger
 
+from app.services.entity_counts import NO_ENTITY_COUNTS, clear_entity_counts, get_entity_counts
+from app.services.interval_index import clear_genomic_index
+from app.services.search_index import SearchIndex, clear_search_index, get_search_index
+from app.services.variant_positions import clear_variant_position_index
+from app.services.local_cache import invalidate_cache_prefix
 from app.services.redis_decorator import redis_cache
 
 T = TypeVar("T")
@@ -122,7 +127,7 @@ class StudiesService(metaclass=Singleton):
         merged = list(study_extractions or []) + extra
         return StudiesService.deduplicate_by_key(merged, lambda e: e.id)
 
-    @redis_cache(prefix=studies_db_cache_prefix, model_class=SearchTerms)
+    @redis_cache(prefix=studies_db_cache_prefix, model_class=SearchTerms, local=True)
     def get_search_terms(self) -> SearchTerms:
         """
         Retrieve trait and gene names for search from DuckDB with caching.
@@ -130,24 +135,7 @@ class StudiesService(metaclass=Singleton):
             List of tuples containing (study_name, trait)
         """
 
-        num_coloc_groups_per_gene = self.db.get_num_coloc_groups_per_gene()
-        num_coloc_groups_per_gene = {
-            gene_id: num_coloc_groups for gene_id, num_coloc_groups in num_coloc_groups_per_gene
-        }
-
-        num_coloc_studies_per_gene = self.db.get_num_coloc_studies_per_gene()
-        num_coloc_studies_per_gene = {
-            gene_id: num_coloc_studies for gene_id, num_coloc_studies in num_coloc_studies_per_gene
-        }
-
-        num_extractions_per_gene = self.db.get_num_study_extractions_per_gene()
-        num_extractions_per_gene = {gene_id: num_extractions for gene_id, num_extractions in num_extractions_per_gene}
-
-        num_rare_results_per_gene = self.db.get_num_rare_results_per_gene()
-        num_rare_results_per_gene = {
-            gene_id: num_rare_results for gene_id, num_rare_results in num_rare_results_per_gene
-        }
-
+        gene_counts = get_entity_counts("genes")
         genes = self.db.get_gene_names()
         gene_search_terms = [
             SearchTerm(
@@ -157,34 +145,13 @@ class StudiesService(metaclass=Singleton):
                 type_id=gene[0],
                 sample_size=None,
                 ancestry=None,
-                num_study_extractions=num_extractions_per_gene.get(gene[0], 0),
-                num_coloc_groups=num_coloc_groups_per_gene.get(gene[0], 0),
-                num_coloc_studies=num_coloc_studies_per_gene.get(gene[0], 0),
-                num_rare_results=num_rare_results_per_gene.get(gene[0], 0),
+                **gene_counts.get(gene[0], NO_ENTITY_COUNTS)._asdict(),
             )
             for gene in genes
             if gene[0] is not None
         ]
 
-        num_extractions_per_study = self.db.get_num_study_extractions_per_study()
-        num_extractions_per_study = {
-            study_id: num_extractions for study_id, num_extractions in num_extractions_per_study
-        }
-
-        coloc_groups_per_trait = self.db.get_num_coloc_groups_per_trait()
-        num_coloc_groups_per_trait = {
-            trait_id: num_coloc_groups for trait_id, num_coloc_groups in coloc_groups_per_trait
-        }
-        coloc_studies_per_trait = self.db.get_num_coloc_studies_per_trait()
-        num_coloc_studies_per_trait = {
-            trait_id: num_coloc_studies for trait_id, num_coloc_studies in coloc_studies_per_trait
-        }
-
-        num_rare_results_per_study = self.db.get_num_rare_results_per_study()
-        num_rare_results_per_study = {
-            study_id: num_rare_results for study_id, num_rare_results in num_rare_results_per_study
-        }
-
+        trait_counts = get_entity_counts("traits")
         trait_search_terms = self.db.get_trait_names_for_search()
         trait_search_terms = [
             SearchTerm(
@@ -194,10 +161,7 @@ class StudiesService(metaclass=Singleton):
                 type_id=term[0],
                 sample_size=term[2],
                 ancestry=term[3],
-                num_study_extractions=num_extractions_per_study.get(term[0], 0),
-                num_coloc_groups=num_coloc_groups_per_trait.get(term[0], 0),
-                num_coloc_studies=num_coloc_studies_per_trait.get(term[0], 0),
-                num_rare_results=num_rare_results_per_study.get(term[0], 0),
+                **trait_counts.get(term[0], NO_ENTITY_COUNTS)._asdict(),
             )
             for term in trait_search_terms
             if term[1] is not None
@@ -205,7 +169,11 @@ class StudiesService(metaclass=Singleton):
 
         return SearchTerms(search_terms=gene_search_terms + trait_search_terms)
 
-    @redis_cache(prefix=studies_db_cache_prefix, model_class=GetTraitsResponse)
+    def get_search_index(self) -> SearchIndex:
+        """The autocomplete index over get_search_terms and rsids, built once per data release."""
+        return get_search_index(lambda: self.get_search_terms().search_terms, self.db.get_rsids)
+
+    @redis_cache(prefix=studies_db_cache_prefix, model_class=GetTraitsResponse, local=True)
     def get_traits(self) -> GetTraitsResponse:
         """
         Retrieve traits from DuckDB with caching.
@@ -213,24 +181,7 @@ class StudiesService(metaclass=Singleton):
             GetTraitsResponse instance
         """
         traits = self.db.get_traits()
-        num_extractions_per_study = self.db.get_num_study_extractions_per_study()
-        num_extractions_per_study = {
-            study_id: num_extractions for study_id, num_extractions in num_extractions_per_study
-        }
-
-        coloc_groups_per_trait = self.db.get_num_coloc_groups_per_trait()
-        num_coloc_groups_per_trait = {
-            trait_id: num_coloc_groups for trait_id, num_coloc_groups in coloc_groups_per_trait
-        }
-        coloc_studies_per_trait = self.db.get_num_coloc_studies_per_trait()
-        num_coloc_studies_per_trait = {
-            trait_id: num_coloc_studies for trait_id, num_coloc_studies in coloc_studies_per_trait
-        }
-
-        num_rare_results_per_study = self.db.get_num_rare_results_per_study()
-        num_rare_results_per_study = {
-            study_id: num_rare_results for study_id, num_rare_results in num_rare_results_per_study
-        }
+        trait_counts = get_entity_counts("traits")
         traits = [
             BasicTraitResponse(
                 id=trait[0],
@@ -244,16 +195,13 @@ class StudiesService(metaclass=Singleton):
                 ancestry=trait[8],
                 heritability=trait[9],
                 heritability_se=trait[10],
-                num_study_extractions=num_extractions_per_study.get(trait[0], 0),
-                num_coloc_groups=num_coloc_groups_per_trait.get(trait[0], 0),
-                num_coloc_studies=num_coloc_studies_per_trait.get(trait[0], 0),
-                num_rare_results=num_rare_results_per_study.get(trait[0], 0),
+                **trait_counts.get(trait[0], NO_ENTITY_COUNTS)._asdict(),
             )
             for trait in traits
         ]
         return GetTraitsResponse(traits=traits)
 
-    @redis_cache(prefix=studies_db_cache_prefix, model_class=GetGenesResponse)
+    @redis_cache(prefix=studies_db_cache_prefix, model_class=GetGenesResponse, local=True)
     def get_genes(self) -> GetGenesResponse:
         """
         Retrieve genes from DuckDB with caching.
@@ -262,23 +210,7 @@ class StudiesService(metaclass=Singleton):
         """
         genes = self.db.get_genes()
 
-        num_coloc_groups_per_gene = self.db.get_num_coloc_groups_per_gene()
-        num_coloc_groups_per_gene = {
-            gene_id: num_coloc_groups for gene_id, num_coloc_groups in num_coloc_groups_per_gene
-        }
-
-        num_coloc_studies_per_gene = self.db.get_num_coloc_studies_per_gene()
-        num_coloc_studies_per_gene = {
-            gene_id: num_coloc_studies for gene_id, num_coloc_studies in num_coloc_studies_per_gene
-        }
-
-        num_rare_results_per_gene = self.db.get_num_rare_results_per_gene()
-        num_rare_results_per_gene = {
-            gene_id: num_rare_results for gene_id, num_rare_results in num_rare_results_per_gene
-        }
-
-        num_extractions_per_gene = self.db.get_num_study_extractions_per_gene()
-        num_extractions_per_gene = {gene_id: num_extractions for gene_id, num_extractions in num_extractions_per_gene}
+        gene_counts = get_entity_counts("genes")
 
         genes = [
             ExtendedGene(
@@ -294,10 +226,7 @@ class StudiesService(metaclass=Singleton):
                 source=gene[9],
                 distinct_trait_categories=gene[10],
                 distinct_protein_coding_genes=gene[11],
-                num_study_extractions=num_extractions_per_gene.get(gene[0], 0),
-                num_coloc_groups=num_coloc_groups_per_gene.get(gene[0], 0),
-                num_coloc_studies=num_coloc_studies_per_gene.get(gene[0], 0),
-                num_rare_results=num_rare_results_per_gene.get(gene[0], 0),
+                **gene_counts.get(gene[2], NO_ENTITY_COUNTS)._asdict(),
             )
             for gene in genes
         ]
@@ -313,7 +242,7 @@ class StudiesService(metaclass=Singleton):
         genes = self.db.get_gene_names()
         return [SearchTerm(type="gene", name=gene[0], type_id=gene[0]) for gene in genes]
 
-    @redis_cache(prefix=studies_db_cache_prefix)
+    @redis_cache(prefix=studies_db_cache_prefix, local=True)
     def get_tissues(
         self,
     ) -> List[str]:
@@ -326,7 +255,7 @@ class StudiesService(metaclass=Singleton):
         tissues = [tissue[0] for tissue in tissues]
         return sorted(tissues)
 
-    @redis_cache(prefix=studies_db_cache_prefix, model_class=GPMapMetadata)
+    @redis_cache(prefix=studies_db_cache_prefix, model_class=GPMapMetadata, local=True)
     def get_gpmap_metadata(self) -> GPMapMetadata:
         """
         Retrieve study metadata from DuckDB with caching, grouped by data_type and variant_type.
@@ -359,14 +288,18 @@ class StudiesService(metaclass=Singleton):
     def clear_cache(self):
         """Clear studies Redis cache entries (use with caution)"""
         try:
-            keys = self.redis_client.redis.keys(f"{studies_db_cache_prefix}:*")
-            if keys:
-                self.redis_client.redis.delete(*keys)
-                logger.info(f"Cleared {len(keys)} cache keys")
+            cleared = self.redis_client.delete_keys_matching(f"{studies_db_cache_prefix}:*")
+            if cleared:
+                logger.info(f"Cleared {cleared} cache keys")
             else:
                 logger.info("No cache keys found to clear")
         except Exception as e:
             logger.error(f"Failed to clear studies Redis cache: {e}")
+        invalidate_cache_prefix(studies_db_cache_prefix)
+        clear_entity_counts()
+        clear_genomic_index()
+        clear_variant_position_index()
+        clear_search_index()
 
     def get_studies_by_trait_ids(self, trait_ids: List[int | str]) -> List[Study]:
         """
@@ -0,0 +1,158 @@
+import glob
+import os
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.db.data_release import clear_release_cache, get_data_release, get_release_cached
+from app.db.studies_db import StudiesDBClient
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+VARIANT_POSITIONS_DTYPE = np.dtype([("chr", np.int16), ("bp", np.int64), ("id", np.int64)])
+
+
+class GenomicRange(NamedTuple):
+    chr: int
+    start: int
+    stop: int
+
+    @classmethod
+    def parse(cls, grange: str) -> "GenomicRange":
+        """Parse chr:start-stop, raising ValueError if it is malformed or start > stop."""
+        chromosome, _, position = grange.partition(":")
+        start, _, stop = position.partition("-")
+        genomic_range = cls(int(chromosome), int(start), int(stop))
+        if genomic_range.start > genomic_range.stop:
+            raise ValueError(f"Range start {start} is after its end {stop}")
+        return genomic_range
+
+
+class VariantPage(NamedTuple):
+    variant_ids: list[int]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(bp: int, variant_id: int) -> str:
+    return f"{bp}:{variant_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    bp, _, variant_id = cursor.partition(":")
+    return int(bp), int(variant_id)
+
+
+class VariantPositionIndex:
+    """
+    Variant ids sorted by (chr, bp, id), so the variants in a genomic range are a contiguous slice found by
+    binary search. Pages continue from a cursor holding the (bp, id) of the last variant returned, which
+    stays valid however the page size changes.
+    """
+
+    def __init__(self, positions: np.ndarray):
+        self.positions = positions
+        self.bp = positions["bp"]
+        self.ids = positions["id"]
+        chromosomes = positions["chr"]
+        unique_chromosomes, first = np.unique(chromosomes, return_index=True)
+        last = np.append(first[1:], len(positions))
+        self._chromosomes = {
+            int(chromosome): (int(lo), int(hi)) for chromosome, lo, hi in zip(unique_chromosomes, first, last)
+        }
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def page(self, genomic_range: GenomicRange, limit: int, cursor: Optional[str] = None) -> VariantPage:
+        """Ids of up to limit variants in genomic_range after cursor, with the cursor of the next page if any."""
+        bounds = self._chromosomes.get(genomic_range.chr)
+        if bounds is None:
+            return VariantPage([], None)
+        lo, hi = bounds
+        bp = self.bp[lo:hi]
+        first = lo + int(np.searchsorted(bp, genomic_range.start, side="left"))
+        last = lo + int(np.searchsorted(bp, genomic_range.stop, side="right"))
+
+        if cursor is not None:
+            cursor_bp, cursor_id = decode_cursor(cursor)
+            same_bp_first = lo + int(np.searchsorted(bp, cursor_bp, side="left"))
+            same_bp_last = lo + int(np.searchsorted(bp, cursor_bp, side="right"))
+            after = same_bp_first + int(np.searchsorted(self.ids[same_bp_first:same_bp_last], cursor_id, side="right"))
+            first = max(first, after)
+
+        end = min(first + limit, last)
+        next_cursor = encode_cursor(int(self.bp[end - 1]), int(self.ids[end - 1])) if end < last else None
+        return VariantPage(self.ids[first:end].tolist(), next_cursor)
+
+
+def sort_variant_positions(chromosomes, bp, ids) -> np.ndarray:
+    positions = np.empty(len(ids), dtype=VARIANT_POSITIONS_DTYPE)
+    positions["chr"] = chromosomes
+    positions["bp"] = bp
+    positions["id"] = ids
+    return positions[np.lexsort((positions["id"], positions["bp"], positions["chr"]))]
+
+
+def get_variant_positions_dir() -> str:
+    return settings.VARIANT_POSITIONS_DIR or os.path.join(
+        os.path.dirname(settings.STUDIES_DB_PATH), "variant_positions"
+    )
+
+
+def get_variant_positions_path(release: str) -> str:
+    return os.path.join(get_variant_positions_dir(), f"variant_positions_{release}.npy")
+
+
+def _load_variant_positions_from_db() -> np.ndarray:
+    columns = StudiesDBClient().get_variant_positions()
+    return sort_variant_positions(columns["chr"], columns["bp"], columns["id"])
+
+
+def materialize_variant_positions() -> str:
+    """
+    Write the sorted variant positions of the current data release next to the studies database as a .npy
+    file, which get_variant_position_index memory maps instead of loading variant_annotations. Files for
+    other releases are removed. Returns the path written.
+    """
+    release = get_data_release().version
+    os.makedirs(get_variant_positions_dir(), exist_ok=True)
+    path = get_variant_positions_path(release)
+    partial_path = f"{path}.partial"
+    with open(partial_path, "wb") as f:
+        np.save(f, _load_variant_positions_from_db())
+    os.replace(partial_path, path)
+    logger.info(f"Wrote variant positions for release {release} to {path}")
+
+    for other_path in glob.glob(os.path.join(get_variant_positions_dir(), "variant_positions_*.npy")):
+        if other_path != path:
+            os.remove(other_path)
+
+    clear_variant_position_index()
+    return path
+
+
+def get_variant_position_index() -> VariantPositionIndex:
+    """
+    The VariantPositionIndex of the current data release (see get_release_cached), memory mapping the file
+    written by materialize_variant_positions, or sorting the positions from the studies database if it has
+    not been materialised.
+    """
+    return get_release_cached("variant_position_index", _load_variant_position_index)
+
+
+def _load_variant_position_index(release: str) -> VariantPositionIndex:
+    path = get_variant_positions_path(release)
+    if os.path.exists(path):
+        index = VariantPositionIndex(np.load(path, mmap_mode="r"))
+    else:
+        logger.warning(f"No variant positions file at {path}, loading positions from the studies database")
+        index = VariantPositionIndex(_load_variant_positions_from_db())
+    logger.info(f"Loaded variant position index with {len(index)} variants for release {release}")
+    return index
+
+
+def clear_variant_position_index():
+    clear_release_cache("variant_position_index")
@@ -0,0 +1,83 @@
+from collections import defaultdict
+from typing import Callable, Hashable, Iterable, TypeVar
+
+from app.db.studies_db import StudiesDBClient
+from app.logging_config import get_logger
+from app.models.schemas import (
+    ColocGroup,
+    ExtendedVariant,
+    Ld,
+    RareResult,
+    VariantSearchResponse,
+    convert_duckdb_to_pydantic_model,
+)
+from app.services.ld_service import LdService
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def group_by(items: Iterable[T], key: Callable[[T], Hashable]) -> dict[Hashable, list[T]]:
+    groups = defaultdict(list)
+    for item in items:
+        groups[key(item)].append(item)
+    return groups
+
+
+class VariantSearchService:
+    def __init__(self):
+        self.studies_db = StudiesDBClient()
+        self.ld_service = LdService()
+
+    def search(self, search_term: str, rsquared_threshold: float = 0.8) -> VariantSearchResponse:
+        """
+        Resolve search_term (an rsid or chr:bp prefix) to variants, expand them to their LD proxies at
+        rsquared_threshold, and attach the coloc groups, rare results and LD proxies of each variant.
+        Results are grouped by variant once, so assembly is linear in the number of rows rather than
+        variants x rows. Proxies without coloc groups are dropped, and the rest sorted by coloc count.
+        """
+        original_variants = []
+        if search_term.startswith("rs"):
+            original_variants = self.studies_db.get_variants(rsids=[search_term])
+        elif any(c.isdigit() for c in search_term) and ":" in search_term:
+            original_variants = self.studies_db.get_variants(variant_prefixes=[search_term])
+
+        if not original_variants:
+            return VariantSearchResponse(original_variants=[], proxy_variants=[])
+
+        original_variants = convert_duckdb_to_pydantic_model(ExtendedVariant, original_variants)
+        variant_ids = [variant.id for variant in original_variants]
+
+        proxies = self.ld_service.get_ld_proxies(variant_ids=variant_ids, rsquared_threshold=rsquared_threshold)
+        proxies = convert_duckdb_to_pydantic_model(Ld, proxies) if proxies else []
+        proxy_variant_ids = {proxy.lead_variant_id for proxy in proxies} | {proxy.proxy_variant_id for proxy in proxies}
+        proxy_variant_ids = list(proxy_variant_ids - set(variant_ids))
+
+        proxy_variants = self.studies_db.get_variants(variant_ids=proxy_variant_ids) if proxy_variant_ids else []
+        proxy_variants = convert_duckdb_to_pydantic_model(ExtendedVariant, proxy_variants) if proxy_variants else []
+
+        colocs = self.studies_db.get_colocs_for_variants(variant_ids=variant_ids + proxy_variant_ids)
+        colocs = convert_duckdb_to_pydantic_model(ColocGroup, colocs) if colocs else []
+        rare_results = self.studies_db.get_rare_results_for_variants(variant_ids=variant_ids)
+        rare_results = convert_duckdb_to_pydantic_model(RareResult, rare_results) if rare_results else []
+
+        colocs_by_variant = group_by(colocs, lambda coloc: coloc.variant_id)
+        rare_results_by_variant = group_by(rare_results, lambda rare_result: rare_result.variant_id)
+        proxies_by_variant = defaultdict(list)
+        for proxy in proxies:
+            proxies_by_variant[proxy.lead_variant_id].append(proxy)
+            if proxy.proxy_variant_id != proxy.lead_variant_id:
+                proxies_by_variant[proxy.proxy_variant_id].append(proxy)
+
+        for variant in original_variants + proxy_variants:
+            variant.coloc_groups = colocs_by_variant.get(variant.id, [])
+            variant.num_colocs = len({coloc.coloc_group_id for coloc in variant.coloc_groups})
+            variant.rare_results = rare_results_by_variant.get(variant.id, [])
+            variant.num_rare_results = len({rare_result.rare_result_group_id for rare_result in variant.rare_results})
+            variant.ld_proxies = proxies_by_variant.get(variant.id, [])
+
+        proxy_variants = [variant for variant in proxy_variants if variant.num_colocs > 0]
+        proxy_variants.sort(key=lambda x: x.num_colocs, reverse=True)
+
+        return VariantSearchResponse(original_variants=original_variants, proxy_variants=proxy_variants)
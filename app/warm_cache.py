@@ -0,0 +1,38 @@
+"""
+Rebuild the studies and associations-full caches in a new cache namespace and activate it when done
+(see app.services.cache_warmup), so requests never see a cold cache after a data update.
+
+Invoked from the host via docker exec, e.g. scripts/refresh_cache.sh
+"""
+
+import argparse
+import json
+import sys
+
+from app.logging_config import get_logger
+from app.services.cache_warmup import CacheWarmupInProgressError, warm_cache
+
+logger = get_logger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trait-ids", type=int, nargs="*", help="Traits to warm, instead of the most used ones")
+    parser.add_argument("--workers", type=int, help="Worker threads (default CACHE_WARMUP_WORKERS)")
+    args = parser.parse_args()
+
+    try:
+        report = warm_cache(trait_ids=args.trait_ids, max_workers=args.workers)
+    except CacheWarmupInProgressError as exc:
+        logger.warning(str(exc))
+        return 1
+    except Exception as exc:
+        logger.error(f"Cache warm-up failed: {exc}")
+        return 1
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["activated"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Compare fetching associations for a trait's (variant_id, study_id) coloc pairs with independent
+variant_id IN / study_id IN filters (the previous query, which returns the cross product) against joining
+on both columns, with the pairs bound as list parameters or as the registered Arrow table used by
+AssociationsDBClient.get_associations_by_snp_study_pairs.
+
+Run from the repository root, e.g. python -m scripts.benchmarks.associations_pairs --colocs 4000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import duckdb
+
+from app.db.associations_db import pairs_join_query, snp_study_pairs_table
+from app.db.utils import registered_arrow_table
+
+CROSS_PRODUCT_QUERY = """
+    SELECT * FROM associations WHERE variant_id IN (SELECT * FROM UNNEST(?)) AND study_id IN (SELECT * FROM UNNEST(?))
+"""
+
+LIST_PAIRS_JOIN_QUERY = """
+    SELECT associations.* FROM associations
+    JOIN (SELECT UNNEST(?) AS variant_id, UNNEST(?) AS study_id) AS pairs USING (variant_id, study_id)
+"""
+
+
+def profile(connection: duckdb.DuckDBPyConnection, profile_path: str, run) -> dict:
+    started = time.perf_counter()
+    rows = run()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with open(profile_path) as f:
+        profile = json.load(f)
+
+    def table_scan_output(node: dict) -> int:
+        own = node.get("operator_cardinality", 0) if node.get("operator_type") == "TABLE_SCAN" else 0
+        return own + sum(table_scan_output(child) for child in node.get("children", []))
+
+    return {
+        "ms": elapsed_ms,
+        "rows_scanned": profile["cumulative_rows_scanned"],
+        "scan_output": table_scan_output(profile),
+        "rows_returned": len(rows),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", type=int, default=20_000, help="Variants in the associations table")
+    parser.add_argument("--studies", type=int, default=200, help="Studies in the associations table")
+    parser.add_argument("--colocs", type=int, default=4000, help="Coloc (variant_id, study_id) pairs for the trait")
+    parser.add_argument("--trait-variants", type=int, default=1500, help="Distinct variants among the coloc pairs")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    trait_variants = random.sample(range(args.variants), args.trait_variants)
+    pairs = [(random.choice(trait_variants), random.randrange(args.studies)) for _ in range(args.colocs)]
+
+    connection = duckdb.connect()
+    connection.execute(
+        """
+        CREATE TABLE associations AS
+        SELECT v AS variant_id, s AS study_id, random() AS beta, random() AS se, random() AS p
+        FROM range(?) t(v), range(?) u(s)
+        ORDER BY variant_id, study_id
+        """,
+        [args.variants, args.studies],
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = os.path.join(tmp, "profile.json")
+        connection.execute("PRAGMA enable_profiling='json'")
+        connection.execute(f"PRAGMA profiling_output='{profile_path}'")
+
+        pairs_table = snp_study_pairs_table(pairs)
+        variant_ids = pairs_table["variant_id"].to_pylist()
+        study_ids = pairs_table["study_id"].to_pylist()
+
+        def arrow_pairs_join():
+            with registered_arrow_table(connection, snp_study_pairs_table(pairs), "snp_study_pairs") as name:
+                return connection.execute(pairs_join_query("associations", name)).fetchall()
+
+        methods = {
+            "variant IN x study IN (previous)": lambda: connection.execute(
+                CROSS_PRODUCT_QUERY, [sorted(set(variant_ids)), sorted(set(study_ids))]
+            ).fetchall(),
+            "pair join, list parameters": lambda: connection.execute(
+                LIST_PAIRS_JOIN_QUERY, [variant_ids, study_ids]
+            ).fetchall(),
+            "pair join, Arrow table": arrow_pairs_join,
+        }
+        results = {name: profile(connection, profile_path, run) for name, run in methods.items()}
+
+    print(
+        f"{args.colocs} coloc pairs ({len(set(pairs))} distinct) over {args.variants} variants x "
+        f"{args.studies} studies ({args.variants * args.studies} association rows)"
+    )
+    print(f"{'query':<34} {'ms':>8} {'rows scanned':>14} {'scan output':>12} {'rows returned':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<34} {result['ms']:>8.1f} {result['rows_scanned']:>14} "
+            f"{result['scan_output']:>12} {result['rows_returned']:>14}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Compare Redis cache payload size and encode/decode time for plain JSON (the format used before
+app.db.cache_codec) against the compressed JSON and msgpack codecs.
+
+Run from the repository root, e.g. python -m scripts.benchmarks.cache_codec --rows 500000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.db.cache_codec import CODECS, FORMAT_JSON_ZSTD, FORMAT_MSGPACK_ZSTD
+
+
+def make_associations_full(num_rows: int) -> dict:
+    """A payload shaped like the associations_full_cache entries: column names plus rows of ids and floats."""
+    random.seed(0)
+    return {
+        "column_names": ["variant_id", "study_id", "beta", "se", "imputed", "p", "eaf"],
+        "rows": [
+            [
+                random.randint(1, 10_000_000),
+                random.randint(1, 6000),
+                random.gauss(0, 0.05),
+                random.uniform(0.001, 0.05),
+                random.random() < 0.1,
+                random.uniform(0, 1),
+                random.uniform(0, 1),
+            ]
+            for _ in range(num_rows)
+        ],
+    }
+
+
+def time_ms(func, repeat: int) -> tuple[float, object]:
+    result = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) * 1000 / repeat, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of association rows in the payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per codec")
+    args = parser.parse_args()
+
+    value = make_associations_full(args.rows)
+    json_text = json.dumps(value)
+    codecs = {
+        "json (current)": (lambda: json.dumps(value).encode(), lambda payload: json.loads(payload)),
+        "json + zstd": (
+            lambda: CODECS[FORMAT_JSON_ZSTD].encode(json.dumps(value)),
+            lambda payload: CODECS[FORMAT_JSON_ZSTD].decode(payload),
+        ),
+        "msgpack + zstd": (
+            lambda: CODECS[FORMAT_MSGPACK_ZSTD].encode(value),
+            lambda payload: CODECS[FORMAT_MSGPACK_ZSTD].decode(payload),
+        ),
+    }
+
+    print(f"{args.rows} rows, mean of {args.repeat} runs")
+    print(f"{'codec':<16} {'size MB':>10} {'ratio':>7} {'encode ms':>11} {'decode ms':>11}")
+    baseline_size = len(json_text.encode())
+    for name, (encode, decode) in codecs.items():
+        encode_ms, payload = time_ms(encode, args.repeat)
+        decode_ms, decoded = time_ms(lambda: decode(payload), args.repeat)
+        assert decoded == json.loads(json_text), f"{name} did not round trip"
+        print(
+            f"{name:<16} {len(payload) / 1e6:>10.2f} {baseline_size / len(payload):>6.1f}x "
+            f"{encode_ms:>11.1f} {decode_ms:>11.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Compare converting DuckDB rows to response models: validating one model per row (the previous
+convert_duckdb_to_pydantic_model), the direct-construction fast path, and column-oriented payloads.
+
+Run from the repository root, e.g. python -m scripts.benchmarks.duckdb_conversion --rows 200000
+"""
+
+import argparse
+import sys
+import time
+
+import duckdb
+
+from app.models.schemas import ColocGroup, convert_duckdb_to_columns, convert_duckdb_to_pydantic_model
+
+COLOC_GROUP_QUERY = """
+    SELECT
+        i AS coloc_group_id, i % 6000 AS study_id, i AS study_extraction_id, i * 7 AS variant_id,
+        i % 1700 AS ld_block_id, random() AS h4_connectedness, random() AS h3_connectedness,
+        1 + i % 22 AS chr, i * 13 AS bp, random() / 1e6 AS min_p, 'cis' AS cis_trans, '1:1-2' AS ld_block,
+        '1:' || i AS display_snp, 'rs' || i AS rsid, 'GENE' || (i % 20000) AS gene, i % 20000 AS gene_id,
+        i % 6000 AS trait_id, 'Trait ' || (i % 6000) AS trait_name, 'Category' AS trait_category,
+        'phenotype' AS data_type, NULL AS tissue, NULL AS cell_type, 1 AS source_id,
+        'OpenGWAS' AS source_name, 'https://opengwas.io' AS source_url
+    FROM range(?) t(i)
+"""
+
+
+def convert_row_by_row(model, results):
+    """convert_duckdb_to_pydantic_model as it was: validate one model per row."""
+    converted = []
+    for row in results:
+        if row and not all(v is None for v in row):
+            converted.append(model(**{field: row[idx] for idx, field in enumerate(model.model_fields.keys())}))
+        else:
+            converted.append(None)
+    return converted
+
+
+def time_ms(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of coloc group rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per method")
+    args = parser.parse_args()
+
+    connection = duckdb.connect()
+    rows = connection.execute(COLOC_GROUP_QUERY, [args.rows]).fetchall()
+    assert convert_row_by_row(ColocGroup, rows[:100]) == convert_duckdb_to_pydantic_model(ColocGroup, rows[:100])
+
+    methods = {
+        "validate per row (previous)": lambda: [m.model_dump() for m in convert_row_by_row(ColocGroup, rows)],
+        "fast path": lambda: [m.model_dump() for m in convert_duckdb_to_pydantic_model(ColocGroup, rows)],
+        "columns from rows": lambda: convert_duckdb_to_columns(ColocGroup, rows),
+        "columns from fetchnumpy": lambda: {
+            name: column.tolist()
+            for name, column in connection.execute(COLOC_GROUP_QUERY, [args.rows]).fetchnumpy().items()
+        },
+    }
+
+    print(f"{args.rows} ColocGroup rows to serialisable payload, mean of {args.repeat} runs")
+    for name, method in methods.items():
+        print(f"{name:<30} {time_ms(method, args.repeat):>10.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
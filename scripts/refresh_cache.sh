@@ -1,27 +1,24 @@
 #!/bin/bash
-set -e
+set -euo pipefail
 
-# curl -X POST "http://127.0.0.1:8000/v1/internal/clear-cache/studies"
-curl -X POST "http://127.0.0.1:8000/v1/internal/clear-cache/all"
-echo "All redis caches cleared"
+# Rebuilds the caches in a new namespace inside the API container and switches to it when complete,
+# so the previous caches keep serving until then. See app/warm_cache.py
+API_SERVICE_NAME="${GPMAP_API_SERVICE_NAME:-gpmap_api}"
 
-curl "http://127.0.0.1:8000/v1/info/gpmap_metadata" > /dev/null
-curl "http://127.0.0.1:8000/v1/search/options" > /dev/null
-curl "http://127.0.0.1:8000/v1/traits" > /dev/null
-curl "http://127.0.0.1:8000/v1/genes" > /dev/null
+API_CONTAINER="$(sudo docker ps -q -f "name=${API_SERVICE_NAME}" | head -n 1)"
+if [[ -z "$API_CONTAINER" ]]; then
+    echo "No running ${API_SERVICE_NAME} container found; cannot refresh caches."
+    exit 1
+fi
 
-# We don't need to set associations cache for all studies anymore, as we now use the new associations database
-trait_ids=(
-    928 1490 1633 1650 2012 2478 2523 2586 2589 2600 2609 2620 2790 3282 3497 4363 4766 4776 4777 937 1488 1492 1631
-    1637 1639 1980 1993 3717 3763 2379 2467 2479 2527 3162 3265 3374 4452 4532 21 100 932 938 1481 1627 1641 1982 1990
-    3748 3757 4050 2584 2601 2606 3217 4286 4365 4472 4503 4748 4759 131 924 1640 2008 3814 3962 2577 2647 2904 3143 3613
-    4141 4400 4765 24 920 1501 1629 1649 1992 1996 2002 3699 3992 2587 2599 2621 2625 3084 3133 3169 3342 3424 3584 930
-    1294 1984 1998 3775 2343 2617 2618 2906 3228 3599 4771 923 1480 1630 1642 2383 2384 2588 2624 3499 3516 4353 4772 168
-    1483 1652 1983 1991 1994 2590 3090 3241 4241 4763 931 935 1988 3680 3709 3827 3990 2340 2582 2598 2612 2644 3395 4233
-    132 918 933 939 1285 1653 1986 2009 2604 2615 3587 4143 4303 4760 4778 922 926 927 1284 1647 1981 2017
-)
+echo "Materialising entity counts in container ${API_CONTAINER}"
+sudo docker exec "$API_CONTAINER" python -m app.materialize_entity_counts
 
-for trait_id in "${trait_ids[@]}"; do
-    echo "Setting associations cache for: $trait_id"
-    curl "http://127.0.0.1:8000/v1/traits/$trait_id/associations-full" > /dev/null
-done
+echo "Materialising variant positions in container ${API_CONTAINER}"
+sudo docker exec "$API_CONTAINER" python -m app.materialize_variant_positions
+
+echo "Materialising LD index in container ${API_CONTAINER}"
+sudo docker exec "$API_CONTAINER" python -m app.materialize_ld_index
+
+echo "Warming caches in container ${API_CONTAINER}"
+sudo docker exec "$API_CONTAINER" python -m app.warm_cache
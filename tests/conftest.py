@@ -1,5 +1,6 @@
+import duckdb
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, PropertyMock, patch, AsyncMock
 from app.models.schemas import Singleton
 
 # Variant variant_id (string key in variant_data) used for coloc_pairs → study_extraction merge tests.
@@ -91,6 +92,25 @@ def snp_study_pairs_in_associations_full_db():
     }
 
 
+@pytest.fixture
+def duckdb_connection(request, mocker):
+    """
+    An in-memory DuckDB connection for DB client unit tests. Parametrise it indirectly with the SQL that
+    creates the test tables and the DB client connection properties it stands in for, e.g.
+
+        @pytest.mark.parametrize(
+            "duckdb_connection", [(SETUP_SQL, {StudiesDBClient: "studies_conn"})], indirect=True
+        )
+    """
+    setup_sql, connection_properties = request.param
+    connection = duckdb.connect()
+    connection.execute(setup_sql)
+    for client_class, name in connection_properties.items():
+        mocker.patch.object(client_class, name, new_callable=PropertyMock, return_value=connection)
+    yield connection
+    connection.close()
+
+
 @pytest.fixture(scope="module", autouse=True)
 def mock_redis():
     """Mock the underlying Redis connection so actual RedisClient code runs."""
@@ -99,6 +119,7 @@ def mock_redis():
     mock_redis_instance = Mock()
     mock_redis_instance.lpush.return_value = None
     mock_redis_instance.get.return_value = None
+    mock_redis_instance.mget.return_value = [None, None]
     mock_redis_instance.set.return_value = None
     mock_redis_instance.delete.return_value = None
     mock_redis_instance.rpop.return_value = None
@@ -111,7 +132,7 @@ def mock_redis():
     mock_redis_instance.zremrangebyscore.return_value = None
     mock_redis_instance.zrange.return_value = []
     mock_redis_instance.zcount.return_value = 0
-    mock_redis_instance.keys.return_value = []
+    mock_redis_instance.scan_iter.return_value = []
 
     # Patch redis.Redis so when RedisClient creates it, it gets our mock
     with patch("app.db.redis.Redis", return_value=mock_redis_instance):
@@ -128,10 +149,15 @@ def mock_redis_cache():
 
     mock_redis_client = Mock()
     mock_redis_client.get_cached_data.return_value = None
+    mock_redis_client.get_cached_body.return_value = None
     mock_redis_client.set_cached_data.return_value = None
+    mock_redis_client.set_cached_data_if_lock_held.return_value = True
+    mock_redis_client.acquire_lock.return_value = 1
+    mock_redis_client.lock_is_held.return_value = True
+    mock_redis_client.release_lock.return_value = True
+    mock_redis_client.get_cache_namespace.return_value = None
+    mock_redis_client.delete_keys_matching.return_value = 0
     mock_redis_client.redis = Mock()
-    mock_redis_client.redis.keys.return_value = []
-    mock_redis_client.redis.delete.return_value = 0
 
     with (
         patch("app.services.redis_decorator.RedisClient", return_value=mock_redis_client),
@@ -140,6 +166,17 @@ def mock_redis_cache():
         yield mock_redis_client
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Start every test with an empty in-process cache so results are not shared between tests"""
+    from app.services.cache_namespace import clear_cache_namespace
+    from app.services.local_cache import LocalCache
+
+    LocalCache().invalidate()
+    clear_cache_namespace()
+    yield
+
+
 @pytest.fixture(scope="module", autouse=True)
 def mock_email_service():
     """Mock Email Service for all tests - stubs all email operations"""
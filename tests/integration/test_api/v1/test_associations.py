@@ -1,6 +1,12 @@
+import json
+
+import pyarrow as pa
 from fastapi.testclient import TestClient
+from app.db.cache_codec import decode_cache_value, encode_cache_value
+from app.db.cursor_pool import CursorPoolTimeoutError
 from app.main import app
 from app.services.associations_service import AssociationsService
+from app.services.range_index import RangeIndex
 
 client = TestClient(app)
 
@@ -51,13 +57,15 @@ def test_get_associations_full_filters_studies_by_table(mocker):
 
 
 def test_get_associations_full_uses_trait_id_cache(mocker):
-    import json
-
     stored = {}
     mock_redis = mocker.patch("app.services.redis_decorator.RedisClient")
     redis_instance = mock_redis.return_value
-    redis_instance.get_cached_data.side_effect = lambda key: json.loads(stored[key]) if key in stored else None
-    redis_instance.set_cached_data.side_effect = lambda key, data, expire: stored.update({key: data})
+    redis_instance.get_cache_namespace.return_value = "release.3"
+    redis_instance.get_cached_data.side_effect = lambda key: decode_cache_value(stored.get(key))
+    redis_instance.acquire_lock.return_value = 1
+    redis_instance.set_cached_data_if_lock_held.side_effect = lambda key, data, lock_name, token, expire: stored.update(
+        {key: encode_cache_value(data)}
+    )
 
     trait_id = 926
     service = AssociationsService()
@@ -67,6 +75,67 @@ def test_get_associations_full_uses_trait_id_cache(mocker):
 
     assert result_first == result_second
     assert fetch.call_count == 1
-    assert redis_instance.set_cached_data.call_count == 1
+    assert redis_instance.set_cached_data_if_lock_held.call_count == 1
     assert redis_instance.get_cached_data.call_count == 2
-    assert f"associations_full_cache:_get_associations_full_cached:{trait_id}" in stored
+    assert f"associations_full_cache:release.3:_get_associations_full_cached:{trait_id}" in stored
+
+
+def test_get_associations_batch_returns_exactly_the_requested_pairs(snp_study_pairs_in_associations_db):
+    pairs = [
+        [variant_id, study_id]
+        for variant_id in snp_study_pairs_in_associations_db["snps"]
+        for study_id in snp_study_pairs_in_associations_db["studies"]
+    ]
+
+    response = client.post("v1/associations/batch", json={"pairs": pairs})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    associations = [json.loads(line) for line in response.text.splitlines()]
+    returned_pairs = {(a["variant_id"], a["study_id"]) for a in associations}
+    assert len(returned_pairs) > 0
+    assert returned_pairs <= {tuple(pair) for pair in pairs}
+
+
+def test_get_associations_batch_validates_pairs():
+    assert client.post("v1/associations/batch", json={"pairs": []}).status_code == 422
+    assert client.post("v1/associations/batch", json={"pairs": [[1]]}).status_code == 422
+
+
+def test_get_associations_batch_returns_503_when_no_cursor_is_free(mocker):
+    def stream(self, pairs):
+        raise CursorPoolTimeoutError("associations", 0)
+        yield
+
+    mocker.patch.object(AssociationsService, "stream_associations_by_snp_study_pairs", stream)
+
+    response = client.post("v1/associations/batch", json={"pairs": [[1, 10]]})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_stream_associations_by_pairs_falls_back_to_associations_full(mocker):
+    service = AssociationsService()
+    mocker.patch.object(
+        service.associations_db,
+        "stream_associations_by_snp_study_pairs",
+        return_value=iter([pa.record_batch({"variant_id": [1], "study_id": [10], "beta": [0.1]})]),
+    )
+    full_query = mocker.patch.object(
+        service.associations_full_db,
+        "stream_associations_by_snp_study_pairs",
+        side_effect=lambda table, pairs: iter([pa.record_batch({"variant_id": [pairs[0][0]], "study_id": [20]})]),
+    )
+    mocker.patch.object(
+        service,
+        "get_associations_full_index",
+        return_value=RangeIndex([(1, 100, "associations_full_1"), (101, 200, "associations_full_2")]),
+    )
+
+    batches = list(service.stream_associations_by_snp_study_pairs([(1, 10), (1, 10), (2, 20), (150, 20), (999, 20)]))
+
+    assert [batch.num_rows for batch in batches] == [1, 1, 1]
+    assert [call.args for call in full_query.call_args_list] == [
+        ("associations_full_1", [(2, 20)]),
+        ("associations_full_2", [(150, 20)]),
+    ]
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+ld_proxies_url = "/v1/ld/proxies?variant_ids=80732"
+
+
+def test_read_endpoints_send_validators():
+    response = client.get(ld_proxies_url)
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.headers["last-modified"]
+    assert "max-age" in response.headers["cache-control"]
+
+
+def test_matching_etag_returns_not_modified():
+    etag = client.get(ld_proxies_url).headers["etag"]
+
+    response = client.get(ld_proxies_url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_weak_etag_returns_not_modified():
+    etag = client.get(ld_proxies_url).headers["etag"]
+
+    response = client.get(ld_proxies_url, headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+
+def test_etag_differs_by_query():
+    etag = client.get(ld_proxies_url).headers["etag"]
+
+    response = client.get("/v1/ld/proxies?variant_ids=80717", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_if_modified_since_release_returns_not_modified():
+    last_modified = client.get(ld_proxies_url).headers["last-modified"]
+
+    response = client.get(ld_proxies_url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+def test_internal_endpoints_are_not_cached():
+    response = client.get("/v1/internal/db-executor")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
@@ -22,6 +22,16 @@ def test_get_genes():
         assert gene.num_rare_results is not None
 
 
+def test_get_genes_not_modified_with_matching_etag():
+    response = client.get("/v1/genes")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = client.get("/v1/genes", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_get_genes_with_coloc_groups(gene_coloc_pair_merge):
     m = gene_coloc_pair_merge
     response = client.get(
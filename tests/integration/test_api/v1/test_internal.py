@@ -186,3 +186,37 @@ def test_delete_gwas_success(mock_oci_service, mocker):
 
     assert response.status_code == 200
     assert f"Successfully deleted GWAS upload with GUID {guid} and all associated data" in response.json()["message"]
+
+
+def test_get_db_executor_metrics():
+    response = client.get("v1/internal/db-executor")
+    assert response.status_code == 200
+
+    metrics = response.json()
+    assert metrics["max_workers"] > 0
+    assert "queue_depth" in metrics
+    assert "avg_wait_ms" in metrics
+    assert metrics["shard_executor"]["max_workers"] > 0
+
+
+def test_get_db_cursor_pool_metrics():
+    client.get("v1/ld/proxies?variant_ids=80732")
+    response = client.get("v1/internal/db-cursor-pools")
+    assert response.status_code == 200
+
+    pools = response.json()
+    assert pools["ld"]["size"] > 0
+    assert pools["ld"]["created"] >= 1
+    assert "leaks_reclaimed" in pools["ld"]
+
+
+def test_get_db_settings():
+    response = client.get("v1/internal/db-settings")
+    assert response.status_code == 200
+
+    databases = response.json()
+    assert set(databases) == {"studies", "ld", "associations", "associations_full", "coloc_pairs"}
+    for database in databases.values():
+        assert database["configured"]["memory_limit"]
+        assert "memory_limit" in database["applied"]
+        assert "threads" in database["applied"]
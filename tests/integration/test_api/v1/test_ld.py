@@ -1,3 +1,7 @@
+import io
+
+import numpy as np
+import pyarrow as pa
 from fastapi.testclient import TestClient
 from app.main import app
 from app.models.schemas import Lds
@@ -37,6 +41,28 @@ def test_get_ld_matrix_with_variants(variants_in_ld_db):
         assert row.r is not None
 
 
+def test_get_ld_matrix_as_npz_matches_the_json_pairs(variants_in_ld_db):
+    variant_ids = [int(variant_id) for variant_id in list(variants_in_ld_db.keys())[:2]]
+    query = f"v1/ld/matrix?variant_ids={variant_ids[0]}&variant_ids={variant_ids[1]}"
+    lds = Lds(**client.get(query).json()).lds
+
+    response = client.get(f"{query}&format=npz")
+    assert response.status_code == 200
+    archive = np.load(io.BytesIO(response.content))
+    assert archive["variant_ids"].tolist() == variant_ids
+    assert archive["r"].dtype == np.float32
+    assert np.all(np.diag(archive["r"]) == 1)
+    for ld in lds:
+        i, j = variant_ids.index(ld.lead_variant_id), variant_ids.index(ld.proxy_variant_id)
+        assert archive["r"][i, j] == np.float32(ld.r)
+
+    response = client.get(f"{query}&format=arrow&dtype=float16")
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("variant_id").to_pylist() == variant_ids
+    assert np.array(table.column("r").to_pylist(), dtype=np.float16).shape == (2, 2)
+
+
 def test_get_ld_proxy_with_variant_ids(variants_in_ld_db):
     variant_ids = list(variants_in_ld_db.keys())
     response = client.get(f"v1/ld/proxies?variant_ids={variant_ids[0]}&variant_ids={variant_ids[1]}")
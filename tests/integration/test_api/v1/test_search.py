@@ -22,6 +22,21 @@ def test_get_search_options(mock_redis_cache):
             assert search_term.alt_name is not None
 
 
+def test_search_suggestions_match_gene_symbols_and_rsids(variants_in_studies_db, mock_redis_cache):
+    rsid = next(variant["rsid"] for variant in variants_in_studies_db.values())
+    response = client.get(f"/v1/search/suggest?q={rsid}&limit=5")
+    assert response.status_code == 200
+    suggestions = SearchTerms(**response.json()).search_terms
+    assert suggestions[0].type == "variant"
+    assert suggestions[0].name == rsid
+
+    response = client.get("/v1/search/suggest?q=brc&limit=5")
+    assert response.status_code == 200
+    suggestions = SearchTerms(**response.json()).search_terms
+    assert 0 < len(suggestions) <= 5
+    assert all("brc" in (s.name.lower() + " " + (s.alt_name or "").lower()) for s in suggestions)
+
+
 def test_search_variant_by_rsid(variants_in_studies_db, mock_redis_cache):
     rsids = [variant["rsid"] for variant in variants_in_studies_db.values()]
     response = client.get(f"/v1/search/variant/{rsids[0]}")
@@ -1,3 +1,8 @@
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.testclient import TestClient
 from app.main import app
 from app.models.schemas import TraitResponse, GetTraitsResponse
@@ -192,3 +197,46 @@ def test_get_trait_associations_full_cross_product_includes_linked_study_associa
 
     associations = _associations_full_as_dicts(response.json())
     assert any(a["variant_id"] == 80717 and a["study_id"] != trait_id for a in associations)
+
+
+def test_get_trait_associations_full_as_arrow_matches_json():
+    trait_id = 926
+    json_response = client.get(f"/v1/traits/{trait_id}/associations-full")
+    response = client.get(f"/v1/traits/{trait_id}/associations-full", params={"format": "arrow"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == json_response.json()["associations_full_column_names"]
+    assert table.num_rows == len(json_response.json()["associations_full_rows"])
+
+
+def test_get_trait_coloc_pairs_as_parquet():
+    response = client.get("/v1/traits/5020/coloc-pairs", params={"format": "parquet"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows > 0
+    assert "in_coloc_group" in table.column_names
+
+
+def test_get_trait_associations_full_streams_ndjson_and_csv():
+    trait_id = 926
+    json_response = client.get(f"/v1/traits/{trait_id}/associations-full").json()
+
+    response = client.get(f"/v1/traits/{trait_id}/associations-full", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == len(json_response["associations_full_rows"])
+    assert list(json.loads(lines[0])) == json_response["associations_full_column_names"]
+
+    response = client.get(f"/v1/traits/{trait_id}/associations-full", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.text.splitlines()[0].replace('"', "").split(",") == json_response["associations_full_column_names"]
+
+
+def test_get_trait_associations_full_rejects_unknown_format():
+    response = client.get("/v1/traits/926/associations-full", params={"format": "xml"})
+    assert response.status_code == 422
@@ -1,4 +1,5 @@
 import io
+import json
 import zipfile
 from fastapi.testclient import TestClient
 from app.main import app
@@ -102,6 +103,27 @@ def test_get_variants_expand_not_allowed_with_grange(variants_in_grange):
     assert "expand" in response.json()["detail"].lower()
 
 
+def test_resolve_variants_preserves_input_order(variants_in_studies_db):
+    variant_ids = list(variants_in_studies_db.keys())
+    rsids = [variant["rsid"] for variant in variants_in_studies_db.values()]
+    identifiers = [rsids[1], "not a variant", str(variant_ids[0])]
+
+    response = client.post("/v1/variants/resolve", json={"variants": identifiers})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["identifier"] for row in rows] == identifiers
+    assert rows[0]["rsid"] == rsids[1]
+    assert rows[1]["id"] is None
+    assert Variant(**rows[2]).id == int(variant_ids[0])
+
+
+def test_resolve_variants_validates_variants():
+    assert client.post("/v1/variants/resolve", json={"variants": []}).status_code == 422
+    assert client.post("/v1/variants/resolve", json={}).status_code == 422
+
+
 def test_get_variants_expand_with_associations(variants_in_studies_db):
     variant_ids = list(variants_in_studies_db.keys())
     response = client.get(f"/v1/variants?variants={variant_ids[0]}&expand=true&include_associations=true")
@@ -0,0 +1,31 @@
+import pytest
+
+from app.db.associations_db import AssociationsDBClient
+
+SETUP_SQL = """
+    CREATE TABLE associations AS
+    SELECT v AS variant_id, s AS study_id, v * 0.01 + s AS beta FROM range(1, 6) t(v), range(1, 4) u(s)
+"""
+
+pytestmark = pytest.mark.parametrize(
+    "duckdb_connection", [(SETUP_SQL, {AssociationsDBClient: "associations_conn"})], indirect=True
+)
+
+
+@pytest.fixture
+def associations_db(duckdb_connection):
+    return AssociationsDBClient()
+
+
+def test_snp_study_pairs_return_only_the_requested_pairs(associations_db):
+    rows, columns = associations_db.get_associations_by_snp_study_pairs([(1, 1), (2, 3), (2, 3), (9, 1)])
+
+    assert columns == ["variant_id", "study_id", "beta"]
+    assert sorted((row[0], row[1]) for row in rows) == [(1, 1), (2, 3)]
+
+
+def test_variant_and_study_ids_return_the_cross_product(associations_db):
+    rows, _ = associations_db.get_associations_by_variant_ids_and_study_ids([1, 2], [1, 3])
+
+    assert sorted((row[0], row[1]) for row in rows) == [(1, 1), (1, 3), (2, 1), (2, 3)]
+    assert associations_db.get_associations_by_variant_ids_and_study_ids([], [1]) == ([], [])
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from app.db.cache_codec import (
+    CacheCodec,
+    FORMAT_JSON_ZSTD,
+    FORMAT_MSGPACK_ZSTD,
+    decode_cache_value,
+    decode_cache_value_as_json,
+    encode_cache_value,
+)
+
+associations_full = {
+    "column_names": ["variant_id", "study_id", "beta", "se", "p"],
+    "rows": [[80717 + i, 926, 0.01 * i, 0.002, 1e-8] for i in range(1000)],
+}
+
+
+def test_plain_data_round_trips_through_msgpack():
+    payload = encode_cache_value(associations_full)
+
+    assert payload[0] == FORMAT_MSGPACK_ZSTD
+    assert decode_cache_value(payload) == associations_full
+    assert len(payload) < len(json.dumps(associations_full)) / 4
+
+
+def test_json_text_is_stored_as_compressed_json():
+    body = json.dumps(associations_full)
+    payload = encode_cache_value(body)
+
+    assert payload[0] == FORMAT_JSON_ZSTD
+    assert decode_cache_value_as_json(payload) == body.encode()
+    assert decode_cache_value(payload) == associations_full
+
+
+def test_msgpack_payload_can_be_served_as_json():
+    payload = encode_cache_value(associations_full)
+
+    assert json.loads(decode_cache_value_as_json(payload)) == associations_full
+
+
+def test_legacy_json_values_are_decoded():
+    legacy = json.dumps(associations_full).encode()
+
+    assert decode_cache_value(legacy) == associations_full
+    assert decode_cache_value_as_json(legacy) == legacy
+    assert decode_cache_value(None) is None
+
+
+def test_codecs_must_implement_encode_and_decode():
+    class EncodeOnlyCodec(CacheCodec):
+        format_version = 3
+
+        def encode(self, value) -> bytes:
+            return bytes([self.format_version])
+
+    with pytest.raises(TypeError):
+        EncodeOnlyCodec()
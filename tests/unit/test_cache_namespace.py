@@ -0,0 +1,107 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.db.redis import RedisClient
+from app.services import cache_namespace
+from app.services.cache_namespace import get_cache_namespace, is_retired_namespace, reap_cache_namespaces
+
+
+@pytest.fixture
+def redis_client():
+    mock_redis = Mock()
+    with patch("app.db.redis.Redis", return_value=mock_redis):
+        client = RedisClient()
+        client.redis = mock_redis
+    return client
+
+
+def test_namespaces_of_other_releases_and_earlier_generations_are_retired():
+    assert is_retired_namespace("old.7", "new", "new.2")
+    assert is_retired_namespace("new.1", "new", "new.2")
+    assert is_retired_namespace("get_traits", "new", "new.2")
+    assert not is_retired_namespace("new.2", "new", "new.2")
+    assert not is_retired_namespace("new.3", "new", "new.2")
+
+
+def test_the_previous_release_namespace_is_kept_while_it_is_served():
+    assert not is_retired_namespace("old.7", "new", "old.7")
+    assert not is_retired_namespace("new.0", "new", "old.7")
+    assert is_retired_namespace("old.6", "new", "old.7")
+
+
+def test_new_releases_serve_the_last_activated_namespace(redis_client):
+    redis_client.redis.mget.return_value = [None, "old.7"]
+    assert redis_client.get_cache_namespace("new") == "old.7"
+    redis_client.redis.mget.assert_called_once_with("cache_namespace:new", "cache_namespace:active")
+
+    redis_client.redis.mget.return_value = ["new.1", "new.1"]
+    assert redis_client.get_cache_namespace("new") == "new.1"
+
+    redis_client.set_cache_namespace("new", "new.2")
+    redis_client.redis.mset.assert_called_once_with({"cache_namespace:new": "new.2", "cache_namespace:active": "new.2"})
+
+
+def test_release_and_namespace_are_only_read_on_refresh(mocker):
+    get_data_release = mocker.patch.object(
+        cache_namespace, "get_data_release", side_effect=[mocker.Mock(version="old"), mocker.Mock(version="new")]
+    )
+    mocker.patch.object(cache_namespace.settings, "CACHE_NAMESPACE_REFRESH_SECONDS", 60.0)
+    monotonic = mocker.patch.object(cache_namespace.time, "monotonic", return_value=0.0)
+    client = Mock()
+    client.get_cache_namespace.return_value = None
+
+    assert [get_cache_namespace(client) for _ in range(3)] == ["old.0"] * 3
+    assert get_data_release.call_count == 1
+
+    monotonic.return_value = 61.0
+    assert get_cache_namespace(client) == "new.0"
+    assert get_data_release.call_count == 2
+    client.get_cache_namespace.assert_called_with("new")
+
+
+def test_reaping_expires_retired_cache_and_lock_keys(mocker):
+    mocker.patch.object(cache_namespace, "get_data_release", return_value=mocker.Mock(version="new"))
+    mocker.patch.object(cache_namespace, "_cache_prefixes", {"studies_db_cache"})
+    keys = {
+        "studies_db_cache:*": [
+            "studies_db_cache:old.4:get_traits",
+            "studies_db_cache:new.1:get_traits",
+            "studies_db_cache:new.2:get_traits",
+            "studies_db_cache:new.3:get_traits",
+            "studies_db_cache:get_traits",
+        ],
+        "lock:studies_db_cache:*": ["lock:studies_db_cache:old.4:get_traits:fence"],
+    }
+    client = Mock()
+    client.get_cache_namespace.return_value = "new.2"
+    client.scan_keys.side_effect = lambda pattern, count: iter(keys[pattern])
+    client.expire_keys.side_effect = lambda batch, seconds: len(batch)
+
+    assert reap_cache_namespaces(client, batch_size=2) == 4
+    expired = [key for call in client.expire_keys.call_args_list for key in call.args[0]]
+    assert expired == [
+        "studies_db_cache:old.4:get_traits",
+        "studies_db_cache:new.1:get_traits",
+        "studies_db_cache:get_traits",
+        "lock:studies_db_cache:old.4:get_traits:fence",
+    ]
+    client.get_cache_namespace.assert_called_once_with("new")
+
+
+def test_delete_keys_matching_scans_and_unlinks_in_batches(redis_client):
+    redis_client.redis.scan_iter.return_value = iter(["a:1", "a:2", "a:3"])
+    redis_client.redis.unlink.side_effect = lambda *keys: len(keys)
+
+    assert redis_client.delete_keys_matching("a:*", batch_size=2) == 3
+    redis_client.redis.scan_iter.assert_called_once_with(match="a:*", count=2)
+    assert [call.args for call in redis_client.redis.unlink.call_args_list] == [("a:1", "a:2"), ("a:3",)]
+    redis_client.redis.keys.assert_not_called()
+
+
+def test_expire_keys_only_sets_missing_ttls(redis_client):
+    pipeline = redis_client.redis.pipeline.return_value
+    pipeline.execute.return_value = [True, False]
+
+    assert redis_client.expire_keys(["a:1", "a:2"], 60) == 1
+    pipeline.expire.assert_any_call("a:1", 60, nx=True)
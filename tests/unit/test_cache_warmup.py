@@ -0,0 +1,102 @@
+import pytest
+
+from app.services import cache_namespace, cache_warmup
+from app.services.cache_namespace import get_cache_namespace, writing_cache_namespace
+from app.services.cache_warmup import CACHE_WARMUP_LOCK, CacheWarmupInProgressError, select_warmup_trait_ids, warm_cache
+from app.services.entity_counts import EntityCounts
+from app.services.redis_decorator import redis_cache
+
+
+class WarmService:
+    @redis_cache(prefix="warm_cache")
+    def get_value(self, value=None):
+        if value == "fail":
+            raise ValueError("query failed")
+        return {"value": value}
+
+
+@pytest.fixture
+def warmup_redis(mock_redis_cache, mocker):
+    mocker.patch.object(cache_namespace, "get_data_release", return_value=mocker.Mock(version="r"))
+    mock_redis_cache.get_cache_namespace.return_value = "r.4"
+    mock_redis_cache.new_cache_namespace.return_value = "r.5"
+    mock_redis_cache.scan_keys.return_value = []
+    mocker.patch.object(cache_warmup, "RedisClient", return_value=mock_redis_cache)
+    return mock_redis_cache
+
+
+def cached_keys(mock_redis_client) -> list[str]:
+    return [call.args[0] for call in mock_redis_client.set_cached_data_if_lock_held.call_args_list]
+
+
+def test_cache_keys_use_the_active_namespace_unless_writing_another(warmup_redis):
+    service = WarmService()
+
+    service.get_value()
+    with writing_cache_namespace("r.5"):
+        service.get_value()
+
+    assert cached_keys(warmup_redis) == ["warm_cache:r.4:get_value", "warm_cache:r.5:get_value"]
+    assert get_cache_namespace(warmup_redis) == "r.4"
+    warmup_redis.get_cache_namespace.assert_called_with("r")
+
+
+def test_warm_cache_fills_a_new_namespace_then_activates_it(warmup_redis, mocker):
+    service = WarmService()
+    mocker.patch.object(
+        cache_warmup,
+        "get_warmup_tasks",
+        return_value={
+            "get_value": service.get_value,
+            "associations_full:1": lambda: service.get_value(1),
+            "associations_full:2": lambda: service.get_value("fail"),
+        },
+    )
+
+    report = warm_cache(trait_ids=[1, 2], max_workers=2)
+
+    keys = cached_keys(warmup_redis)
+    assert len(keys) == 2
+    assert all(key.startswith("warm_cache:r.5:get_value") for key in keys)
+    warmup_redis.set_cache_namespace.assert_called_once_with("r", "r.5")
+    assert get_cache_namespace(warmup_redis) == "r.5"
+    assert report["activated"]
+    assert report["previous_namespace"] == "r.4"
+    assert report["warmed"] == 2
+    assert report["failed"] == ["associations_full:2"]
+    warmup_redis.release_lock.assert_any_call(CACHE_WARMUP_LOCK, warmup_redis.acquire_lock.return_value)
+
+
+def test_warm_cache_keeps_the_active_namespace_when_studies_entries_fail(warmup_redis, mocker):
+    service = WarmService()
+    mocker.patch.object(cache_warmup, "get_warmup_tasks", return_value={"get_value": lambda: service.get_value("fail")})
+
+    report = warm_cache(trait_ids=[])
+
+    assert not report["activated"]
+    warmup_redis.set_cache_namespace.assert_not_called()
+    assert get_cache_namespace(warmup_redis) == "r.4"
+
+
+def test_only_one_warm_up_runs_at_a_time(warmup_redis):
+    warmup_redis.acquire_lock.return_value = None
+
+    with pytest.raises(CacheWarmupInProgressError):
+        warm_cache()
+    warmup_redis.new_cache_namespace.assert_not_called()
+
+
+def test_warm_up_targets_the_most_accessed_then_most_colocalised_traits(warmup_redis, mocker):
+    warmup_redis.get_most_accessed_trait_ids.return_value = [5, 1]
+    mocker.patch.object(
+        cache_warmup,
+        "get_entity_counts",
+        return_value={
+            1: EntityCounts(num_coloc_groups=500),
+            2: EntityCounts(num_coloc_groups=200),
+            3: EntityCounts(num_coloc_groups=600),
+            4: EntityCounts(num_coloc_groups=1),
+        },
+    )
+
+    assert select_warmup_trait_ids() == [5, 1, 3, 2]
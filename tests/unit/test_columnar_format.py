@@ -0,0 +1,60 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.models.schemas import ResponseFormat
+from app.services.columnar_format import (
+    arrow_table_response,
+    encode_record_batches,
+    rows_to_arrow_table,
+    serialize_arrow_table,
+)
+
+
+def test_rows_to_arrow_table():
+    table = rows_to_arrow_table(["variant_id", "p"], [[1, 0.5], [2, None]])
+
+    assert table.column_names == ["variant_id", "p"]
+    assert table.to_pylist() == [{"variant_id": 1, "p": 0.5}, {"variant_id": 2, "p": None}]
+    empty_table = rows_to_arrow_table(["variant_id", "p"], [])
+    assert (empty_table.column_names, empty_table.num_rows) == (["variant_id", "p"], 0)
+    assert pq.read_table(io.BytesIO(serialize_arrow_table(empty_table, ResponseFormat.parquet))).column_names == [
+        "variant_id",
+        "p",
+    ]
+
+
+def test_serialized_tables_round_trip():
+    table = pa.table({"variant_id": [1, 2], "beta": [0.1, -0.2]})
+
+    arrow_table = pa.ipc.open_stream(serialize_arrow_table(table, ResponseFormat.arrow)).read_all()
+    parquet_table = pq.read_table(io.BytesIO(serialize_arrow_table(table, ResponseFormat.parquet)))
+
+    assert arrow_table.equals(table)
+    assert parquet_table.equals(table)
+    with pytest.raises(ValueError):
+        serialize_arrow_table(table, ResponseFormat.json)
+
+
+def test_arrow_table_response_headers():
+    response = arrow_table_response(pa.table({"a": [1]}), ResponseFormat.parquet, 'trait_"Height"')
+
+    assert response.media_type == "application/vnd.apache.parquet"
+    assert response.headers["content-disposition"] == 'attachment; filename="trait__Height_.parquet"'
+
+
+def test_encode_record_batches_yields_one_chunk_per_batch():
+    table = pa.table({"variant_id": [1, 2, 3], "beta": pa.array([1, 2, None], pa.decimal128(5, 2))})
+    batches = table.to_batches(max_chunksize=2)
+
+    ndjson = list(encode_record_batches(batches, ResponseFormat.ndjson))
+    csv = list(encode_record_batches(batches, ResponseFormat.csv))
+
+    assert ndjson == [
+        b'{"variant_id": 1, "beta": 1.0}\n{"variant_id": 2, "beta": 2.0}\n',
+        b'{"variant_id": 3, "beta": null}\n',
+    ]
+    assert b"".join(csv).decode().splitlines() == ['"variant_id","beta"', "1,1.00", "2,2.00", "3,"]
+    assert len(csv) == 2
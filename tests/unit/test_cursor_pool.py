@@ -0,0 +1,98 @@
+import gc
+import threading
+
+import duckdb
+import pytest
+
+from app.db.cursor_pool import CursorPool, CursorPoolTimeoutError
+
+
+@pytest.fixture
+def connection():
+    connection = duckdb.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+def test_thread_cursor_is_private_to_each_thread(connection):
+    pool = CursorPool("test", lambda: connection, size=4)
+    cursors = {}
+    barrier = threading.Barrier(2)
+
+    def lease(name):
+        cursors[name] = (pool.thread_cursor(), pool.thread_cursor())
+        barrier.wait()
+
+    threads = [threading.Thread(target=lease, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cursors["a"][0] is cursors["a"][1]
+    assert cursors["a"][0] is not cursors["b"][0]
+    assert pool.thread_cursor().execute("SELECT 42").fetchone() == (42,)
+
+
+def test_thread_cursors_are_returned_when_threads_exit(connection):
+    pool = CursorPool("test", lambda: connection, size=1)
+
+    thread = threading.Thread(target=pool.thread_cursor)
+    thread.start()
+    thread.join()
+    gc.collect()
+
+    metrics = pool.get_metrics()
+    assert metrics["leased"] == 0
+    assert metrics["idle"] == 1
+    assert metrics["leaks_reclaimed"] == 0
+
+
+def test_lease_blocks_until_timeout_when_pool_is_exhausted(connection):
+    pool = CursorPool("test", lambda: connection, size=1)
+
+    with pool.lease() as cursor:
+        assert cursor.execute("SELECT 1").fetchone() == (1,)
+        with pytest.raises(CursorPoolTimeoutError):
+            pool.lease(timeout=0.05)
+
+    with pool.lease():
+        pass
+    metrics = pool.get_metrics()
+    assert metrics["created"] == 1
+    assert metrics["acquired"] == 2
+    assert metrics["timeouts"] == 1
+
+
+def test_unreleased_leases_are_reclaimed_as_leaks(connection):
+    pool = CursorPool("test", lambda: connection, size=1)
+
+    lease = pool.lease()
+    del lease
+    gc.collect()
+
+    metrics = pool.get_metrics()
+    assert metrics["leaks_reclaimed"] == 1
+    assert metrics["idle"] == 1
+
+
+def test_long_held_leases_are_reported(connection):
+    pool = CursorPool("test", lambda: connection, size=2, leak_seconds=0.0001)
+
+    with pool.lease():
+        threading.Event().wait(0.01)
+        assert pool.get_metrics()["long_held_leases"] == 1
+    assert pool.get_metrics()["long_held_leases"] == 0
+
+
+def test_leases_fail_fast_beyond_the_lease_limit(connection):
+    pool = CursorPool("test", lambda: connection, size=3, lease_limit=1)
+
+    with pool.lease():
+        with pytest.raises(CursorPoolTimeoutError):
+            pool.lease()
+        assert pool.thread_cursor().execute("SELECT 1").fetchone() == (1,)
+
+    with pool.lease():
+        pass
+    assert pool.get_metrics()["timeouts"] == 1
@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+
+from app.db import data_release
+from app.db.data_release import clear_release_cache, get_release_cached
+
+
+def test_values_are_built_once_per_release(monkeypatch):
+    release = Mock(version="release-1")
+    monkeypatch.setattr(data_release, "get_data_release", lambda: release)
+    load = Mock(side_effect=lambda version: object())
+
+    first = get_release_cached("test_value", load)
+    assert get_release_cached("test_value", load) is first
+
+    release.version = "release-2"
+    second = get_release_cached("test_value", load)
+    assert second is not first
+    assert [call.args for call in load.call_args_list] == [("release-1",), ("release-2",)]
+
+    clear_release_cache("test_value")
+    assert get_release_cached("test_value", load) is not second
+    clear_release_cache("test_value")
+
+
+def test_missing_values_are_not_cached(monkeypatch):
+    monkeypatch.setattr(data_release, "get_data_release", lambda: Mock(version="release-1"))
+    load = Mock(return_value=None)
+
+    assert get_release_cached("test_missing_value", load) is None
+    assert get_release_cached("test_missing_value", load) is None
+    assert load.call_count == 2
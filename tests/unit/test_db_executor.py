@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.db.executor import AsyncDBClient, DBExecutor, ShardExecutor, iterate_in_db_executor
+
+
+class FakeClient:
+    def __init__(self):
+        self.name = "fake"
+
+    def get_thread_name(self):
+        return threading.current_thread().name
+
+    def fail(self):
+        raise ValueError("query failed")
+
+
+def test_async_db_client_runs_methods_on_executor_threads():
+    client = AsyncDBClient(FakeClient())
+
+    thread_name = asyncio.run(client.get_thread_name())
+
+    assert thread_name.startswith("duckdb")
+    assert client.name == "fake"
+
+
+def test_async_db_client_propagates_exceptions_and_records_failures():
+    client = AsyncDBClient(FakeClient())
+    failed_before = DBExecutor().get_metrics()["failed"]
+
+    with pytest.raises(ValueError, match="query failed"):
+        asyncio.run(client.fail())
+
+    metrics = DBExecutor().get_metrics()
+    assert metrics["failed"] == failed_before + 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["running"] == 0
+
+
+def test_iterate_in_db_executor_runs_on_executor_threads_and_closes_early():
+    closed = []
+
+    def batches():
+        try:
+            for _ in range(3):
+                yield threading.current_thread().name
+        finally:
+            closed.append(threading.current_thread().name)
+
+    async def take_one():
+        iterator = iterate_in_db_executor(batches())
+        first = await iterator.__anext__()
+        await iterator.aclose()
+        return first
+
+    assert asyncio.run(take_one()).startswith("duckdb")
+    assert len(closed) == 1 and closed[0].startswith("duckdb")
+
+
+def test_shard_executor_runs_shards_in_parallel_and_keeps_their_order():
+    executor = ShardExecutor()
+    delays = [0.2, 0.05, 0.1]
+
+    def query(delay):
+        time.sleep(delay)
+        return delay, threading.current_thread().name
+
+    started = time.perf_counter()
+    results = executor.map(query, delays)
+    elapsed = time.perf_counter() - started
+
+    assert [delay for delay, _ in results] == delays
+    assert all(thread_name.startswith("duckdb-shard") for _, thread_name in results)
+    assert elapsed < sum(delays)
+
+
+def test_shard_executor_propagates_exceptions():
+    def query(shard):
+        if shard == "b":
+            raise ValueError("shard failed")
+        return shard
+
+    with pytest.raises(ValueError, match="shard failed"):
+        ShardExecutor().map(query, ["a", "b", "c"])
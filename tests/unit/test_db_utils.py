@@ -0,0 +1,26 @@
+import duckdb
+
+from app.db.utils import connect_read_only, get_applied_duckdb_settings, settings
+
+
+def test_connect_read_only_applies_per_database_settings(tmp_path, monkeypatch):
+    path = str(tmp_path / "test.db")
+    duckdb.connect(path).close()
+    monkeypatch.setattr(settings, "DUCKDB_MEMORY_LIMIT", "2GB")
+    monkeypatch.setattr(settings, "DUCKDB_DATABASE_SETTINGS", {"small": {"memory_limit": "512MB", "threads": 2}})
+
+    small = get_applied_duckdb_settings(connect_read_only("small", path))
+    default = get_applied_duckdb_settings(connect_read_only("default", path))
+
+    assert small["threads"] == "2"
+    assert small["memory_limit"] != default["memory_limit"]
+
+
+def test_connect_read_only_skips_unknown_settings(tmp_path, monkeypatch):
+    path = str(tmp_path / "test.db")
+    duckdb.connect(path).close()
+    monkeypatch.setattr(settings, "DUCKDB_DATABASE_SETTINGS", {"test": {"not_a_duckdb_setting": 1}})
+
+    connection = connect_read_only("test", path)
+
+    assert connection.execute("SELECT 1").fetchone() == (1,)
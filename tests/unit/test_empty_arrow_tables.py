@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.db.associations_full_db import AssociationsFullDBClient
+from app.db.coloc_pairs_db import ColocPairsDBClient
+from app.services.associations_service import AssociationsService
+from app.services.coloc_pairs_service import ColocPairsService
+from app.services.range_index import RangeIndex
+
+
+SETUP_SQL = """
+    CREATE TABLE coloc_pairs (
+        variant_id BIGINT, study_extraction_a_id BIGINT, study_extraction_b_id BIGINT,
+        h3 DOUBLE, h4 DOUBLE, false_positive BOOLEAN
+    );
+    CREATE TABLE associations_full_1 (variant_id BIGINT, study_id BIGINT, beta DOUBLE, p DOUBLE);
+"""
+
+pytestmark = pytest.mark.parametrize(
+    "duckdb_connection",
+    [(SETUP_SQL, {ColocPairsDBClient: "coloc_pairs_conn", AssociationsFullDBClient: "associations_conn"})],
+    indirect=True,
+)
+
+
+def test_empty_coloc_pairs_keep_their_columns(duckdb_connection):
+    service = ColocPairsService.__new__(ColocPairsService)
+    service.coloc_pairs_db = ColocPairsDBClient()
+
+    table = service.get_coloc_pairs_full_arrow([])
+
+    assert table.num_rows == 0
+    assert table.column_names == [
+        "variant_id",
+        "study_extraction_a_id",
+        "study_extraction_b_id",
+        "h3",
+        "h4",
+        "false_positive",
+        "in_coloc_group",
+    ]
+
+
+def test_empty_associations_full_keep_their_columns(duckdb_connection):
+    service = AssociationsService.__new__(AssociationsService)
+    service.associations_full_db = AssociationsFullDBClient()
+    service.get_associations_full_index = Mock(return_value=RangeIndex([(1, 100, "associations_full_1")]))
+
+    table = service._fetch_associations_full_arrow(set(), {1})
+
+    assert table.num_rows == 0
+    assert table.column_names == ["variant_id", "study_id", "beta", "p"]
+    assert str(table.schema.field("beta").type) == "double"
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from app.db import data_release
+from app.db.studies_db import StudiesDBClient
+from app.services import entity_counts
+from app.services.entity_counts import (
+    EntityCounts,
+    NO_ENTITY_COUNTS,
+    clear_entity_counts,
+    get_entity_counts,
+    get_entity_counts_path,
+    materialize_entity_counts,
+)
+
+
+SETUP_SQL = """
+    CREATE TABLE traits AS SELECT * FROM (VALUES (1), (2), (3)) t(id);
+    CREATE TABLE studies AS SELECT * FROM (VALUES (10, 1, 'phenotype'), (20, 2, 'phenotype'), (30, 3, 'phenotype'))
+        t(id, trait_id, data_type);
+    CREATE TABLE gene_annotations AS SELECT * FROM (VALUES (100, 'GENE1'), (200, 'GENE2')) t(id, gene);
+    CREATE TABLE study_extractions AS SELECT * FROM (VALUES (1000, 10, 100, 'cis'), (2000, 20, 100, 'cis'))
+        t(id, study_id, gene_id, cis_trans);
+    CREATE TABLE coloc_groups AS SELECT * FROM (VALUES (1, 10, 1000), (1, 20, 2000)) t(coloc_group_id, study_id, study_extraction_id);
+    CREATE TABLE rare_results AS SELECT * FROM (VALUES (5, 10, 1000, 200, NULL))
+        t(rare_result_group_id, study_id, study_extraction_id, gene_id, situated_gene_id);
+"""
+
+pytestmark = pytest.mark.parametrize(
+    "duckdb_connection", [(SETUP_SQL, {StudiesDBClient: "studies_conn"})], indirect=True
+)
+
+
+@pytest.fixture
+def studies_db(duckdb_connection, mocker, tmp_path):
+    mocker.patch.object(entity_counts.settings, "ENTITY_COUNTS_DIR", str(tmp_path))
+    clear_entity_counts()
+    yield duckdb_connection
+    clear_entity_counts()
+
+
+def test_counts_are_computed_when_not_materialised(studies_db):
+    traits = get_entity_counts("traits")
+
+    assert traits[1] == EntityCounts(
+        num_study_extractions=1, num_coloc_groups=1, num_coloc_studies=2, num_rare_results=1
+    )
+    assert traits[2] == EntityCounts(num_study_extractions=1, num_coloc_groups=1, num_coloc_studies=2)
+    assert traits.get(3, NO_ENTITY_COUNTS) == NO_ENTITY_COUNTS
+    assert get_entity_counts("genes") == {
+        "GENE1": EntityCounts(num_study_extractions=2, num_coloc_groups=1, num_coloc_studies=2),
+        "GENE2": EntityCounts(num_rare_results=1),
+    }
+
+
+def test_materialised_counts_are_read_from_parquet(studies_db, tmp_path):
+    computed = {entity: get_entity_counts(entity) for entity in ("traits", "genes")}
+    stale_path = tmp_path / "traits_counts_old-release.parquet"
+    stale_path.write_bytes(b"")
+
+    paths = materialize_entity_counts()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths.values())
+    studies_db.execute("DROP TABLE coloc_groups")
+    assert {entity: get_entity_counts(entity) for entity in ("traits", "genes")} == computed
+
+
+def test_counts_are_loaded_once_per_release(studies_db, mocker):
+    load = mocker.spy(entity_counts, "_load_entity_counts")
+
+    get_entity_counts("traits")
+    get_entity_counts("traits")
+    assert load.call_count == 1
+
+    mocker.patch.object(data_release, "get_data_release", return_value=mocker.Mock(version="next"))
+    get_entity_counts("traits")
+    assert load.call_count == 2
+    assert load.call_args.args == ("traits", "next")
+    assert get_entity_counts_path("traits", "next").endswith("traits_counts_next.parquet")
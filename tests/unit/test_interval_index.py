@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.services.interval_index import GenomicIndex, IntervalIndex
+
+
+def brute_force(chromosomes, starts, stops, chromosome, start, stop, contained):
+    return [
+        position
+        for position, (c, s, e) in enumerate(zip(chromosomes, starts, stops))
+        if c == chromosome and ((start <= s and e <= stop) if contained else (s <= stop and e >= start))
+    ]
+
+
+def test_interval_queries_match_a_linear_scan():
+    rng = np.random.default_rng(0)
+    chromosomes = rng.integers(1, 4, 500)
+    starts = rng.integers(0, 100_000, 500)
+    stops = starts + rng.integers(0, 20_000, 500)
+    index = IntervalIndex(chromosomes, starts, stops)
+
+    for chromosome, start in zip(rng.integers(1, 5, 50), rng.integers(0, 110_000, 50)):
+        stop = start + 5_000
+        for contained, query in ((False, index.overlapping), (True, index.within)):
+            expected = brute_force(chromosomes, starts, stops, chromosome, start, stop, contained)
+            assert query(int(chromosome), int(start), int(stop)).tolist() == expected
+
+
+def test_genomic_index_returns_rows_in_original_order():
+    genes = [
+        (1, "A", None, None, None, 1, 100, 200),
+        (2, "B", None, None, None, 1, 150, 5000),
+        (3, "C", None, None, None, 2, 100, 200),
+        (4, "D", None, None, None, 1, 300, 400),
+    ]
+    ld_blocks = [(10, 1, 0, 1000, "EUR", "1:0-1000"), (11, 1, 1001, 9000, "EUR", "1:1001-9000")]
+    extractions = {"id": np.array([7, 8, 9]), "chr": np.array([1, 1, 2]), "bp": np.array([120, 5000, 150])}
+    index = GenomicIndex(genes, ld_blocks, extractions)
+
+    assert [gene[0] for gene in index.genes_within(1, 0, 1000)] == [1, 4]
+    assert [gene[0] for gene in index.genes_overlapping(1, 350, 360)] == [2, 4]
+    assert index.ld_block(11) == ld_blocks[1]
+    assert [ld_block[0] for ld_block in index.ld_blocks_overlapping(1, 900, 1100)] == [10, 11]
+    assert index.study_extraction_ids_within(1, 100, 200) == [7]
+    assert index.study_extraction_ids_within(3, 0, 10_000) == []
@@ -0,0 +1,106 @@
+import io
+import os
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from app.db.ld_db import LdDBClient
+from app.services import ld_index
+from app.services.ld_index import clear_ld_index, get_ld_index, materialize_ld_index
+from app.models.schemas import LdMatrixDtype, LdMatrixFormat
+from app.services.ld_service import LdService, serialize_ld_matrix
+
+
+pytestmark = pytest.mark.parametrize(
+    "duckdb_connection",
+    [
+        (
+            "CREATE TABLE ld (lead_variant_id BIGINT, proxy_variant_id BIGINT, ld_block_id BIGINT, r DOUBLE)",
+            {LdDBClient: "ld_conn"},
+        )
+    ],
+    indirect=True,
+)
+
+
+@pytest.fixture
+def ld_db(duckdb_connection, mocker, tmp_path):
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, 60, size=(400, 2))
+    duckdb_connection.executemany(
+        "INSERT INTO ld VALUES (?, ?, ?, ?)",
+        [
+            (int(lead), int(proxy), int(lead) // 10, float(r))
+            for (lead, proxy), r in zip(pairs, rng.uniform(-1, 1, 400))
+        ],
+    )
+    duckdb_connection.execute("INSERT INTO ld VALUES (107, 107, 0, 1.0), (108, 109, 0, 0.95), (109, 108, 0, 0.95)")
+    mocker.patch.object(ld_index.settings, "LD_INDEX_DIR", str(tmp_path))
+    mocker.patch.object(ld_index.settings, "STREAM_BATCH_SIZE", 64)
+    clear_ld_index()
+    yield duckdb_connection
+    clear_ld_index()
+
+
+def test_ld_lookups_fall_back_to_the_ld_table_until_materialised(ld_db):
+    assert get_ld_index() is None
+    assert sorted(LdService().get_ld_proxies([108], 0.9)) == [(108, 109, 0, 0.95), (109, 108, 0, 0.95)]
+
+
+def test_ld_index_matches_the_ld_table(ld_db, tmp_path):
+    db = LdDBClient()
+    variant_sets = [[107], [108, 109], [1, 2, 3], list(range(0, 60, 7)), list(range(60)), [1000]]
+    expected_proxies = {
+        (tuple(ids), threshold): sorted(db.get_ld_proxies(ids, threshold))
+        for ids in variant_sets
+        for threshold in (0.0, 0.8, 0.95)
+    }
+    expected_matrices = {tuple(ids): sorted(db.get_ld_matrix(ids)) for ids in variant_sets}
+
+    path = materialize_ld_index()
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    index = get_ld_index()
+    assert isinstance(index.r, np.memmap)
+
+    service = LdService()
+    for (ids, threshold), proxies in expected_proxies.items():
+        assert sorted(service.get_ld_proxies(list(ids), threshold)) == proxies
+    for ids, matrix in expected_matrices.items():
+        assert sorted(service.get_ld_matrix(list(ids))) == matrix
+
+
+def test_edges_are_sorted_by_r_squared_within_each_variant(ld_db):
+    materialize_ld_index()
+    index = get_ld_index()
+
+    for start, stop in zip(index.indptr[:-1], index.indptr[1:]):
+        r_squared = index.r[start:stop] ** 2
+        assert np.all(r_squared[:-1] >= r_squared[1:])
+
+
+def test_dense_matrix_is_the_same_from_the_index_and_the_ld_table(ld_db):
+    variant_ids = [108, 109, 107, 3, 1, 1000, 3]
+    service = LdService()
+    ordered_from_table, from_table = service.get_dense_ld_matrix(variant_ids)
+    materialize_ld_index()
+    ordered_from_index, from_index = service.get_dense_ld_matrix(variant_ids)
+
+    assert ordered_from_table.tolist() == ordered_from_index.tolist() == [108, 109, 107, 3, 1, 1000]
+    np.testing.assert_array_equal(from_table, from_index)
+    assert from_index.dtype == np.float32
+    assert from_index[0, 1] == from_index[1, 0] == np.float32(0.95)
+    assert np.all(np.diag(from_index) == 1)
+    assert np.isnan(from_index[5, :5]).all()
+
+
+def test_dense_matrix_round_trips_through_npz_and_arrow(ld_db):
+    variant_ids, matrix = LdService().get_dense_ld_matrix([108, 109, 5], LdMatrixDtype.float16)
+
+    archive = np.load(io.BytesIO(serialize_ld_matrix(variant_ids, matrix, LdMatrixFormat.npz)))
+    assert archive["variant_ids"].tolist() == [108, 109, 5]
+    np.testing.assert_array_equal(archive["r"], matrix)
+
+    table = pa.ipc.open_stream(serialize_ld_matrix(variant_ids, matrix, LdMatrixFormat.arrow)).read_all()
+    assert table.column("variant_id").to_pylist() == [108, 109, 5]
+    np.testing.assert_array_equal(np.array(table.column("r").to_pylist(), dtype=np.float16), matrix)
@@ -0,0 +1,74 @@
+import time
+
+from app.db.data_release import get_data_release
+from app.services.cache_namespace import default_cache_namespace
+from app.services.local_cache import MISSING, LocalCache, invalidate_cache_prefix
+from app.services.redis_decorator import redis_cache
+
+
+class HotService:
+    def __init__(self):
+        self.calls = 0
+
+    @redis_cache(prefix="hot_cache", local=True)
+    def get_value(self):
+        self.calls += 1
+        return ["a", "b"]
+
+
+def new_local_cache(**kwargs) -> LocalCache:
+    """A standalone cache instance, bypassing the Singleton the application shares"""
+    cache = object.__new__(LocalCache)
+    cache.__init__(**kwargs)
+    return cache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = new_local_cache(max_entries=2, ttl_seconds=60)
+    cache.set("k:1", 1)
+    cache.set("k:2", 2)
+    cache.get("k:1")
+    cache.set("k:3", 3)
+
+    assert cache.get("k:2") is MISSING
+    assert cache.get("k:1") == 1
+    assert cache.get("k:3") == 3
+    assert cache.get_metrics()["evictions"] == 1
+
+
+def test_local_cache_expires_entries():
+    cache = new_local_cache(max_entries=2, ttl_seconds=0.01)
+    cache.set("k:1", 1)
+    time.sleep(0.02)
+
+    assert cache.get("k:1") is MISSING
+
+
+def test_local_cache_invalidates_by_prefix():
+    cache = new_local_cache(max_entries=10, ttl_seconds=60)
+    cache.set("studies_db_cache:get_traits", 1)
+    cache.set("studies_db_cache_other:get_traits", 2)
+
+    assert cache.invalidate("studies_db_cache") == 1
+    assert cache.get("studies_db_cache_other:get_traits") == 2
+
+
+def test_redis_cache_serves_local_hits_without_redis(mock_redis_cache):
+    service = HotService()
+
+    assert service.get_value() == ["a", "b"]
+    assert service.get_value() == ["a", "b"]
+
+    assert service.calls == 1
+    assert mock_redis_cache.get_cached_data.call_count == 1
+
+
+def test_invalidate_cache_prefix_clears_locally_and_publishes(mock_redis):
+    service = HotService()
+    service.get_value()
+
+    invalidate_cache_prefix("hot_cache")
+
+    namespace = default_cache_namespace(get_data_release().version)
+    assert LocalCache().get(f"hot_cache:{namespace}:get_value") is MISSING
+    mock_redis.publish.assert_called_with("cache_invalidation", "hot_cache")
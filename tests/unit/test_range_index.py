@@ -0,0 +1,51 @@
+from unittest.mock import Mock
+
+from app.db import data_release
+from app.services.range_index import RangeIndex, clear_range_indexes, get_range_index
+
+
+def test_split_routes_ids_to_their_range():
+    index = RangeIndex([(101, 200, "associations_2"), (1, 100, "associations_1"), (301, 400, "associations_3")])
+
+    assert index.split({5, 100, 101, 250, 400, 401, 0}) == {
+        "associations_1": [5, 100],
+        "associations_2": [101],
+        "associations_3": [400],
+    }
+    assert index.lookup([1, 250]).tolist() == [0, -1]
+
+
+def test_split_matches_a_linear_scan():
+    ranges = [(start, start + 99, f"t{start}") for start in range(0, 10_000, 100)]
+    index = RangeIndex(ranges)
+    ids = set(range(0, 12_000, 7))
+
+    expected = {name: [] for _, _, name in ranges}
+    for variant_id in sorted(ids):
+        for start, stop, name in ranges:
+            if start <= variant_id <= stop:
+                expected[name].append(variant_id)
+                break
+
+    assert index.split(ids) == expected
+
+
+def test_empty_index():
+    assert RangeIndex([]).split([1, 2]) == {}
+    assert RangeIndex([]).lookup([1]).tolist() == [-1]
+
+
+def test_get_range_index_is_built_once_per_release(monkeypatch):
+    clear_range_indexes()
+    load_ranges = Mock(return_value=[(1, 10, "t1")])
+    release = Mock(version="release-1")
+    monkeypatch.setattr(data_release, "get_data_release", lambda: release)
+
+    first = get_range_index("test_metadata", load_ranges)
+    assert get_range_index("test_metadata", load_ranges) is first
+    assert load_ranges.call_count == 1
+
+    release.version = "release-2"
+    assert get_range_index("test_metadata", load_ranges) is not first
+    assert load_ranges.call_count == 2
+    clear_range_indexes()
@@ -0,0 +1,207 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.db.cache_codec import decode_cache_value
+from app.db.redis import SET_IF_LOCK_HELD_SCRIPT, RedisClient
+from app.services import redis_decorator
+from app.models.schemas import SearchTerm, SearchTerms
+from app.services.redis_decorator import CachedResponse, get_single_flight_metrics, redis_cache
+
+
+class SlowService:
+    def __init__(self):
+        self.calls = 0
+
+    @redis_cache(prefix="test_cache")
+    def get_value(self, value):
+        self.calls += 1
+        time.sleep(0.1)
+        return {"value": value}
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(redis_decorator.settings, "CACHE_LOCK_POLL_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(redis_decorator.settings, "CACHE_LOCK_WAIT_SECONDS", 1.0)
+
+
+def test_concurrent_misses_in_one_process_are_computed_once(mock_redis_cache):
+    service = SlowService()
+    coalesced_before = get_single_flight_metrics()["coalesced_in_process"]
+    results = []
+
+    def call():
+        results.append(service.get_value(1))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.calls == 1
+    assert results == [{"value": 1}] * 5
+    assert mock_redis_cache.set_cached_data_if_lock_held.call_count == 1
+    assert get_single_flight_metrics()["coalesced_in_process"] == coalesced_before + 4
+    assert get_single_flight_metrics()["in_flight"] == 0
+
+
+def test_waiters_receive_the_computing_callers_exception(mock_redis_cache):
+    class FailingService:
+        @redis_cache(prefix="test_cache")
+        def get_value(self):
+            time.sleep(0.1)
+            raise ValueError("query failed")
+
+    service = FailingService()
+    errors = []
+
+    def call():
+        try:
+            service.get_value()
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    mock_redis_cache.set_cached_data_if_lock_held.assert_not_called()
+
+
+def test_waits_for_another_worker_holding_the_lock(mock_redis_cache, fast_polling):
+    mock_redis_cache.acquire_lock.return_value = None
+    mock_redis_cache.get_cached_data.side_effect = [None, None, {"value": 2}]
+    service = SlowService()
+    coalesced_before = get_single_flight_metrics()["coalesced_across_workers"]
+
+    assert service.get_value(2) == {"value": 2}
+
+    assert service.calls == 0
+    mock_redis_cache.set_cached_data.assert_not_called()
+    assert get_single_flight_metrics()["coalesced_across_workers"] == coalesced_before + 1
+
+
+def test_computes_when_the_lock_holder_gives_up(mock_redis_cache, fast_polling):
+    mock_redis_cache.acquire_lock.side_effect = [None, 7]
+    mock_redis_cache.lock_is_held.return_value = False
+    service = SlowService()
+
+    assert service.get_value(3) == {"value": 3}
+
+    assert service.calls == 1
+    lock_key = mock_redis_cache.acquire_lock.call_args.args[0]
+    mock_redis_cache.set_cached_data_if_lock_held.assert_called_once_with(
+        lock_key.removeprefix("lock:"), {"value": 3}, lock_key, 7, 0
+    )
+    mock_redis_cache.release_lock.assert_called_once_with(lock_key, 7)
+
+
+def test_does_not_cache_after_the_lock_expired(mock_redis_cache):
+    mock_redis_cache.set_cached_data_if_lock_held.return_value = False
+    service = SlowService()
+    locks_lost_before = get_single_flight_metrics()["locks_lost"]
+
+    assert service.get_value(4) == {"value": 4}
+
+    mock_redis_cache.set_cached_data.assert_not_called()
+    assert get_single_flight_metrics()["locks_lost"] == locks_lost_before + 1
+
+
+def test_computes_without_lock_when_redis_is_down(mock_redis_cache):
+    mock_redis_cache.get_cached_data.side_effect = ConnectionError("redis down")
+    mock_redis_cache.acquire_lock.side_effect = ConnectionError("redis down")
+    service = SlowService()
+
+    assert service.get_value(5) == {"value": 5}
+    assert service.calls == 1
+    assert mock_redis_cache.set_cached_data.call_args.args[1] == {"value": 5}
+
+
+def test_redis_client_lock_uses_fencing_tokens():
+    mock_redis = Mock()
+    with patch("app.db.redis.Redis", return_value=mock_redis):
+        client = RedisClient()
+        client.redis = mock_redis
+    mock_redis.incr.return_value = 3
+    mock_redis.set.return_value = True
+    mock_redis.get.return_value = "3"
+
+    assert client.acquire_lock("lock:key", 1000) == 3
+    mock_redis.set.assert_called_once_with("lock:key", 3, nx=True, px=1000)
+    assert client.lock_is_held("lock:key", 3)
+    assert not client.lock_is_held("lock:key", 2)
+
+    mock_redis.set.return_value = None
+    assert client.acquire_lock("lock:key", 1000) is None
+
+
+def test_redis_client_checks_the_lock_token_in_the_cache_write():
+    mock_redis = Mock()
+    with patch("app.db.redis.Redis", return_value=mock_redis):
+        client = RedisClient()
+        client.cache_redis = mock_redis
+    mock_redis.eval.return_value = 0
+
+    assert not client.set_cached_data_if_lock_held("key", {"value": 1}, "lock:key", 3, 60)
+    script, num_keys, *args = mock_redis.eval.call_args.args
+    assert script == SET_IF_LOCK_HELD_SCRIPT
+    assert (num_keys, args[:2], args[3:]) == (2, ["key", "lock:key"], [3, 60])
+    assert decode_cache_value(args[2]) == {"value": 1}
+
+
+class ModelService:
+    def __init__(self):
+        self.calls = 0
+
+    @redis_cache(prefix="test_cache", model_class=SearchTerms)
+    def get_terms(self):
+        self.calls += 1
+        return SearchTerms(search_terms=[SearchTerm(type="gene", name="WNT7B", type_id=1)])
+
+
+def test_as_response_returns_the_serialized_body(mock_redis_cache):
+    service = ModelService()
+
+    cached = service.get_terms(as_response=True)
+
+    assert cached.body == service.get_terms().model_dump_json().encode()
+    assert mock_redis_cache.set_cached_data_if_lock_held.call_args.args[1].encode() == cached.body
+
+
+def test_as_response_hit_skips_the_model(mock_redis_cache, mocker):
+    body = '{"search_terms":[]}'
+    mock_redis_cache.get_cached_body.return_value = body
+    validate = mocker.spy(SearchTerms, "model_validate")
+    service = ModelService()
+
+    cached = service.get_terms(as_response=True)
+
+    assert cached.body == body.encode()
+    assert service.calls == 0
+    validate.assert_not_called()
+
+
+def test_cached_response_honours_if_none_match():
+    cached = CachedResponse(b'{"search_terms":[]}')
+    request = Mock(headers={"if-none-match": f'"other", {cached.etag}'})
+
+    assert cached.to_response(request).status_code == 304
+    response = cached.to_response(Mock(headers={}), headers={"Cache-Control": "no-cache"})
+    assert response.status_code == 200
+    assert response.body == cached.body
+    assert response.headers["etag"] == cached.etag
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_cached_response_matches_weak_etags():
+    cached = CachedResponse(b'{"search_terms":[]}')
+
+    assert cached.to_response(Mock(headers={"if-none-match": f"W/{cached.etag}"})).status_code == 304
+    assert cached.to_response(Mock(headers={"if-none-match": 'W/"other"'})).status_code == 200
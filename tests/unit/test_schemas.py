@@ -0,0 +1,107 @@
+from decimal import Decimal
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+
+from app.models.schemas import (
+    ColocGroup,
+    Gene,
+    SearchTerms,
+    convert_duckdb_to_columns,
+    convert_duckdb_to_pydantic_model,
+)
+
+coloc_group_row = (
+    1, 926, 3, 80717, 12, 0.9, 0.1, 1, 22365104, 1e-10, "cis", "1:1-2", "1:22365104", "rs11810751",
+    "WNT7B", 5, 926, "Height", "Anthropometric", "phenotype", None, None, 2, "OpenGWAS", "https://opengwas.io",
+)  # fmt: skip
+
+
+def validated(model, row):
+    return model(**dict(zip(model.model_fields, row)))
+
+
+def test_constructed_models_match_validated_models():
+    converted = convert_duckdb_to_pydantic_model(ColocGroup, [coloc_group_row, (None,) * len(coloc_group_row)])
+
+    assert converted[0] == validated(ColocGroup, coloc_group_row)
+    assert converted[0].data_type == "Phenotype"
+    assert converted[1] is None
+
+
+def test_values_are_coerced_like_validation():
+    row = list(coloc_group_row)
+    row[5] = 1
+    row[6] = Decimal("0.25")
+
+    converted = convert_duckdb_to_pydantic_model(ColocGroup, tuple(row))
+
+    assert converted.h4_connectedness == 1.0 and type(converted.h4_connectedness) is float
+    assert converted.h3_connectedness == 0.25
+    assert converted.model_dump_json() == validated(ColocGroup, tuple(row)).model_dump_json()
+
+
+def test_rows_that_do_not_validate_still_raise():
+    row = list(coloc_group_row)
+    row[0] = None
+    with pytest.raises(ValidationError):
+        convert_duckdb_to_pydantic_model(ColocGroup, tuple(row))
+
+    row = list(coloc_group_row)
+    row[0] = "not an id"
+    with pytest.raises(ValidationError):
+        convert_duckdb_to_pydantic_model(ColocGroup, tuple(row))
+
+
+def test_constrained_fields_are_validated():
+    class ConstrainedRow(BaseModel):
+        id: int = Field(ge=0)
+        name: Annotated[str, Field(max_length=3)]
+        flipped: bool = Field(strict=True)
+
+    assert convert_duckdb_to_pydantic_model(ConstrainedRow, (1, "abc", True)) == ConstrainedRow(
+        id=1, name="abc", flipped=True
+    )
+    for row in ((-1, "abc", True), (1, "abcd", True), (1, "abc", 1)):
+        with pytest.raises(ValidationError):
+            convert_duckdb_to_pydantic_model(ConstrainedRow, row)
+
+
+def test_short_rows_use_field_defaults():
+    row = (1, "ENSG1", "WNT7B", None, None, 22, 100, 200, 1)
+
+    converted = convert_duckdb_to_pydantic_model(Gene, row)
+
+    assert converted == validated(Gene, row)
+    assert converted.genes_in_region is None
+
+
+def test_convert_duckdb_to_columns():
+    columns = convert_duckdb_to_columns(ColocGroup, [coloc_group_row, coloc_group_row])
+
+    assert list(columns) == list(ColocGroup.model_fields)
+    assert columns["variant_id"] == [80717, 80717]
+    assert columns["data_type"] == ["Phenotype", "Phenotype"]
+
+    with pytest.raises(ValueError):
+        convert_duckdb_to_columns(SearchTerms, [])
+
+
+def test_convert_duckdb_to_columns_validates_rows_like_models():
+    null_variant = coloc_group_row[:3] + (None,) + coloc_group_row[4:]
+    with pytest.raises(ValidationError):
+        convert_duckdb_to_columns(ColocGroup, [coloc_group_row, null_variant])
+
+    string_variant = coloc_group_row[:3] + ("80717",) + coloc_group_row[4:]
+    columns = convert_duckdb_to_columns(ColocGroup, [coloc_group_row, string_variant])
+    assert columns["variant_id"] == [80717, 80717]
+    assert columns["min_p"] == [1e-10, 1e-10]
+
+
+def test_constructed_models_track_set_fields():
+    row = (1, "ENSG1", "WNT7B", None, None, 22, 100, 200, 1)
+
+    converted = convert_duckdb_to_pydantic_model(Gene, row)
+
+    assert converted.model_dump(exclude_unset=True) == validated(Gene, row).model_dump(exclude_unset=True)
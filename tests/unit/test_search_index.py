@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.models.schemas import SearchTerm
+from app.services.search_index import SearchIndex
+
+
+def gene(name, ensembl_id, num_coloc_groups=0):
+    return SearchTerm(type="gene", name=name, alt_name=ensembl_id, type_id=name, num_coloc_groups=num_coloc_groups)
+
+
+def trait(trait_id, name, num_coloc_groups=0, num_study_extractions=0):
+    return SearchTerm(
+        type="trait",
+        name=name,
+        type_id=trait_id,
+        num_coloc_groups=num_coloc_groups,
+        num_study_extractions=num_study_extractions,
+    )
+
+
+SEARCH_TERMS = [
+    gene("BRCA1", "ENSG00000012048", num_coloc_groups=5),
+    gene("BRCA2", "ENSG00000139618", num_coloc_groups=50),
+    gene("PCSK9", "ENSG00000169174", num_coloc_groups=10),
+    trait(1, "Type 2 diabetes", num_coloc_groups=100),
+    trait(2, "Diabetes mellitus", num_coloc_groups=10, num_study_extractions=3),
+    trait(3, "Diabetic retinopathy", num_coloc_groups=10, num_study_extractions=7),
+]
+RSIDS = {"id": np.array([10, 11, 12, 13, 14]), "rsid": np.array([12345, 123, 1239, 124, 12])}
+
+
+def names(suggestions):
+    return [suggestion.name for suggestion in suggestions]
+
+
+def test_prefix_matches_are_ranked_by_coloc_groups():
+    index = SearchIndex(SEARCH_TERMS, RSIDS)
+
+    assert names(index.suggest("brc")) == ["BRCA2", "BRCA1"]
+    assert names(index.suggest("BRCA2")) == ["BRCA2"]
+    assert names(index.suggest("ensg0000016")) == ["PCSK9"]
+    assert names(index.suggest("brc", limit=1)) == ["BRCA2"]
+
+
+def test_prefix_matches_come_before_matches_inside_names():
+    index = SearchIndex(SEARCH_TERMS, RSIDS)
+
+    assert names(index.suggest("diab")) == ["Diabetic retinopathy", "Diabetes mellitus", "Type 2 diabetes"]
+    assert names(index.suggest("betes")) == ["Type 2 diabetes", "Diabetes mellitus"]
+    assert names(index.suggest("xyz")) == []
+
+
+def test_rsids_are_suggested_shortest_first():
+    index = SearchIndex(SEARCH_TERMS, RSIDS)
+
+    suggestions = index.suggest("rs123")
+    assert names(suggestions) == ["rs123", "rs1239", "rs12345"]
+    assert [suggestion.type_id for suggestion in suggestions] == [11, 12, 10]
+    assert names(index.suggest("rs12", limit=2)) == ["rs12", "rs123"]
+    assert names(index.suggest("rs0")) == []
@@ -0,0 +1,51 @@
+import pytest
+
+from app.db.studies_db import StudiesDBClient
+
+
+SETUP_SQL = """
+    CREATE TABLE variant_annotations AS SELECT * FROM (
+        VALUES (1, '1:100_A_G', 'rs10'), (2, '1:200_C_T', 'rs20'), (3, '1:200_C_G', NULL), (4, '2:300_G_A', 'rs40')
+    ) t(id, snp, rsid);
+    CREATE TABLE variant_pleiotropy AS SELECT * FROM (
+        VALUES (1, 3, 5)
+    ) t(variant_id, distinct_trait_categories, distinct_protein_coding_genes);
+"""
+
+pytestmark = pytest.mark.parametrize(
+    "duckdb_connection", [(SETUP_SQL, {StudiesDBClient: "studies_conn"})], indirect=True
+)
+
+
+@pytest.fixture
+def studies_db(duckdb_connection):
+    return StudiesDBClient()
+
+
+def test_identifiers_of_every_kind_resolve_in_input_order(studies_db):
+    rows = studies_db.resolve_variants(["rs40", " 1:200 ", "2", "1:100_A_G", "RS10", "rs10"])
+
+    assert [(row[0], row[1]) for row in rows] == [
+        ("rs40", 4),
+        (" 1:200 ", 2),
+        (" 1:200 ", 3),
+        ("2", 2),
+        ("1:100_A_G", 1),
+        ("RS10", None),
+        ("rs10", 1),
+    ]
+    assert rows[-1][-2:] == (3, 5)
+
+
+def test_unresolved_identifiers_are_returned_once_with_null_variants(studies_db):
+    rows = studies_db.resolve_variants(["99", "", "1:999", "not a variant", "99999999999999999999999", "99"])
+
+    assert [row[0] for row in rows] == ["99", "", "1:999", "not a variant", "99999999999999999999999", "99"]
+    assert all(value is None for row in rows for value in row[1:])
+    assert studies_db.resolve_variants([]) == []
+
+
+def test_snp_strings_resolve_in_input_order(studies_db):
+    rows = studies_db.get_variants_by_snp_strings(["2:300_G_A", "1:1_A_C", "1:100_A_G"])
+
+    assert [row[0] for row in rows] == [4, None, 1]
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.db.studies_db import StudiesDBClient
+from app.services import variant_positions
+from app.services.variant_positions import (
+    GenomicRange,
+    VariantPositionIndex,
+    clear_variant_position_index,
+    get_variant_position_index,
+    materialize_variant_positions,
+    sort_variant_positions,
+)
+
+
+SETUP_SQL = """
+    CREATE TABLE variant_annotations AS SELECT * FROM (
+        VALUES (1, 1, 100), (2, 1, 200), (3, 1, 200), (4, 1, 300), (5, 2, 150), (6, 1, 50)
+    ) t(id, chr, bp);
+"""
+
+in_studies_db = pytest.mark.parametrize(
+    "duckdb_connection", [(SETUP_SQL, {StudiesDBClient: "studies_conn"})], indirect=True
+)
+
+
+@pytest.fixture
+def studies_db(duckdb_connection, mocker, tmp_path):
+    mocker.patch.object(variant_positions.settings, "VARIANT_POSITIONS_DIR", str(tmp_path))
+    clear_variant_position_index()
+    yield duckdb_connection
+    clear_variant_position_index()
+
+
+def all_pages(index: VariantPositionIndex, genomic_range: GenomicRange, limit: int) -> list[list[int]]:
+    pages, cursor = [], None
+    while True:
+        variant_ids, cursor = index.page(genomic_range, limit, cursor)
+        pages.append(variant_ids)
+        if cursor is None:
+            return pages
+
+
+@in_studies_db
+def test_grange_pages_follow_position_order(studies_db):
+    index = get_variant_position_index()
+
+    assert all_pages(index, GenomicRange(1, 60, 300), limit=2) == [[1, 2], [3, 4]]
+    assert all_pages(index, GenomicRange(1, 200, 200), limit=1) == [[2], [3]]
+    assert all_pages(index, GenomicRange(1, 0, 1000), limit=10) == [[6, 1, 2, 3, 4]]
+    assert all_pages(index, GenomicRange(3, 0, 1000), limit=10) == [[]]
+
+
+def test_pages_cover_every_variant_in_range_once():
+    rng = np.random.default_rng(0)
+    chromosomes, bp = rng.integers(1, 3, 1000), rng.integers(0, 500, 1000)
+    index = VariantPositionIndex(sort_variant_positions(chromosomes, bp, np.arange(1000)))
+
+    pages = all_pages(index, GenomicRange(1, 100, 300), limit=7)
+    variant_ids = [variant_id for page in pages for variant_id in page]
+    in_range = (chromosomes == 1) & (bp >= 100) & (bp <= 300)
+    assert sorted(variant_ids) == np.flatnonzero(in_range).tolist()
+    assert all(len(page) == 7 for page in pages[:-1])
+
+
+@in_studies_db
+def test_materialised_positions_are_memory_mapped(studies_db, tmp_path):
+    stale_path = tmp_path / "variant_positions_old-release.npy"
+    stale_path.write_bytes(b"")
+
+    path = materialize_variant_positions()
+
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    studies_db.execute("DROP TABLE variant_annotations")
+    index = get_variant_position_index()
+    assert isinstance(index.positions, np.memmap)
+    assert index.page(GenomicRange(2, 0, 1000), limit=10).variant_ids == [5]
+
+
+def test_malformed_granges_are_rejected():
+    assert GenomicRange.parse("7:100-200") == GenomicRange(7, 100, 200)
+    for grange in ("7", "7:100", "X:1-2", "7:200-100"):
+        with pytest.raises(ValueError):
+            GenomicRange.parse(grange)
@@ -0,0 +1,61 @@
+from unittest.mock import Mock
+
+from app.models.schemas import ColocGroup, Ld, RareResult, Variant
+from app.services.variant_search_service import VariantSearchService
+
+PLACEHOLDERS = {int: 0, float: 0.0, str: "", bool: False}
+
+
+def row(model, **values) -> tuple:
+    """A DuckDB-style row for model, with placeholders for the required fields not given."""
+    return tuple(
+        values.get(name, PLACEHOLDERS.get(field.annotation) if field.is_required() else None)
+        for name, field in model.model_fields.items()
+    )
+
+
+def search_service(variants, proxies, colocs, rare_results) -> VariantSearchService:
+    service = VariantSearchService.__new__(VariantSearchService)
+    service.studies_db = Mock()
+    service.studies_db.get_variants.side_effect = lambda rsids=None, variant_ids=None, variant_prefixes=None: [
+        row(Variant, id=variant_id) for variant_id in (variants if rsids else variant_ids)
+    ]
+    service.studies_db.get_colocs_for_variants.return_value = [
+        row(ColocGroup, coloc_group_id=group, variant_id=variant_id) for group, variant_id in colocs
+    ]
+    service.studies_db.get_rare_results_for_variants.return_value = [
+        row(RareResult, rare_result_group_id=group, variant_id=variant_id) for group, variant_id in rare_results
+    ]
+    service.ld_service = Mock()
+    service.ld_service.get_ld_proxies.return_value = [
+        row(Ld, lead_variant_id=lead, proxy_variant_id=proxy, r=0.95) for lead, proxy in proxies
+    ]
+    return service
+
+
+def test_results_are_grouped_by_variant():
+    service = search_service(
+        variants=[1],
+        proxies=[(1, 2), (3, 1), (1, 4)],
+        colocs=[(10, 1), (10, 1), (11, 1), (12, 2), (13, 3), (14, 3)],
+        rare_results=[(20, 1), (20, 1)],
+    )
+
+    response = service.search("rs1")
+
+    [original] = response.original_variants
+    assert (original.num_colocs, len(original.coloc_groups)) == (2, 3)
+    assert original.num_rare_results == 1
+    assert len(original.ld_proxies) == 3
+    assert [variant.id for variant in response.proxy_variants] == [3, 2]
+    assert [variant.num_colocs for variant in response.proxy_variants] == [2, 1]
+    assert all(len(variant.ld_proxies) == 1 for variant in response.proxy_variants)
+    service.studies_db.get_rare_results_for_variants.assert_called_once_with(variant_ids=[1])
+
+
+def test_unresolved_search_terms_return_no_variants():
+    service = search_service(variants=[], proxies=[], colocs=[], rare_results=[])
+
+    assert service.search("rs1").original_variants == []
+    assert service.search("not a variant").proxy_variants == []
+    service.ld_service.get_ld_proxies.assert_not_called()